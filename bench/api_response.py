@@ -0,0 +1,136 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Time reading a day of WeatherFlow API observations through api_response,
+# which decodes the JSON payload once, against decoding the payload on every
+# access as the derived variables did before api_response was added. Run from
+# the console directory:
+#
+#     python -m bench.api_response [--hours N] [--repeat N]
+
+# Stop Kivy parsing command line arguments
+import os
+os.environ['KIVY_NO_ARGS'] = '1'
+
+# Import required library modules
+from lib.request_api import weatherflow_api
+
+# Import required Python modules
+import requests
+import argparse
+import random
+import json
+import time
+
+# Define index of the observation field read by each derived variable that is
+# seeded from the current day of TEMPEST observations: temp_max, temp_min,
+# SLP_max, SLP_min, avg_wind_speed, max_wind_gust, peak_sun_hours,
+# rain_accumulation and strike_count
+FIELDS = [7, 7, 6, 6, 2, 3, 11, 12, 15]
+
+
+def response(hours, seed=1):
+
+    """ Return a requests Response holding randomised one minute TEMPEST
+    observations
+
+    INPUTS:
+        hours               Number of hours of observations
+        seed                Random number seed
+
+    OUTPUT:
+        response            requests Response object
+    """
+
+    rng   = random.Random(seed)
+    start = int(time.time()) - 3600 * hours
+    obs   = [[start + 60 * ii] + [round(rng.uniform(0, 30), 2) for field in range(17)]
+             for ii in range(60 * hours)]
+    payload = {'status': {'status_code': 0, 'status_message': 'SUCCESS'}, 'type': 'obs_st', 'obs': obs}
+    api_data = requests.models.Response()
+    api_data.status_code = 200
+    api_data._content = json.dumps(payload).encode()
+    return api_data
+
+
+def decode_per_access(api_data):
+
+    """ Read each field by verifying and decoding the response on every access
+
+    INPUTS:
+        api_data            requests Response object
+
+    OUTPUT:
+        columns             List of observation time and value columns
+    """
+
+    columns = []
+    for index in FIELDS:
+        if api_data.ok and 'SUCCESS' in api_data.json()['status']['status_message'] and api_data.json()['obs'] is not None:
+            data_today = api_data.json()['obs']
+            api_time   = [item[0]     for item in data_today if item[index] is not None]
+            api_value  = [item[index] for item in data_today if item[index] is not None]
+            columns.append((api_time, api_value))
+    return columns
+
+
+def decode_once(api_data):
+
+    """ Read each field from an api_response that is decoded once
+
+    INPUTS:
+        api_data            requests Response object
+
+    OUTPUT:
+        columns             List of observation time and value columns
+    """
+
+    columns  = []
+    api_data = weatherflow_api.api_response(api_data)
+    for index in FIELDS:
+        if weatherflow_api.verify_response(api_data, 'obs'):
+            columns.append(api_data.column(index))
+    return columns
+
+
+def timed(function, api_data, repeat):
+
+    """ Return the mean time taken to call a function                      [s]
+    """
+
+    start = time.perf_counter()
+    for ii in range(repeat):
+        function(api_data)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    arguments = argparse.ArgumentParser(description='Time decoding WeatherFlow API observations')
+    arguments.add_argument('--hours',  type=int, default=24, help='hours of one minute observations')
+    arguments.add_argument('--repeat', type=int, default=20, help='number of timed repeats')
+    arguments = arguments.parse_args()
+
+    api_data = response(arguments.hours)
+    print(f'{60 * arguments.hours} one minute observations read by {len(FIELDS)} derived variables')
+    per_access = timed(decode_per_access, api_data, arguments.repeat)
+    once       = timed(decode_once,       api_data, arguments.repeat)
+    print(f'decode per access {1000 * per_access:>8.2f} ms')
+    print(f'decode once       {1000 * once:>8.2f} ms  ({per_access / once:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
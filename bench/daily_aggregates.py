@@ -0,0 +1,122 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Time the daily maximum temperature in steady state, updated through a daily
+# aggregate, against rebuilding the result list and converting the station time
+# on every call as temp_max did before the daily aggregates were added. Run
+# from the console directory:
+#
+#     python -m bench.daily_aggregates [--samples N]
+
+# Stop Kivy parsing command line arguments
+import os
+os.environ['KIVY_NO_ARGS'] = '1'
+
+# Import required library modules
+from lib import derived_variables as derive
+from lib import daily_aggregates
+
+# Import required Python modules
+from datetime import datetime
+import argparse
+import random
+import time
+import pytz
+
+# Define station configuration used by the benchmark
+CONFIG = {'Station': {'TempestID': '100', 'TempestSN': 'ST-1', 'OutAirID': '', 'OutAirSN': '',
+                      'InAirID': '', 'InAirSN': '', 'Timezone': 'Europe/London'},
+          'System':  {'rest_api': '0'}}
+
+
+def list_temp_max(temp, ob_time, max_temp, device, config):
+
+    """ Previous steady-state calculation of the daily maximum temperature,
+    which converted the station time and rebuilt the result list on every call
+
+    INPUTS:
+        temp                Current temperature                          [deg C]
+        ob_time             Observation time                             [s]
+        max_temp            Daily maximum temperature                    [deg C]
+        device              Device ID
+        config              Station configuration
+
+    OUTPUT:
+        max_temp            Daily maximum temperature                    [deg C]
+    """
+
+    # Return None if required variables are missing
+    if temp[0] is None or ob_time[0] is None:
+        return [None, 'c', '-', None, time.time()]
+
+    # Define current time in station timezone
+    Tz = pytz.timezone(config['Station']['Timezone'])
+    time_now = datetime.now(pytz.utc).astimezone(Tz)
+
+    # Start, reset, update or carry forward the daily maximum temperature
+    if max_temp[0] is None:
+        max_temp = [temp[0], 'c', ob_time[0], 's', temp[0], ob_time[0]]
+    elif time_now.date() > datetime.fromtimestamp(max_temp[5], Tz).date():
+        max_temp = [temp[0], 'c', ob_time[0], 's', temp[0], ob_time[0]]
+    elif temp[0] > max_temp[4]:
+        max_temp = [temp[0], 'c', ob_time[0], 's', temp[0], ob_time[0]]
+    else:
+        max_temp = [max_temp[4], 'c', max_temp[2], 's', max_temp[4], ob_time[0]]
+    return max_temp
+
+
+def observations(samples, seed=1):
+
+    """ Return randomised one minute temperature observations ending now
+
+    OUTPUT:
+        obs                 List of (temperature, observation time) pairs
+    """
+
+    rng   = random.Random(seed)
+    start = int(time.time()) - 60 * samples
+    return [([rng.uniform(-5, 25), 'c'], [start + 60 * ii, 's']) for ii in range(samples)]
+
+
+def main():
+    arguments = argparse.ArgumentParser(description='Time the daily maximum temperature in steady state')
+    arguments.add_argument('--samples', type=int, default=100000, help='number of observations')
+    arguments = arguments.parse_args()
+
+    obs = observations(arguments.samples)
+    print(f'{arguments.samples} one minute observations')
+
+    # Time previous list-based calculation
+    max_temp = [None]
+    start = time.perf_counter()
+    for temp, ob_time in obs:
+        max_temp = list_temp_max(temp, ob_time, max_temp, '100', CONFIG)
+    list_time = (time.perf_counter() - start) / arguments.samples
+
+    # Time calculation through daily aggregate
+    aggregate = daily_aggregates.create(CONFIG)['outTempMax']
+    start = time.perf_counter()
+    for temp, ob_time in obs:
+        derive.temp_max(temp, ob_time, aggregate, '100', {}, CONFIG)
+    aggregate_time = (time.perf_counter() - start) / arguments.samples
+
+    print(f'list      {1e6 * list_time:>8.1f} us/call')
+    print(f'aggregate {1e6 * aggregate_time:>8.1f} us/call  ({list_time / aggregate_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
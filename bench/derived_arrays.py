@@ -0,0 +1,119 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Time the array versions of the derived variables against a loop over the
+# scalar functions in derived_variables, using randomised one minute
+# observations. Run from the console directory:
+#
+#     python -m bench.derived_arrays [--days N]
+
+# Stop Kivy parsing command line arguments
+import os
+os.environ['KIVY_NO_ARGS'] = '1'
+
+# Import required library modules
+from lib import derived_variables as derive
+from lib import derived_arrays
+
+# Import required Python modules
+import argparse
+import random
+import time
+
+# Define station configuration used by the benchmark
+CONFIG = {'Station':   {'Elevation': '50', 'TempestID': '100', 'TempestSN': 'ST-1', 'TempestHeight': '2',
+                        'OutAirID': '', 'OutAirSN': '', 'OutAirHeight': ''},
+          'Units':     {'Temp': 'c'},
+          'FeelsLike': {'ExtremelyCold': '-5', 'FreezingCold': '0', 'VeryCold': '5', 'Cold': '10',
+                        'Mild': '15', 'Warm': '20', 'Hot': '25', 'VeryHot': '30'}}
+
+
+def observations(samples, seed=1):
+
+    """ Return randomised one minute observations
+
+    INPUTS:
+        samples             Number of observations
+        seed                Random number seed
+
+    OUTPUT:
+        obs                 Dictionary of observation lists
+    """
+
+    rng = random.Random(seed)
+    return {'out_temp': [rng.uniform(-30, 45) for sample in range(samples)],
+            'humidity': [rng.uniform(1, 100)  for sample in range(samples)],
+            'wind_spd': [rng.uniform(0, 30)   for sample in range(samples)],
+            'wind_dir': [rng.uniform(0, 360)  for sample in range(samples)],
+            'pressure': [rng.uniform(950, 1050) for sample in range(samples)],
+            'uv_level': [rng.uniform(0, 14)   for sample in range(samples)]}
+
+
+def benchmarks(obs):
+
+    """ Return the scalar and array version of each derived variable
+
+    INPUTS:
+        obs                 Dictionary of observation lists
+
+    OUTPUT:
+        benchmarks          Dictionary of (scalar, array) functions
+    """
+
+    T, RH, WS, WD, P, UV = (obs['out_temp'], obs['humidity'], obs['wind_spd'],
+                            obs['wind_dir'], obs['pressure'], obs['uv_level'])
+    return {
+        'dew_point':         (lambda: [derive.dew_point([t, 'c'], [h, '%']) for t, h in zip(T, RH)],
+                              lambda: derived_arrays.dew_point(T, RH)),
+        'feels_like':        (lambda: [derive.feels_like([t, 'c'], [h, '%'], [w, 'mps'], CONFIG) for t, h, w in zip(T, RH, WS)],
+                              lambda: derived_arrays.feels_like(T, RH, WS, CONFIG)),
+        'SLP':               (lambda: [derive.SLP([p, 'mb'], '100', CONFIG) for p in P],
+                              lambda: derived_arrays.SLP(P, '100', CONFIG)),
+        'beaufort_scale':    (lambda: [derive.beaufort_scale([w, 'mps']) for w in WS],
+                              lambda: derived_arrays.beaufort_scale(WS)),
+        'uv_index':          (lambda: [derive.uv_index([u, 'index']) for u in UV],
+                              lambda: derived_arrays.uv_index(UV)),
+        'cardinal_wind_dir': (lambda: [derive.cardinal_wind_dir([d, 'degrees'], [w, 'mps']) for d, w in zip(WD, WS)],
+                              lambda: derived_arrays.cardinal_wind_dir(WD, WS)),
+    }
+
+
+def timed(function):
+
+    """ Return the time taken to call a function                           [s]
+    """
+
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    arguments = argparse.ArgumentParser(description='Time the array versions of the derived variables')
+    arguments.add_argument('--days', type=float, default=365, help='days of one minute observations')
+    arguments = arguments.parse_args()
+
+    samples = int(arguments.days * 1440)
+    print(f'{samples} one minute observations')
+    for name, (scalar, array) in benchmarks(observations(samples)).items():
+        scalar_time = timed(scalar)
+        array_time  = timed(array)
+        print(f'{name:<18} scalar {scalar_time:>8.3f} s  array {array_time:>8.3f} s  ({scalar_time / array_time:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Count the pyephem compute calls made by the moon phase display for each moon
+# sample interval, and the error of the interpolated moon phase and angle of
+# the illuminated moon face against calculating both every minute. Run from the
+# console directory:
+#
+#     python -m bench.moon_phase [--config FILE] [--days N] [--start YYYY-MM-DD]
+
+# Stop Kivy parsing command line arguments
+import os
+os.environ['KIVY_NO_ARGS'] = '1'
+
+# Import required library modules
+from lib.astronomical  import astro
+from service.replay    import replay_app
+
+# Import required Python modules
+from datetime import datetime
+import argparse
+import pytz
+
+# Define moon sample intervals                                          [min]
+INTERVALS = [1, 5, 10, 15]
+
+
+def main():
+    arguments = argparse.ArgumentParser(description='Count moon phase ephem calls and interpolation error')
+    arguments.add_argument('--config', default='wfpiconsole.ini', help='console configuration file')
+    arguments.add_argument('--days',   type=float, default=14, help='days of simulated display updates')
+    arguments.add_argument('--start',  default='2025-01-01', help='first simulated day (UTC)')
+    arguments = arguments.parse_args()
+
+    replay_app(arguments.config)
+    start = int(pytz.utc.localize(datetime.strptime(arguments.start, '%Y-%m-%d')).timestamp())
+    times = range(start, start + int(arguments.days * 86400), 60)
+    hours = len(times) / 60
+
+    # Calculate moon phase and angle of illuminated moon face every minute
+    exact = astro()
+    exact_samples = [exact.moon_sample(sample_time) for sample_time in times]
+    print(f'{hours / 24:.0f} days of one minute display updates')
+    print(f'{"every second":<18} {3 * 3600:>6} ephem calls/hour')
+    print(f'{"every minute":<18} {exact.ephem_calls / hours:>6.0f} ephem calls/hour')
+
+    # Interpolate moon phase and angle between samples at each interval
+    for interval in INTERVALS:
+        moon = astro()
+        moon.moon_interval = 60 * interval
+        phase_error = angle_error = 0
+        updates = {}
+        key = None
+        for sample_time, phase, angle in exact_samples:
+            state = moon.moon_state(sample_time)
+            phase_error = max(phase_error, abs(state[0] - phase))
+            angle_error = max(angle_error, abs((state[1] - angle + 180) % 360 - 180))
+            # Count changes in the rounded illumination and tilt, which
+            # trigger a Phase display update
+            if (round(state[0]), round(state[1])) != key:
+                key = (round(state[0]), round(state[1]))
+                updates[sample_time // 3600] = updates.get(sample_time // 3600, 0) + 1
+        print(f'{"MoonInterval = " + str(interval):<18} {moon.ephem_calls / hours:>6.0f} ephem calls/hour'
+              f'  max phase error {phase_error:.1e} %  max tilt error {angle_error:.2f} deg'
+              f'  max {max(updates.values())} Phase updates/hour')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Time a full reformat of the display values using the compiled unit conversion
+# and formatting pipelines, against resolving the unit conversions and formats
+# on every call. The display values are taken from a simulated TEMPEST station.
+# Run from the console directory:
+#
+#     python -m bench.observation_format [--config FILE] [--scenario NAME]
+
+# Stop Kivy parsing command line arguments
+import os
+os.environ['KIVY_NO_ARGS'] = '1'
+
+# Import required library modules
+from lib.observation_parser import obs_parser
+from lib.message_router     import message_router
+from lib                    import observation_format as observation
+from lib                    import derived_graph
+from service.replay         import replay_app, replay_executor
+from service.simulator      import sim_device, SCENARIOS
+
+# Import required Kivy modules
+from kivy.clock             import Clock
+
+# Import required Python modules
+import argparse
+import random
+import time
+
+
+def simulate(config_file, scenario, samples=60):
+
+    """ Parse one minute observations from a simulated TEMPEST through a
+    headless console
+
+    INPUTS:
+        config_file         Path to console configuration file
+        scenario            Simulated weather scenario
+        samples             Number of simulated observations
+
+    OUTPUT:
+        app                 Headless console App
+        parser              obs_parser object holding the display sources
+    """
+
+    app    = replay_app(config_file)
+    parser = obs_parser()
+    router = message_router(parser, replay_executor(), app.config, 'SN')
+    device = sim_device('tempest', app.config['Station']['TempestSN'] or 'ST-00000001', 'HB-00000001', random.Random(1))
+    start  = int(time.time()) - 60 * samples
+    for sample in range(samples):
+        device.step(start + 60 * sample, scenario)
+        message = device.obs_message(start + 60 * sample, scenario)
+        router.dispatch(message['type'], device.serial_number, message)
+        Clock.tick()
+    return app, parser
+
+
+def display_values(parser):
+
+    """ Return the source observation of each display value
+
+    OUTPUT:
+        values              List of (display, source observation) pairs
+    """
+
+    values = []
+    for item in derived_graph.DISPLAY:
+        value = getattr(parser, item.source[0])[item.source[1]]
+        if len(item.source) > 2:
+            value = value[item.source[2]]
+        values.append((item, value))
+    return values
+
+
+def main():
+    arguments = argparse.ArgumentParser(description='Time a full reformat of the display values')
+    arguments.add_argument('--config',   default='wfpiconsole.ini', help='console configuration file')
+    arguments.add_argument('--scenario', choices=SCENARIOS, default='storm', help='simulated weather scenario')
+    arguments.add_argument('--repeat',   type=int, default=1000, help='number of timed reformats')
+    arguments = arguments.parse_args()
+
+    app, parser = simulate(arguments.config, arguments.scenario)
+    config = app.config
+    values = display_values(parser)
+    print(f'{len(values)} display values from a simulated TEMPEST ({arguments.scenario})')
+
+    # Time reformat that resolves unit conversions and formats on every call
+    start = time.perf_counter()
+    for ii in range(arguments.repeat):
+        for item, value in values:
+            observation.format(observation.units(value, config['Units'].get(item.units, item.units)), item.format, config)
+    per_call = (time.perf_counter() - start) / arguments.repeat
+
+    # Time reformat using compiled pipelines
+    start = time.perf_counter()
+    for ii in range(arguments.repeat):
+        for item, value in values:
+            parser.pipelines[item.key](value)
+    compiled = (time.perf_counter() - start) / arguments.repeat
+
+    print(f'resolved per call {1e6 * per_call:>8.1f} us/reformat')
+    print(f'compiled pipeline {1e6 * compiled:>8.1f} us/reformat  ({per_call / compiled:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
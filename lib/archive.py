@@ -0,0 +1,367 @@
+""" Defines the local observation archive that stores every observation parsed
+by the Raspberry Pi Python console for WeatherFlow Tempest and Smart Home
+Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib.request_api.weatherflow_api import api_response
+from lib.system                      import system
+
+# Import required Kivy modules
+from kivy.logger                     import Logger
+
+# Import required Python modules
+from datetime                        import datetime, timedelta
+import threading
+import sqlite3
+import atexit
+import queue
+import json
+import time
+import pytz
+
+# Define archive tables. Each table is partitioned by calendar month (UTC)
+TABLES = ('obs', 'rapid_wind', 'evt_strike')
+
+# Define number of monthly partitions of each table retained in addition to
+# the current month
+RETENTION = {'obs': 12, 'rapid_wind': 1, 'evt_strike': 12}
+
+# Define maximum number of rows written in a single transaction, maximum time
+# observations are held before they are written [s] and maximum gap between
+# archived observations for the archive to be considered complete [s]
+BATCH_SIZE     = 500
+FLUSH_INTERVAL = 10
+COVERAGE_GAP   = 300
+
+# Define shared archives keyed by database path
+_archives = {}
+_lock     = threading.Lock()
+
+
+# ==============================================================================
+# DEFINE 'obs_archive' CLASS
+# ==============================================================================
+class obs_archive():
+
+    """ SQLite time-series archive of device observations. Observations are
+    queued by the parse path and written in batches by a background writer
+    thread, so that parsing never blocks on disk. Each archive table is
+    partitioned by month, with the (device, time) primary key acting as a
+    covering index for time window queries
+
+    INPUTS:
+        path                Path to SQLite database
+    """
+
+    def __init__(self, path):
+
+        # Define instance variables
+        self.path    = path
+        self.queue   = queue.SimpleQueue()
+        self.local   = threading.local()
+        self.tables  = set()
+        self.written = 0
+
+        # Configure database and start writer thread
+        connection = sqlite3.connect(path)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.close()
+        self.thread = threading.Thread(target=self.run, name='archive', daemon=True)
+        self.thread.start()
+
+    def insert(self, table, device, ob):
+
+        """ Queue observation for writing to the archive without blocking
+
+        INPUTS:
+            table               Archive table: 'obs', 'rapid_wind' or 'evt_strike'
+            device              Device ID
+            ob                  Observation list from Websocket/UDP message
+        """
+
+        if ob and ob[0] is not None:
+            self.queue.put((table, str(device), int(ob[0]), json.dumps(ob)))
+
+    def close(self):
+
+        """ Write queued observations and stop the writer thread
+        """
+
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+
+    def run(self):
+
+        """ Write queued observations to the archive in batches until the
+        archive is closed
+        """
+
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA synchronous=NORMAL')
+        running = True
+        while running:
+
+            # Wait for next observation, then collect observations into a
+            # single batch until the batch is full, the flush interval has
+            # passed or the archive is closed
+            batch = [self.queue.get()]
+            flush_time = time.monotonic() + FLUSH_INTERVAL
+            while batch[-1] is not None and len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get(timeout=max(flush_time - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                running = False
+                batch.pop()
+
+            # Group observations by monthly partition and write batch. Expired
+            # partitions are dropped when a new partition is first written
+            partitions = {}
+            for table, device, ob_time, data in batch:
+                partitions.setdefault((table, partition(table, ob_time)), []).append((device, ob_time, data))
+            try:
+                with connection:
+                    for (table, name), rows in partitions.items():
+                        if name not in self.tables:
+                            create_table(connection, name)
+                            drop_expired(connection, table, rows[-1][1])
+                            self.tables.add(name)
+                        connection.executemany(f'INSERT OR REPLACE INTO {name} (device, time, data) VALUES (?, ?, ?)', rows)
+                self.written += len(batch)
+            except sqlite3.Error as error:
+                Logger.error(f'archive: {system().log_time()} - Write failed: {error}')
+        connection.close()
+
+    def connection(self):
+
+        """ Return the read connection for the calling thread
+        """
+
+        if not hasattr(self.local, 'connection'):
+            self.local.connection = sqlite3.connect(self.path)
+        return self.local.connection
+
+    def query(self, table, device, start_time, end_time):
+
+        """ Return archived observations from a time window
+
+        INPUTS:
+            table               Archive table: 'obs', 'rapid_wind' or 'evt_strike'
+            device              Device ID
+            start_time          Start of time window                          [s]
+            end_time            End of time window                            [s]
+
+        OUTPUT:
+            obs                 List of observations in chronological order
+        """
+
+        connection = self.connection()
+        existing   = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        obs = []
+        for name in partitions(table, start_time, end_time):
+            if name in existing:
+                rows = connection.execute(f'SELECT data FROM {name} WHERE device = ? AND time BETWEEN ? AND ? ORDER BY time',
+                                          (str(device), int(start_time), int(end_time)))
+                obs.extend(json.loads(row[0]) for row in rows)
+        return obs
+
+    def window(self, device, start_time, end_time):
+
+        """ Return archived device observations from a time window if the
+        archive has complete coverage of that window
+
+        INPUTS:
+            device              Device ID
+            start_time          Start of time window                          [s]
+            end_time            End of time window                            [s]
+
+        OUTPUT:
+            api_data            api_response object containing observations, or
+                                None if archive coverage is incomplete
+        """
+
+        try:
+            obs = self.query('obs', device, start_time, end_time)
+        except sqlite3.Error as error:
+            Logger.warning(f'archive: {system().log_time()} - Read failed: {error}')
+            return None
+        if not complete(obs, start_time, end_time):
+            return None
+        return api_response.from_obs(obs)
+
+    def today(self, device, config):
+
+        """ Return archived observations from the current calendar day in the
+        station timezone
+
+        INPUTS:
+            device              Device ID
+            config              Station configuration
+
+        OUTPUT:
+            api_data            api_response object, or None if archive
+                                coverage is incomplete
+        """
+
+        Tz  = pytz.timezone(config['Station']['Timezone'])
+        now = datetime.now(pytz.utc).astimezone(Tz)
+        start_time = int(Tz.localize(datetime(now.year, now.month, now.day)).timestamp())
+        return self.window(device, start_time, int(now.timestamp()))
+
+    def yesterday(self, device, config):
+
+        """ Return archived observations from yesterday in the station timezone
+
+        INPUTS:
+            device              Device ID
+            config              Station configuration
+
+        OUTPUT:
+            api_data            api_response object, or None if archive
+                                coverage is incomplete
+        """
+
+        Tz  = pytz.timezone(config['Station']['Timezone'])
+        now = datetime.now(pytz.utc).astimezone(Tz)
+        today = Tz.localize(datetime(now.year, now.month, now.day))
+        start_time = int(Tz.localize(datetime(now.year, now.month, now.day) - timedelta(days=1)).timestamp())
+        return self.window(device, start_time, int(today.timestamp()) - 1)
+
+
+def get(config):
+
+    """ Return the shared archive defined in the station configuration
+
+    INPUTS:
+        config              Station configuration
+
+    OUTPUT:
+        archive             obs_archive object, or None if the archive is
+                            disabled or cannot be opened
+    """
+
+    path = config['System'].get('ArchiveFile', '').strip()
+    if not path:
+        return None
+    with _lock:
+        if path not in _archives:
+            try:
+                _archives[path] = obs_archive(path)
+                atexit.register(_archives[path].close)
+            except sqlite3.Error as error:
+                Logger.error(f'archive: {system().log_time()} - Unable to open archive: {error}')
+                return None
+        return _archives[path]
+
+
+def create_table(connection, name):
+
+    """ Create monthly archive partition if it does not already exist
+
+    INPUTS:
+        connection          SQLite connection
+        name                Partition table name
+    """
+
+    connection.execute(f'CREATE TABLE IF NOT EXISTS {name} ('
+                       'device TEXT NOT NULL, time INTEGER NOT NULL, data TEXT NOT NULL, '
+                       'PRIMARY KEY (device, time)) WITHOUT ROWID')
+
+
+def drop_expired(connection, table, ob_time):
+
+    """ Drop monthly partitions of an archive table that are older than the
+    retention period
+
+    INPUTS:
+        connection          SQLite connection
+        table               Archive table
+        ob_time             Observation time                              [s]
+    """
+
+    utc = time.gmtime(ob_time)
+    months = utc.tm_year * 12 + utc.tm_mon - 1 - RETENTION[table]
+    oldest = f'{table}_{months // 12}{months % 12 + 1:02d}'
+    names  = [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE ?",
+                                                   (f'{table}_%',))]
+    for name in names:
+        if name[len(table) + 1:].isdigit() and name < oldest:
+            connection.execute(f'DROP TABLE {name}')
+
+
+def partition(table, ob_time):
+
+    """ Return the name of the monthly partition containing an observation
+
+    INPUTS:
+        table               Archive table
+        ob_time             Observation time                              [s]
+
+    OUTPUT:
+        name                Partition table name
+    """
+
+    utc = time.gmtime(ob_time)
+    return f'{table}_{utc.tm_year}{utc.tm_mon:02d}'
+
+
+def partitions(table, start_time, end_time):
+
+    """ Return the names of the monthly partitions spanning a time window
+
+    INPUTS:
+        table               Archive table
+        start_time          Start of time window                          [s]
+        end_time            End of time window                            [s]
+
+    OUTPUT:
+        names               List of partition table names
+    """
+
+    start = time.gmtime(start_time)
+    end   = time.gmtime(end_time)
+    year, month = start.tm_year, start.tm_mon
+    names = []
+    while (year, month) <= (end.tm_year, end.tm_mon):
+        names.append(f'{table}_{year}{month:02d}')
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return names
+
+
+def complete(obs, start_time, end_time):
+
+    """ Return True if a list of observations covers a time window with no gap
+    longer than COVERAGE_GAP
+
+    INPUTS:
+        obs                 List of observations in chronological order
+        start_time          Start of time window                          [s]
+        end_time            End of time window                            [s]
+
+    OUTPUT:
+        complete            True if observations cover the time window
+    """
+
+    if not obs:
+        return False
+    previous = start_time
+    for ob in obs:
+        if ob[0] - previous > COVERAGE_GAP:
+            return False
+        previous = ob[0]
+    return end_time - previous <= COVERAGE_GAP
@@ -0,0 +1,304 @@
+""" Defines the multi-day astronomical event table used by the Raspberry Pi
+Python console for WeatherFlow Tempest and Smart Home Weather stations to look
+up sun and moon events without recalculating them.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib.system   import system
+
+# Import required Kivy modules
+from kivy.logger  import Logger
+
+# Import required Python modules
+from datetime     import datetime, timedelta
+import threading
+import ephem
+import json
+import pytz
+import os
+
+# Define table format version and number of days covered by the table
+VERSION = 1
+DAYS    = 30
+
+# Define sun and moon events in the table, with the observer horizon and
+# pressure, whether the event is a rising and whether the centre of the body is
+# used for each event
+EVENTS = {'dawn':     ('-6',    0,    True,  True),
+          'sunrise':  ('-0:34', 0,    True,  False),
+          'sunset':   ('-0:34', 0,    False, False),
+          'dusk':     ('-6',    0,    False, True),
+          'moonrise': ('0',     1010, True,  False),
+          'moonset':  ('0',     1010, False, False)}
+
+# Define shared event table
+_table = None
+_lock  = threading.Lock()
+
+
+# ==============================================================================
+# DEFINE 'astro_table' CLASS
+# ==============================================================================
+class astro_table():
+
+    """ Table of sun and moon events for each UTC day, keyed by station latitude,
+    longitude and date. Missing days are calculated by a background thread and
+    the table is written to disk, so that after a restart sun and moon events
+    are looked up rather than calculated. Event times are stored as UNIX
+    timestamps so that the table is independent of the station timezone
+
+    INPUTS:
+        config              Station configuration
+    """
+
+    def __init__(self, config):
+
+        # Define instance variables
+        self.config   = config
+        self.path     = config['System'].get('AstroFile', '').strip()
+        self.lock     = threading.Lock()
+        self.days     = {}
+        self.thread   = None
+        self.running  = None
+        self.computed = 0
+
+        # Restore event table from disk
+        if self.path:
+            self.load()
+
+    def location(self):
+
+        """ Return the station location used to key the event table
+
+        OUTPUT:
+            location            Tuple of station latitude and longitude strings
+        """
+
+        return (str(self.config['Station']['Latitude']), str(self.config['Station']['Longitude']))
+
+    def extend(self):
+
+        """ Remove days that have passed or are for a different station
+        location, and start the background thread to calculate any missing
+        days between today and DAYS days ahead
+        """
+
+        location = self.location()
+        today    = datetime.now(pytz.utc).date()
+        dates    = [(today + timedelta(days=day)).isoformat() for day in range(DAYS)]
+        earliest = (today - timedelta(days=1)).isoformat()
+        with self.lock:
+            for key in [key for key in self.days if key[:2] != location or key[2] < earliest]:
+                del self.days[key]
+            missing = [date for date in dates if location + (date,) not in self.days]
+        if missing and (self.thread is None or not self.thread.is_alive() or self.running != location):
+            self.running = location
+            self.thread  = threading.Thread(target=self.run, args=(location, missing),
+                                            name='astro_table', daemon=True)
+            self.thread.start()
+
+    def run(self, location, dates):
+
+        """ Calculate sun and moon events for each missing day, then write the
+        event table to disk. Calculation stops without writing the table if the
+        station location changes
+
+        INPUTS:
+            location            Tuple of station latitude and longitude strings
+            dates               List of missing dates as ISO strings
+        """
+
+        observer     = ephem.Observer()
+        observer.lat = location[0]
+        observer.lon = location[1]
+        for date in dates:
+            events = calculate_day(observer, date)
+            with self.lock:
+                if location != self.location():
+                    return
+                self.days[location + (date,)] = events
+            self.computed += 1
+        Logger.info(f'astro_table: {system().log_time()} - Calculated {len(dates)} days of sun and moon events')
+        if self.path:
+            self.save()
+
+    def next_events(self, events, after):
+
+        """ Look up the first occurrence of each event after the given time
+
+        INPUTS:
+            events              List of event names
+            after               UTC datetime after which to find each event
+
+        OUTPUT:
+            times               List of event times as UTC datetimes rounded
+                                down to the minute, or None if the table does
+                                not yet cover all events
+        """
+
+        times = []
+        for event in events:
+            timestamp = self.next_event(event, after.timestamp())
+            if timestamp is None:
+                return None
+            times.append(datetime.fromtimestamp(timestamp, pytz.utc).replace(second=0, microsecond=0))
+        return times
+
+    def moon_events(self, start, midnight):
+
+        """ Look up the first moonrise after the start time, the moonset that
+        follows it, and the next full and new moon after midnight
+
+        INPUTS:
+            start               UTC datetime after which to find moonrise
+            midnight            UTC datetime of midnight today
+
+        OUTPUT:
+            times               List of Moonrise, Moonset, FullMoon and NewMoon
+                                times as UTC datetimes, or None if the table
+                                does not yet cover all events
+        """
+
+        moonrise = self.next_events(['moonrise'], start)
+        moonset  = self.next_events(['moonset'], moonrise[0]) if moonrise else None
+        phases   = [self.next_event(phase, midnight.timestamp()) for phase in ['full_moon', 'new_moon']]
+        if moonset is None or None in phases:
+            return None
+        return moonrise + moonset + [datetime.fromtimestamp(phase, pytz.utc) for phase in phases]
+
+    def next_event(self, event, after):
+
+        """ Look up the first occurrence of an event after the given time
+
+        INPUTS:
+            event               Event name
+            after               UNIX timestamp after which to find the event
+
+        OUTPUT:
+            timestamp           Event time as UNIX timestamp, or None if the
+                                table does not cover the event
+        """
+
+        location = self.location()
+        date     = datetime.fromtimestamp(after, pytz.utc).date()
+        with self.lock:
+            while location + (date.isoformat(),) in self.days:
+                for timestamp in self.days[location + (date.isoformat(),)][event]:
+                    if timestamp > after:
+                        return timestamp
+                date += timedelta(days=1)
+        return None
+
+    def load(self):
+
+        """ Restore the event table for the current station location from disk
+        """
+
+        try:
+            with open(self.path) as table_file:
+                table = json.load(table_file)
+            if table['version'] != VERSION:
+                return
+            location = self.location()
+            with self.lock:
+                for day in table['days']:
+                    if (day['lat'], day['lon']) == location:
+                        self.days[location + (day['date'],)] = day['events']
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+
+    def save(self):
+
+        """ Write the event table to a temporary file that atomically replaces
+        the previous table
+        """
+
+        with self.lock:
+            table = {'version': VERSION,
+                     'days':    [{'lat': key[0], 'lon': key[1], 'date': key[2], 'events': events}
+                                 for key, events in sorted(self.days.items())]}
+        try:
+            with open(self.path + '.tmp', 'w') as table_file:
+                json.dump(table, table_file)
+            os.replace(self.path + '.tmp', self.path)
+        except OSError as error:
+            Logger.warning(f'astro_table: {system().log_time()} - Unable to save astro table: {error}')
+
+
+def calculate_day(observer, date):
+
+    """ Calculate all sun and moon events, and any full or new moon, that occur
+    on the given UTC day
+
+    INPUTS:
+        observer            ephem Observer object at station location
+        date                UTC date as ISO string
+
+    OUTPUT:
+        events              Dictionary of lists of event times as UNIX
+                            timestamps
+    """
+
+    start  = ephem.Date(date.replace('-', '/'))
+    end    = ephem.Date(start + 1)
+    events = {}
+    for event, (horizon, pressure, rising, use_center) in EVENTS.items():
+        body = ephem.Sun() if event in ['dawn', 'sunrise', 'sunset', 'dusk'] else ephem.Moon()
+        observer.horizon  = horizon
+        observer.pressure = pressure
+        observer.date     = start
+        events[event] = []
+        while True:
+            try:
+                if rising:
+                    time = observer.next_rising(body, use_center=use_center)
+                else:
+                    time = observer.next_setting(body, use_center=use_center)
+            except ephem.CircumpolarError:
+                break
+            if time >= end:
+                break
+            events[event].append(timestamp(time))
+            observer.date = ephem.Date(time + ephem.minute)
+    events['full_moon'] = [timestamp(time) for time in [ephem.next_full_moon(start)] if time < end]
+    events['new_moon']  = [timestamp(time) for time in [ephem.next_new_moon(start)]  if time < end]
+    return events
+
+
+def timestamp(time):
+
+    """ Convert an ephem Date to a UNIX timestamp
+    """
+
+    return pytz.utc.localize(time.datetime()).timestamp()
+
+
+def get(config):
+
+    """ Return the shared astronomical event table
+
+    INPUTS:
+        config              Station configuration
+
+    OUTPUT:
+        table               astro_table object
+    """
+
+    global _table
+    with _lock:
+        if _table is None:
+            _table = astro_table(config)
+        return _table
@@ -16,12 +16,12 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Import required library modules
-from lib.system  import system
 from lib         import properties
+from lib         import astro_table
+from lib         import update_bus
+from lib         import tick_scheduler
 
 # Import required Kivy modules
-from kivy.logger import Logger
-from kivy.clock  import Clock
 from kivy.app    import App
 
 # Import required modules
@@ -30,6 +30,12 @@ import ephem
 import pytz
 import math
 
+# Define maximum change in the angle of the illuminated moon face between moon
+# samples, and maximum error of the interpolated angle at the middle of the
+# sample interval, before the sample interval is shortened           [degrees]
+MAX_TILT_STEP  = 5
+MAX_TILT_ERROR = 0.25
+
 
 class astro():
 
@@ -48,26 +54,33 @@ class astro():
         self.sun  = ephem.Sun()
         self.moon = ephem.Moon()
 
+        # Define moon state cache. The moon phase and tilt are calculated at
+        # the configured interval and interpolated in between
+        self.moon_interval = 60 * float(self.app.config['System'].get('MoonInterval', '5'))
+        self.moon_samples  = None
+        self.moon_key      = None
+        self.ephem_calls   = 0
+
     def reset_astro(self):
 
         ''' Reset the Astro data when the station ID changes
         '''
-        # Cancel sun_transit and moon_phase schedules
-        self.app.Sched.sun_transit.cancel()
-        self.app.Sched.moon_phase.cancel()
-
-        # Reset the astro data and generate new sunrise/sunset and
-        # moonrise/moonset times
-        self.astro_data = properties.Astro()
+        # Reset the astro data and moon state cache, and generate new
+        # sunrise/sunset and moonrise/moonset times
+        self.astro_data   = properties.Astro()
+        self.moon_samples = None
+        self.moon_key     = None
+        self.observer.lat = str(self.app.config['Station']['Latitude'])
+        self.observer.lon = str(self.app.config['Station']['Longitude'])
         self.update_display()
         self.sunrise_sunset()
         self.moonrise_moonset()
 
         # Force update sun_transit to correct sunrise/sunset times and then
-        # reschedule sun_transit and moon_phase
+        # force sun_transit and moon_phase to run on the next tick
         self.sun_transit()
-        self.app.Sched.sun_transit = Clock.schedule_interval(self.sun_transit, 1)
-        self.app.Sched.moon_phase  = Clock.schedule_interval(self.moon_phase,  1)
+        tick_scheduler.get(self.app.config).force('sun_transit')
+        tick_scheduler.get(self.app.config).force('moon_phase')
 
     def sunrise_sunset(self):
 
@@ -85,46 +98,32 @@ class astro():
         # Get station timezone
         Tz = pytz.timezone(self.app.config['Station']['Timezone'])
 
-        # Set pressure to 0 to match the United States Naval Observatory Astronomical
-        # Almanac
-        self.observer.pressure = 0
+        # Extend astro event table to cover the coming days
+        table = astro_table.get(self.app.config)
+        table.extend()
 
         # The code is initialising. Calculate sunset/sunrise times for current day
         # starting at midnight today in UTC
         if self.astro_data['Sunset'][0] == '-':
 
-            # Set Observer time to midnight today in UTC
+            # Set start time to midnight today in UTC
             UTC = datetime.now(pytz.utc)
-            Midnight = datetime(UTC.year, UTC.month, UTC.day, 0, 0, 0)
-            self.observer.date = Midnight.strftime('%Y/%m/%d %H:%M:%S')
+            Start = pytz.utc.localize(datetime(UTC.year, UTC.month, UTC.day, 0, 0, 0))
 
         # Dusk has passed. Calculate sunset/sunrise times for tomorrow starting at
         # time of last Dusk in UTC
         else:
 
-            # Set Observer time to last Sunset time in UTC
-            Dusk = self.astro_data['Dusk'][0].astimezone(pytz.utc) + timedelta(minutes=1)
-            self.observer.date = Dusk.strftime('%Y/%m/%d %H:%M:%S')
-
-        # Calculate Dawn time in UTC
-        self.observer.horizon = '-6'
-        Dawn = self.observer.next_rising(self.sun, use_center=True)
-        Dawn = pytz.utc.localize(Dawn.datetime().replace(second=0, microsecond=0))
-
-        # Calculate Sunrise time in UTC
-        self.observer.horizon = '-0:34'
-        Sunrise = self.observer.next_rising(self.sun)
-        Sunrise = pytz.utc.localize(Sunrise.datetime().replace(second=0, microsecond=0))
-
-        # Calculate Sunset time in UTC
-        self.observer.horizon = '-0:34'
-        Sunset = self.observer.next_setting(self.sun)
-        Sunset = pytz.utc.localize(Sunset.datetime().replace(second=0, microsecond=0))
+            # Set start time to last Dusk time in UTC
+            Start = self.astro_data['Dusk'][0].astimezone(pytz.utc) + timedelta(minutes=1)
 
-        # Calculate Dusk time in UTC
-        self.observer.horizon = '-6'
-        Dusk = self.observer.next_setting(self.sun, use_center=True)
-        Dusk = pytz.utc.localize(Dusk.datetime().replace(second=0, microsecond=0))
+        # Look up Dawn, Sunrise, Sunset and Dusk times in UTC from the astro
+        # event table, or calculate them if the table does not yet cover them
+        events = table.next_events(['dawn', 'sunrise', 'sunset', 'dusk'], Start)
+        if events:
+            Dawn, Sunrise, Sunset, Dusk = events
+        else:
+            Dawn, Sunrise, Sunset, Dusk = self.calculate_sun_events(Start)
 
         # Define Dawn/Dusk and Sunrise/Sunset times in Station timezone
         self.astro_data['Dawn'][0]    = Dawn.astimezone(Tz)
@@ -146,6 +145,45 @@ class astro():
         # Format sunrise/sunset labels based on date of next sunrise
         self.format_labels('sun')
 
+    def calculate_sun_events(self, Start):
+
+        """ Calculate the next dawn, sunrise, sunset and dusk times after the
+        start time using pyephem
+
+        INPUTS:
+            Start               Start time in UTC
+
+        OUTPUT:
+            events              List of Dawn, Sunrise, Sunset and Dusk times in
+                                UTC
+        """
+
+        # Set pressure to 0 to match the United States Naval Observatory Astronomical
+        # Almanac
+        self.observer.pressure = 0
+        self.observer.date = Start.strftime('%Y/%m/%d %H:%M:%S')
+
+        # Calculate Dawn time in UTC
+        self.observer.horizon = '-6'
+        Dawn = self.observer.next_rising(self.sun, use_center=True)
+        Dawn = pytz.utc.localize(Dawn.datetime().replace(second=0, microsecond=0))
+
+        # Calculate Sunrise time in UTC
+        self.observer.horizon = '-0:34'
+        Sunrise = self.observer.next_rising(self.sun)
+        Sunrise = pytz.utc.localize(Sunrise.datetime().replace(second=0, microsecond=0))
+
+        # Calculate Sunset time in UTC
+        self.observer.horizon = '-0:34'
+        Sunset = self.observer.next_setting(self.sun)
+        Sunset = pytz.utc.localize(Sunset.datetime().replace(second=0, microsecond=0))
+
+        # Calculate Dusk time in UTC
+        self.observer.horizon = '-6'
+        Dusk = self.observer.next_setting(self.sun, use_center=True)
+        Dusk = pytz.utc.localize(Dusk.datetime().replace(second=0, microsecond=0))
+        return [Dawn, Sunrise, Sunset, Dusk]
+
     def moonrise_moonset(self):
 
         """ Calculate moonrise and moonset times for the current day or
@@ -159,48 +197,72 @@ class astro():
             self.astro_data           Dictionary holding moonrise and moonset data
         """
 
-        # Define Moonrise/Moonset location properties
+        # Get station timezone
         Tz = pytz.timezone(self.app.config['Station']['Timezone'])
 
-        # Define Moonrise/Moonset location properties
-        self.observer.horizon = '0'
-        self.observer.pressure = 1010
-
         # The code is initialising. Calculate moonrise time for current day
         # starting at midnight today in UTC
+        UTC = datetime.now(pytz.utc)
+        Midnight = pytz.utc.localize(datetime(UTC.year, UTC.month, UTC.day, 0, 0, 0))
         if self.astro_data['Moonrise'][0] == '-':
 
-            # Set Observer time to midnight today in UTC
-            UTC = datetime.now(pytz.utc)
-            Midnight = datetime(UTC.year, UTC.month, UTC.day, 0, 0, 0)
-            self.observer.date = Midnight.strftime('%Y/%m/%d %H:%M:%S')
+            # Set start time to midnight today in UTC
+            Start = Midnight
 
         # Moonset has passed. Calculate time of next moonrise starting at
         # time of last Moonset in UTC
         else:
 
-            # Set Observer time to last Moonset time in UTC
-            Moonset = self.astro_data['Moonset'][0].astimezone(pytz.utc) + timedelta(minutes=1)
-            self.observer.date = Moonset.strftime('%Y/%m/%d %H:%M:%S')
+            # Set start time to last Moonset time in UTC
+            Start = self.astro_data['Moonset'][0].astimezone(pytz.utc) + timedelta(minutes=1)
 
-        # Calculate Moonrise time in UTC
-        Moonrise = self.observer.next_rising(self.moon)
-        Moonrise = pytz.utc.localize(Moonrise.datetime().replace(second=0, microsecond=0))
+        # Look up Moonrise time and the time of the following Moonset in UTC,
+        # and the dates of the next full and new moon in UTC from the astro
+        # event table, or calculate them if the table does not yet cover them
+        events = astro_table.get(self.app.config).moon_events(Start, Midnight)
+        if events:
+            Moonrise, Moonset, FullMoon, NewMoon = events
+        else:
+            Moonrise, Moonset, FullMoon, NewMoon = self.calculate_moon_events(Start)
 
-        # Define Moonrise time in Station timezone
+        # Define Moonrise and Moonset time in Station timezone
         self.astro_data['Moonrise'][0] = Moonrise.astimezone(Tz)
+        self.astro_data['Moonset'][0]  = Moonset.astimezone(Tz)
 
-        # Convert Moonrise time in Station timezone to Moonrise time in UTC
-        Moonrise = self.astro_data['Moonrise'][0].astimezone(pytz.utc)
-        self.observer.date = Moonrise.strftime('%Y/%m/%d %H:%M:%S')
+        # Define next new/full moon in station time zone
+        self.astro_data['FullMoon'] = [FullMoon.astimezone(Tz).strftime('%b %d'), FullMoon]
+        self.astro_data['NewMoon']  = [NewMoon.astimezone(Tz).strftime('%b %d'),  NewMoon]
+
+        # Format sunrise/sunset labels based on date of next sunrise
+        self.format_labels('moon')
+
+    def calculate_moon_events(self, Start):
+
+        """ Calculate the next moonrise after the start time, the following
+        moonset and the dates of the next full and new moon using pyephem
+
+        INPUTS:
+            Start               Start time in UTC
+
+        OUTPUT:
+            events              List of Moonrise, Moonset, FullMoon and NewMoon
+                                times in UTC
+        """
+
+        # Define Moonrise/Moonset location properties
+        self.observer.horizon = '0'
+        self.observer.pressure = 1010
+        self.observer.date = Start.strftime('%Y/%m/%d %H:%M:%S')
+
+        # Calculate Moonrise time in UTC
+        Moonrise = self.observer.next_rising(self.moon)
+        Moonrise = pytz.utc.localize(Moonrise.datetime().replace(second=0, microsecond=0))
 
         # Calculate time of next Moonset starting at time of last Moonrise in UTC
+        self.observer.date = Moonrise.strftime('%Y/%m/%d %H:%M:%S')
         Moonset = self.observer.next_setting(self.moon)
         Moonset = pytz.utc.localize(Moonset.datetime().replace(second=0, microsecond=0))
 
-        # Define Moonset time in Station timezone
-        self.astro_data['Moonset'][0] = Moonset.astimezone(Tz)
-
         # Calculate date of next full moon in UTC
         self.observer.date = datetime.now(pytz.utc).strftime('%Y/%m/%d')
         FullMoon = ephem.next_full_moon(self.observer.date)
@@ -209,29 +271,33 @@ class astro():
         # Calculate date of next new moon in UTC
         NewMoon = ephem.next_new_moon(self.observer.date)
         NewMoon = pytz.utc.localize(NewMoon.datetime())
+        return [Moonrise, Moonset, FullMoon, NewMoon]
 
-        # Define next new/full moon in station time zone
-        self.astro_data['FullMoon'] = [FullMoon.astimezone(Tz).strftime('%b %d'), FullMoon]
-        self.astro_data['NewMoon']  = [NewMoon.astimezone(Tz).strftime('%b %d'),  NewMoon]
-
-        # Format sunrise/sunset labels based on date of next sunrise
-        self.format_labels('moon')
-
-    def sun_transit(self, *largs):
+    def sun_transit(self, Now=None):
 
         """ Calculate the sun transit between sunrise and sunset
 
         INPUTS:
             self.astro_data           Dictionary holding sunrise and sunset data
             Config              Station configuration
+            Now                 Current time in station timezone, or None to
+                                use the current time
 
         OUTPUT:
             self.astro_data           Dictionary holding moonrise and moonset data
         """
 
         # Get current time in station time zone
-        Tz = pytz.timezone(self.app.config['Station']['Timezone'])
-        Now = datetime.now(pytz.utc).astimezone(Tz)
+        if Now is None:
+            Now = datetime.now(pytz.utc).astimezone(pytz.timezone(self.app.config['Station']['Timezone']))
+
+        # Once dusk has passed calculate new sunrise/sunset times
+        if Now.replace(microsecond=0) >= self.astro_data['Dusk'][0]:
+            self.sunrise_sunset()
+
+        # Once moonset has passed, calculate new moonrise/moonset times
+        if Now.replace(microsecond=0) > self.astro_data['Moonset'][0]:
+            self.moonrise_moonset()
 
         # Calculate sun icon position on daytime/nightime bar
         secondsMidnight = (Now.replace(microsecond=0) - Now.replace(hour=0, minute=0, second=0, microsecond=0)).total_seconds()
@@ -285,36 +351,34 @@ class astro():
             # Define Kivy Label binds
             self.astro_data['sunEvent'] = ['[color=00A4B4FF]Nightfall[/color]', '{:02.0f}'.format(hours), '{:02.0f}'.format(minutes), 'Dusk']
             self.astro_data['sunIcon']  = ['-', 1, sunPosition]
-            self.update_display()
 
-        # Once dusk has passed calculate new sunrise/sunset times
-        if Now.replace(microsecond=0) >= self.astro_data['Dusk'][0]:
-            self.sunrise_sunset()
-
-        # Once moonset has passed, calculate new moonrise/moonset times
-        if Now.replace(microsecond=0) > self.astro_data['Moonset'][0]:
-            self.moonrise_moonset()
+        # Update display with new sun transit
+        self.update_display()
 
         # At midnight update sunrise/sunset times
         if self.astro_data['Reformat'] and Now.replace(second=0).replace(microsecond=0).time() == time(0, 0, 0):
             self.format_labels('sun')
             self.format_labels('moon')
 
-    def moon_phase(self, *largs):
+    def moon_phase(self, now=None):
 
         """ Calculate the moon phase for the current time in station timezone
 
         INPUTS:
             self.astro_data           Dictionary holding moonrise and moonset data
             Config              Station configuration
+            now                 Current time in station timezone, or None to
+                                use the current time
 
         OUTPUT:
             self.astro_data           Dictionary holding moonrise and moonset data
         """
 
         # Get current time in UTC
-        Tz = pytz.timezone(self.app.config['Station']['Timezone'])
-        UTC = datetime.now(pytz.utc)
+        if now is None:
+            now = datetime.now(pytz.utc).astimezone(pytz.timezone(self.app.config['Station']['Timezone']))
+        Tz  = now.tzinfo
+        UTC = now.astimezone(pytz.utc)
 
         # Get date of next full moon in station time zone
         full_moon = self.astro_data['FullMoon'][1].astimezone(Tz)
@@ -322,15 +386,16 @@ class astro():
         # Get date of next new moon in station time zone
         new_moon = self.astro_data['NewMoon'][1].astimezone(Tz)
 
-        # Calculate phase of moon
-        self.moon.compute(UTC.strftime('%Y/%m/%d %H:%M:%S'))
+        # Get phase of moon and angle of illuminated moon face from the moon
+        # state cache
+        phase, angle = self.moon_state(UTC.timestamp())
 
         # Define Moon phase icon and tilt_sign
         if full_moon < new_moon:
-            phase_icon = 'Waxing_' + '{:.0f}'.format(self.moon.phase)
+            phase_icon = 'Waxing_' + '{:.0f}'.format(phase)
             tilt_sign  = +1
         elif new_moon < full_moon:
-            phase_icon = 'Waning_' + '{:.0f}'.format(self.moon.phase)
+            phase_icon = 'Waning_' + '{:.0f}'.format(phase)
             tilt_sign  = -1
 
         # Define Moon phase text
@@ -338,34 +403,120 @@ class astro():
             phase_text = 'New Moon'
         elif self.astro_data['FullMoon'] == '[color=ff8837ff]Today[/color]':
             phase_text = 'Full Moon'
-        elif full_moon < new_moon and self.moon.phase < 49:
+        elif full_moon < new_moon and phase < 49:
             phase_text = 'Waxing crescent'
-        elif full_moon < new_moon and 49 <= self.moon.phase <= 51:
+        elif full_moon < new_moon and 49 <= phase <= 51:
             phase_text = 'First Quarter'
-        elif full_moon < new_moon and self.moon.phase > 51:
+        elif full_moon < new_moon and phase > 51:
             phase_text = 'Waxing gibbous'
-        elif new_moon < full_moon and self.moon.phase > 51:
+        elif new_moon < full_moon and phase > 51:
             phase_text = 'Waning gibbous'
-        elif new_moon < full_moon and 49 <= self.moon.phase <= 51:
+        elif new_moon < full_moon and 49 <= phase <= 51:
             phase_text = 'Last Quarter'
-        elif new_moon < full_moon and self.moon.phase < 49:
+        elif new_moon < full_moon and phase < 49:
             phase_text = 'Waning crescent'
 
         # Define Moon phase illumination
-        illumination = '{:.0f}'.format(self.moon.phase)
+        illumination = '{:.0f}'.format(phase)
 
         # Calculate tilt of illuminated moon face
-        self.observer.date = UTC.strftime('%Y/%m/%d %H:%M:%S')
+        tilt = tilt_sign * 90 - angle
+
+        # Define Kivy labels. The display is only updated when the moon icon,
+        # text or rounded tilt changes
+        key = (phase_icon, phase_text, illumination, round(tilt))
+        if key != self.moon_key:
+            self.moon_key = key
+            self.astro_data['Phase'] = [phase_icon, phase_text, illumination, tilt]
+            update_bus.get().post('Astro', 'Phase', self.astro_data['Phase'])
+
+    def moon_sample(self, sample_time):
+
+        """ Calculate the moon phase and the angle of the illuminated moon face
+        using pyephem
+
+        INPUTS:
+            sample_time         Sample time as UNIX timestamp
+
+        OUTPUT:
+            sample              Tuple of sample time, moon phase and angle of
+                                illuminated moon face                   [degrees]
+        """
+
+        # Calculate phase of moon
+        UTC = datetime.fromtimestamp(sample_time, pytz.utc).strftime('%Y/%m/%d %H:%M:%S')
+        self.moon.compute(UTC)
+        phase = self.moon.phase
+
+        # Calculate angle of illuminated moon face
+        self.observer.date = UTC
         self.moon.compute(self.observer)
         self.sun.compute(self.observer)
+        self.ephem_calls += 3
         dLon = self.sun.az - self.moon.az
         y = math.sin(dLon) * math.cos(self.sun.alt)
         x = math.cos(self.moon.alt) * math.sin(self.sun.alt) - math.sin(self.moon.alt) * math.cos(self.sun.alt) * math.cos(dLon)
-        tilt = tilt_sign * 90 - math.degrees(math.atan2(y, x))
+        return sample_time, phase, math.degrees(math.atan2(y, x))
 
-        # Define Kivy labels
-        self.astro_data['Phase'] = [phase_icon, phase_text, illumination, tilt]
-        self.update_display()
+    def moon_next(self, start):
+
+        """ Calculate the moon sample that follows the given sample. The sample
+        is calculated after the configured interval. The interval is halved to
+        the nearest whole minute, down to one minute, while the angle of the
+        illuminated moon face changes by more than MAX_TILT_STEP over the
+        interval, or while the angle at the middle of the interval differs
+        from the interpolated angle by more than MAX_TILT_ERROR
+
+        INPUTS:
+            start               Tuple of sample time, moon phase and angle of
+                                illuminated moon face
+
+        OUTPUT:
+            samples             Tuple of start and next moon sample
+        """
+
+        interval = self.moon_interval
+        end = self.moon_sample(start[0] + interval)
+        while interval > 60:
+            half   = 60 * max(1, int(interval // 120))
+            middle = self.moon_sample(start[0] + half)
+            step   = (end[2] - start[2] + 180) % 360 - 180
+            error  = (middle[2] - start[2] - step * half / interval + 180) % 360 - 180
+            if abs(step) <= MAX_TILT_STEP and abs(error) <= MAX_TILT_ERROR:
+                break
+            interval, end = half, middle
+        return start, end
+
+    def moon_state(self, sample_time):
+
+        """ Return the moon phase and angle of the illuminated moon face,
+        interpolated between samples calculated by moon_next
+
+        INPUTS:
+            sample_time         Current time as UNIX timestamp
+
+        OUTPUT:
+            phase               Moon phase                                  [%]
+            angle               Angle of illuminated moon face          [degrees]
+        """
+
+        # Initialise moon samples when starting or when the current time is
+        # outside the cached samples
+        if (self.moon_samples is None or sample_time < self.moon_samples[0][0]
+                or sample_time > self.moon_samples[1][0] + self.moon_interval):
+            self.moon_samples = self.moon_next(self.moon_sample(sample_time))
+
+        # Advance moon samples until they bracket the current time
+        while sample_time > self.moon_samples[1][0]:
+            self.moon_samples = self.moon_next(self.moon_samples[1])
+
+        # Interpolate phase and angle of illuminated face, allowing for the
+        # angle wrapping at +/-180 degrees
+        start, end = self.moon_samples
+        fraction = (sample_time - start[0]) / (end[0] - start[0])
+        phase = start[1] + (end[1] - start[1]) * fraction
+        angle = start[2] + ((end[2] - start[2] + 180) % 360 - 180) * fraction
+        return phase, (angle + 180) % 360 - 180
 
     def format_labels(self, Type):
 
@@ -438,16 +589,7 @@ class astro():
 
     def update_display(self):
 
-        """ Update display with new astro variables. Catch ReferenceErrors to
-        prevent console crashing
+        """ Post new astro variables to the display update bus
         """
 
-        # Update display values with new derived observations
-        reference_error = False
-        for Key, Value in list(self.astro_data.items()):
-            try:
-                self.app.CurrentConditions.Astro[Key] = Value
-            except ReferenceError:
-                if not reference_error:
-                    Logger.warning(f'astro: {system().log_time()} - Reference error')
-                    reference_error = True
+        update_bus.get().post_dict('Astro', self.astro_data)
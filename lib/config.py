@@ -22,13 +22,15 @@ from tzlocal        import get_localzone
 import configparser
 import collections
 import subprocess
-import requests
 import platform
 import sys
 import os
 
+# Import required library modules
+from lib.request_api import http_client
+
 # Define wfpiconsole version number
-ver = 'v25.9.2'
+ver = 'v25.9.3'
 
 # Define required variables
 TEMPEST       = False
@@ -295,7 +297,7 @@ def verify_station(config):
         Template = 'https://swd.weatherflow.com/swd/rest/observations/station/{}?token={}'
         URL = Template.format(config['Station']['StationID'], config['Keys']['WeatherFlow'])
         try:
-            STATION = requests.get(URL).json()
+            STATION = http_client.get(URL, config, timeout=api_timeout(config)).json()
         except Exception:
             STATION = None
         if STATION is not None and 'status' in STATION:
@@ -555,7 +557,7 @@ def write_config_key(config, section, key, details):
             while True:
                 Template = 'https://swd.weatherflow.com/swd/rest/observations/station/{}?token={}'
                 URL = Template.format(config['Station']['StationID'], config['Keys']['WeatherFlow'])
-                OBSERVATION = requests.get(URL).json()
+                OBSERVATION = http_client.get(URL, config, timeout=api_timeout(config)).json()
                 if 'status' in STATION:
                     if 'SUCCESS' in STATION['status']['status_message']:
                         break
@@ -729,7 +731,7 @@ def validate_API_keys(config):
             while True:
                 header = {'X-API-Key': config['Keys']['CheckWX']}
                 URL = 'https://api.checkwx.com/station/EGLL'
-                CHECKWX = requests.get(URL, headers=header).json()
+                CHECKWX = http_client.get(URL, config, headers=header, timeout=api_timeout(config)).json()
                 if 'error' in CHECKWX:
                     if 'Unauthorized' in CHECKWX['error']:
                         input_string = '    Access not authorized. Please re-enter your CheckWX API key*: '
@@ -757,7 +759,7 @@ def validate_API_keys(config):
             while True:
                 url_template = 'https://swd.weatherflow.com/swd/rest/stations/?token={}'
                 URL = url_template.format(config['Keys']['WeatherFlow'])
-                STATION = requests.get(URL).json()
+                STATION = http_client.get(URL, config, timeout=api_timeout(config)).json()
                 if 'status' in STATION:
                     if 'UNAUTHORIZED' in STATION['status']['status_message']:
                         input_string = '    Access not authorized. Please re-enter your WeatherFlow Personal Access Token*: '
@@ -800,6 +802,26 @@ def validate_API_keys(config):
                     sys.exit('\n    Error: unable to fetch station metadata')
 
 
+# ==============================================================================
+def api_timeout(config):
+
+    """ Returns the timeout for API requests made while the configuration file
+        is created or updated, when the System section may not exist yet
+
+    INPUTS:
+        config          Station configuration
+
+    OUTPUT:
+        timeout         Timeout for API requests                        [s]
+
+    """
+
+    if config.has_option('System', 'Timeout'):
+        return http_client.request_timeout(config)
+    return int(default_config_file()['System']['Timeout']['value'])
+
+
+# ==============================================================================
 def query_user(question, default=None):
 
     """ Ask a yes/no question via raw_input() and return their answer.
@@ -920,7 +942,14 @@ def default_config_file():
                                                          ('rest_api',              {'type': 'dependent',                              'desc': 'REST API services',   'value': 1}),
                                                          ('stats_endpoint',        {'type': 'default',   'value': '0',                'desc': 'Statistics API endpoint toggle'}),
                                                          ('SagerInterval',         {'type': 'default',   'value': '6',                'desc': 'Interval in hours between Sager Forecasts'}),
+                                                         ('MoonInterval',          {'type': 'default',   'value': '5',                'desc': 'Interval in minutes between moon phase calculations'}),
                                                          ('Timeout',               {'type': 'default',   'value': '20',               'desc': 'Timeout in seconds for API requests'}),
+                                                         ('ParseQueueDepth',       {'type': 'default',   'value': '8',                'desc': 'Maximum number of queued messages per message type'}),
+                                                         ('ParseQueuePolicy',      {'type': 'default',   'value': 'drop_oldest',      'desc': 'Parse queue overflow policy (drop_oldest, drop_newest or coalesce)'}),
+                                                         ('ArchiveFile',           {'type': 'default',   'value': 'wfpiconsole.db',   'desc': 'Local observation archive database (blank to disable)'}),
+                                                         ('SnapshotFile',          {'type': 'default',   'value': 'wfpiconsole.snapshot', 'desc': 'Warm-start snapshot of current observations (blank to disable)'}),
+                                                         ('AstroFile',             {'type': 'default',   'value': 'wfpiconsole.astro', 'desc': 'Cache of sun and moon event times (blank to disable)'}),
+                                                         ('CaptureFile',           {'type': 'default',   'value': '',                 'desc': 'File to capture raw Websocket/UDP messages to (blank to disable)'}),
                                                          ('Hardware',              {'type': 'default',   'value': hardware,           'desc': 'Hardware type'}),
                                                          ('Version',               {'type': 'default',   'value': ver,                'desc': 'Version number'})])
 
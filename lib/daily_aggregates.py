@@ -0,0 +1,231 @@
+""" Defines the streaming daily aggregates used by the Raspberry Pi Python
+console for WeatherFlow Tempest and Smart Home Weather stations to calculate
+daily maximum, minimum, average and accumulated observations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required Python modules
+from datetime import datetime, timedelta
+import operator
+import pytz
+
+
+# ==============================================================================
+# DEFINE 'daily_aggregate' CLASS
+# ==============================================================================
+class daily_aggregate():
+
+    """ Base class for an aggregate of observations since midnight station
+    time. The aggregate is seeded once from the current day of observations and
+    then updated with each new observation. The end of the current day is
+    cached, so that each update only compares the observation time against it
+
+    INPUTS:
+        config              Station configuration
+    """
+
+    # Define fields saved in the warm-start snapshot
+    fields = ()
+
+    def __init__(self, config):
+        self.Tz = pytz.timezone(config['Station']['Timezone'])
+        self.seeded    = False
+        self.day_end   = None
+        self.last_time = None
+        self.clear()
+
+    def clear(self):
+
+        """ Clear the aggregated values
+        """
+
+        pass
+
+    def add(self, ob_time, value):
+
+        """ Add an observation to the aggregated values
+        """
+
+        pass
+
+    def rollover(self, ob_time):
+
+        """ Day-rollover hook. Clears the aggregated values when an observation
+        is received after midnight station time
+
+        INPUTS:
+            ob_time             Observation time                              [s]
+
+        OUTPUT:
+            rollover            True if the aggregate was cleared
+        """
+
+        if self.day_end is None or ob_time >= self.day_end:
+            midnight = datetime.fromtimestamp(ob_time, self.Tz).replace(tzinfo=None)
+            midnight = datetime(midnight.year, midnight.month, midnight.day) + timedelta(days=1)
+            cleared = self.day_end is not None
+            self.day_end = self.Tz.localize(midnight).timestamp()
+            if cleared:
+                self.clear()
+            return cleared
+        return False
+
+    def seed(self, times, values):
+
+        """ Seed the aggregate from the current day of observations
+
+        INPUTS:
+            times               List of observation times in chronological
+                                order                                         [s]
+            values              List of observation values
+        """
+
+        self.clear()
+        self.day_end   = None
+        self.last_time = None
+        for ob_time, value in zip(times, values):
+            self.update(ob_time, value)
+        self.seeded = True
+
+    def update(self, ob_time, value):
+
+        """ Update the aggregate with a new observation. Observations that are
+        not newer than the last observation are ignored
+
+        INPUTS:
+            ob_time             Observation time                              [s]
+            value               Observation value
+        """
+
+        if value is None or (self.last_time is not None and ob_time <= self.last_time):
+            return
+        self.rollover(ob_time)
+        self.add(ob_time, value)
+        self.last_time = ob_time
+
+    def state(self):
+
+        """ Return the aggregate state for the warm-start snapshot
+        """
+
+        state = {'seeded': self.seeded, 'day_end': self.day_end, 'last_time': self.last_time}
+        state.update({field: getattr(self, field) for field in self.fields})
+        return state
+
+    def restore(self, state):
+
+        """ Restore the aggregate state from the warm-start snapshot
+        """
+
+        for field in ('seeded', 'day_end', 'last_time') + self.fields:
+            setattr(self, field, state[field])
+
+
+# ==============================================================================
+# DEFINE 'daily_extreme' CLASS
+# ==============================================================================
+class daily_extreme(daily_aggregate):
+
+    """ Running daily maximum or minimum and the time it was observed
+
+    INPUTS:
+        config              Station configuration
+        compare             operator.gt for maximum or operator.lt for minimum
+    """
+
+    fields = ('value', 'time')
+
+    def __init__(self, config, compare):
+        self.compare = compare
+        super().__init__(config)
+
+    def clear(self):
+        self.value = None
+        self.time  = None
+
+    def add(self, ob_time, value):
+        if self.value is None or self.compare(value, self.value):
+            self.value = value
+            self.time  = ob_time
+
+
+# ==============================================================================
+# DEFINE 'daily_mean' CLASS
+# ==============================================================================
+class daily_mean(daily_aggregate):
+
+    """ Running daily mean and number of observations
+    """
+
+    fields = ('value', 'count')
+
+    def clear(self):
+        self.value = None
+        self.count = 0
+
+    def add(self, ob_time, value):
+        self.count += 1
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += (value - self.value) / self.count
+
+
+# ==============================================================================
+# DEFINE 'daily_integral' CLASS
+# ==============================================================================
+class daily_integral(daily_aggregate):
+
+    """ Running daily integral of one minute observations
+
+    INPUTS:
+        config              Station configuration
+        interval            Interval represented by each observation
+    """
+
+    fields = ('value',)
+
+    def __init__(self, config, interval):
+        self.interval = interval
+        super().__init__(config)
+
+    def clear(self):
+        self.value = None
+
+    def add(self, ob_time, value):
+        self.value = (self.value or 0) + value * self.interval
+
+
+def create(config):
+
+    """ Create the daily aggregates required by the observation parser
+
+    INPUTS:
+        config              Station configuration
+
+    OUTPUT:
+        aggregates          Dictionary of daily aggregates keyed by derived
+                            observation
+    """
+
+    return {'outTempMax': daily_extreme(config, operator.gt),
+            'outTempMin': daily_extreme(config, operator.lt),
+            'inTempMax':  daily_extreme(config, operator.gt),
+            'inTempMin':  daily_extreme(config, operator.lt),
+            'SLPMax':     daily_extreme(config, operator.gt),
+            'SLPMin':     daily_extreme(config, operator.lt),
+            'gustMax':    daily_extreme(config, operator.gt),
+            'windAvg':    daily_mean(config),
+            'peakSun':    daily_integral(config, 1 / 60)}
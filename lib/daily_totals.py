@@ -0,0 +1,233 @@
+""" Defines the persistent cache of daily summary data used by the Raspberry Pi
+Python console for WeatherFlow Tempest and Smart Home Weather stations to
+calculate month and year rain and lightning totals.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib.request_api import weatherflow_api
+from lib.system      import system
+
+# Import required Kivy modules
+from kivy.logger     import Logger
+
+# Import required Python modules
+from datetime        import datetime, timedelta
+import threading
+import sqlite3
+import json
+import time
+import pytz
+
+# Define minimum time after the end of a day before its summary data is
+# treated as final and cached                                               [s]
+SETTLE_TIME = 3600
+
+# Define shared caches keyed by database path
+_caches = {}
+_lock   = threading.Lock()
+
+
+# ==============================================================================
+# DEFINE 'daily_cache' CLASS
+# ==============================================================================
+class daily_cache():
+
+    """ Per-device cache of WeatherFlow API daily summary (bucket e) data. Each
+    closed day is downloaded once and stored, so that month and year requests
+    only download the days that are not already cached. Days with no data are
+    cached as empty so that they are not requested again
+
+    INPUTS:
+        path                Path to SQLite database
+    """
+
+    def __init__(self, path):
+
+        # Define instance variables
+        self.path  = path
+        self.local = threading.local()
+        self.lock  = threading.Lock()
+
+        # Create cache table
+        with self.connection() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS daily_totals ('
+                               'device TEXT NOT NULL, day TEXT NOT NULL, data TEXT, '
+                               'PRIMARY KEY (device, day)) WITHOUT ROWID')
+
+    def connection(self):
+
+        """ Return the database connection for the calling thread
+        """
+
+        if not hasattr(self.local, 'connection'):
+            self.local.connection = sqlite3.connect(self.path, timeout=10)
+        return self.local.connection
+
+    def days(self, device, first_day, last_day, config):
+
+        """ Return daily summary data for a range of closed days, downloading
+        any days that are not cached from the WeatherFlow API
+
+        INPUTS:
+            device              Device ID
+            first_day           First day in station timezone
+            last_day            Last day in station timezone
+            config              Station configuration
+
+        OUTPUT:
+            api_data            api_response object containing daily summary
+                                data, or None if missing days could not be
+                                downloaded
+        """
+
+        # Return empty response if there are no closed days in range
+        if last_day < first_day:
+            return weatherflow_api.api_response.from_obs([])
+
+        # Read cached days
+        device = str(device)
+        try:
+            rows = self.connection().execute('SELECT day, data FROM daily_totals WHERE device = ? AND day BETWEEN ? AND ?',
+                                             (device, first_day.isoformat(), last_day.isoformat())).fetchall()
+        except sqlite3.Error as error:
+            Logger.warning(f'daily_totals: {system().log_time()} - Read failed: {error}')
+            return None
+        cached = {day: json.loads(data) if data is not None else None for day, data in rows}
+
+        # Download days that are not cached in a single request covering the
+        # first to the last missing day
+        missing = [day for day in day_range(first_day, last_day) if day.isoformat() not in cached]
+        if missing:
+            Tz = pytz.timezone(config['Station']['Timezone'])
+            start_time = int(Tz.localize(datetime.combine(missing[0],  datetime.min.time())).timestamp())
+            end_time   = int(Tz.localize(datetime.combine(missing[-1], datetime.min.time()) + timedelta(days=1)).timestamp()) - 1
+            api_data   = weatherflow_api.daily(device, start_time, end_time, config)
+            if api_data is None or not api_data.ok:
+                return None
+            downloaded = {day.isoformat(): None for day in missing}
+            for ob in api_data.obs or []:
+                if ob and ob[0] is not None:
+                    day = datetime.fromtimestamp(ob[0], Tz).date().isoformat()
+                    if day in downloaded:
+                        downloaded[day] = ob
+            cached.update(downloaded)
+            self.store(device, downloaded, end_time, Tz)
+
+        # Return daily summary data in chronological order
+        obs = [cached[day] for day in sorted(cached) if cached[day] is not None]
+        return weatherflow_api.api_response.from_obs(obs)
+
+    def store(self, device, downloaded, end_time, Tz):
+
+        """ Store downloaded days that have settled
+
+        INPUTS:
+            device              Device ID
+            downloaded          Dictionary of daily summary data keyed by day
+            end_time            End time of downloaded data                   [s]
+            Tz                  Station timezone
+        """
+
+        settled = time.time() - SETTLE_TIME
+        rows = []
+        for day, ob in downloaded.items():
+            day_end = Tz.localize(datetime.fromisoformat(day) + timedelta(days=1)).timestamp()
+            if day_end <= settled:
+                rows.append((device, day, json.dumps(ob) if ob is not None else None))
+        try:
+            with self.lock, self.connection() as connection:
+                connection.executemany('INSERT OR REPLACE INTO daily_totals (device, day, data) VALUES (?, ?, ?)', rows)
+        except sqlite3.Error as error:
+            Logger.warning(f'daily_totals: {system().log_time()} - Write failed: {error}')
+
+    def month(self, device, config):
+
+        """ Return daily summary data from the current month in the station
+        timezone, up to the end of the day before yesterday to match the window
+        of weatherflow_api.month()
+
+        INPUTS:
+            device              Device ID
+            config              Station configuration
+
+        OUTPUT:
+            api_data            api_response object, or None if the data could
+                                not be downloaded
+        """
+
+        today = station_today(config)
+        return self.days(device, today.replace(day=1), today - timedelta(days=2), config)
+
+    def year(self, device, config):
+
+        """ Return daily summary data from the current year in the station
+        timezone, up to the end of the day before yesterday to match the window
+        of weatherflow_api.year()
+
+        INPUTS:
+            device              Device ID
+            config              Station configuration
+
+        OUTPUT:
+            api_data            api_response object, or None if the data could
+                                not be downloaded
+        """
+
+        today = station_today(config)
+        return self.days(device, today.replace(month=1, day=1), today - timedelta(days=2), config)
+
+
+def get(config):
+
+    """ Return the shared daily summary cache. The cache is stored in the local
+    observation archive database
+
+    INPUTS:
+        config              Station configuration
+
+    OUTPUT:
+        cache               daily_cache object, or None if the archive is
+                            disabled or cannot be opened
+    """
+
+    path = config['System'].get('ArchiveFile', '').strip()
+    if not path:
+        return None
+    with _lock:
+        if path not in _caches:
+            try:
+                _caches[path] = daily_cache(path)
+            except sqlite3.Error as error:
+                Logger.error(f'daily_totals: {system().log_time()} - Unable to open cache: {error}')
+                return None
+        return _caches[path]
+
+
+def station_today(config):
+
+    """ Return the current date in the station timezone
+    """
+
+    Tz = pytz.timezone(config['Station']['Timezone'])
+    return datetime.now(pytz.utc).astimezone(Tz).date()
+
+
+def day_range(first_day, last_day):
+
+    """ Return list of days from first_day to last_day inclusive
+    """
+
+    return [first_day + timedelta(days=ii) for ii in range((last_day - first_day).days + 1)]
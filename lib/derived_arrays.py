@@ -0,0 +1,220 @@
+""" Returns array versions of the derived weather variables required by the
+Raspberry Pi Python console for WeatherFlow Tempest and Smart Home Weather
+stations, for use with days or years of observations at a time.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required Python modules
+import numpy as np
+
+# Each function accepts lists or arrays of observations, with missing values
+# given as None or NaN, and returns arrays with NaN (or the missing label) where
+# the matching function in derived_variables returns None
+
+# Define cardinal wind directions
+CARDINAL = np.array(['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 'S', 'SSW',
+                     'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW', 'N', 'Calm', '-'])
+
+
+def array(values):
+
+    """ Convert a list of observations into a float array with NaN for missing
+    values
+    """
+
+    if isinstance(values, (list, tuple)):
+        values = [np.nan if value is None else value for value in values]
+    return np.asarray(values, dtype=np.float64)
+
+
+def dew_point(out_temp, humidity):
+
+    """ Calculate the dew point from the temperature and relative humidity
+
+    INPUTS:
+        out_temp            Outdoor temperature from AIR/TEMPEST device      [C]
+        humidity            Relative humidity from AIR/TEMPEST module        [%]
+
+    OUTPUT:
+        dew_point           Dew point                                        [C]
+    """
+
+    out_temp = array(out_temp)
+    humidity = array(humidity)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        A = 17.625
+        B = 243.04
+        N = B * (np.log(humidity / 100.0) + (A * out_temp) / (B + out_temp))
+        D = A - np.log(humidity / 100.0) - (A * out_temp) / (B + out_temp)
+        dew_point = N / D
+    return np.where(humidity > 0, dew_point, np.nan)
+
+
+def feels_like(out_temp, humidity, wind_spd, config):
+
+    """ Calculate the Feels Like temperature from the temperature, relative
+    humidity, and wind speed
+
+    INPUTS:
+        out_temp            Outdoor temperature from AIR/TEMPEST device    [C]
+        humidity            Relative humidity from AIR/TEMPEST device      [%]
+        wind_spd            Wind speed from SKY/TEMPEST device             [m/s]
+        config              Station configuration
+
+    OUTPUT:
+        feels_like          Feels Like temperature                         [C]
+        index               Index of Feels Like description and icon, with
+                            the last index for missing values
+    """
+
+    out_temp = array(out_temp)
+    humidity = array(humidity)
+    wind_spd = array(wind_spd)
+
+    # Convert observation units as required
+    temp_F   = out_temp * (9 / 5) + 32
+    wind_mph = wind_spd * 2.2369362920544
+    wind_kph = wind_spd * 3.6
+
+    # Calculate wind chill and Heat Index, and select the Feels Like
+    # temperature
+    with np.errstate(invalid='ignore'):
+        wind_chill = (+ 13.12 + 0.6215 * out_temp
+                      - 11.37 * (wind_kph)**0.16 + 0.3965 * out_temp
+                      * (wind_kph)**0.16)
+        heat_index = (-42.379 + (2.04901523 * temp_F)
+                      + (10.1433127 * humidity)
+                      - (0.22475541 * temp_F * humidity)
+                      - (6.83783e-3 * temp_F**2)
+                      - (5.481717e-2 * humidity**2)
+                      + (1.22874e-3 * temp_F**2 * humidity)
+                      + (8.5282e-4 * temp_F * humidity**2)
+                      - (1.99e-6 * temp_F**2 * humidity**2))
+        is_chill = (out_temp <= 10) & (wind_mph > 3)
+        is_heat  = ~is_chill & (temp_F >= 80) & (humidity >= 40)
+    feels_like = np.where(is_chill, wind_chill, np.where(is_heat, (heat_index - 32) * (5 / 9), out_temp))
+    feels_like[np.isnan(out_temp) | np.isnan(humidity) | np.isnan(wind_spd)] = np.nan
+
+    # Define Feels Like description index
+    cutoffs = [float(item) for item in list(config['FeelsLike'].values())]
+    if config['Units']['Temp'] == 'f':
+        index = np.searchsorted(cutoffs, feels_like * (9 / 5) + 32, side='right')
+    else:
+        index = np.searchsorted(cutoffs, feels_like, side='right')
+    index[np.isnan(feels_like)] = len(cutoffs) + 1
+    return feels_like, index
+
+
+def SLP(pressure, device, config):
+
+    """ Calculate sea level pressure from station pressure
+
+    INPUTS:
+        pressure            Station pressure from AIR/TEMPEST device        [mb]
+        device              Device ID
+        config              Station configuration
+
+    OUTPUT:
+        SLP                 Sea level pressure                              [mb]
+    """
+
+    # Extract required configuration variables
+    elevation = config['Station']['Elevation']
+    if str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]:
+        height = config['Station']['OutAirHeight']
+    elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
+        height = config['Station']['TempestHeight']
+
+    # Define required constants
+    P0      = 1013.25
+    Rd      = 287.05
+    gamma_s = 0.0065
+    g       = 9.80665
+    T0      = 288.15
+    elevation = float(elevation) + float(height)
+
+    # Calculate and return sea level pressure
+    pressure = array(pressure)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        SLP = (pressure
+               * (1 + ((P0 / pressure)**((Rd * gamma_s) / g))
+               * ((gamma_s * elevation) / T0))**(g / (Rd * gamma_s))
+               )
+    return SLP
+
+
+def beaufort_scale(wind_spd):
+
+    """ Defines the Beaufort scale force from the wind speed
+
+    INPUTS:
+        wind_spd            Wind speed                             [m/s]
+
+    OUTPUT:
+        force               Beaufort scale force
+    """
+
+    wind_spd = array(wind_spd)
+    cutoffs  = [0.5, 1.5, 3.3, 5.5, 7.9, 10.7, 13.8, 17.1, 20.7, 24.4, 28.4, 32.6]
+    force    = np.searchsorted(cutoffs, wind_spd, side='right').astype(np.float64)
+    force[np.isnan(wind_spd)] = np.nan
+    return force
+
+
+def uv_index(uv_level):
+
+    """ Defines the UV index from the UV level
+
+    INPUTS:
+        uv_level            UV level
+
+    OUTPUT:
+        index               UV index rounded to one decimal place
+        level               Index of UV level description and colour
+    """
+
+    # Round UV level to one decimal place. Values close to a rounding tie are
+    # rounded individually so that they match the correctly rounded result of
+    # the built-in round()
+    uv_level = array(uv_level)
+    index    = np.round(uv_level, 1)
+    with np.errstate(invalid='ignore'):
+        tie  = np.flatnonzero(np.abs(np.abs(uv_level * 10) % 1 - 0.5) < 1e-6)
+    index[tie] = [round(value, 1) for value in uv_level[tie].tolist()]
+    with np.errstate(invalid='ignore'):
+        level = np.where(uv_level > 0, np.searchsorted([0, 3, 6, 8, 11], index, side='right'), 0)
+    return index, level
+
+
+def cardinal_wind_dir(wind_dir, wind_spd=None):
+
+    """ Defines the cardinal wind direction from the wind direction in degrees.
+    Sets the wind direction as "Calm" if the wind speed is zero
+
+    INPUTS:
+        wind_dir            Wind direction                     [degrees]
+        wind_spd            Optional wind speed                    [m/s]
+
+    OUTPUT:
+        cardinal_wind       Cardinal wind direction, or '-' if missing
+    """
+
+    wind_dir = array(wind_dir)
+    wind_spd = np.ones_like(wind_dir) if wind_spd is None else array(wind_spd)
+    index    = np.rint(np.nan_to_num(wind_dir) / 22.5).astype(np.int64)
+    index    = np.where(np.isnan(wind_dir), len(CARDINAL) - 1, index)
+    index    = np.where(wind_spd == 0, len(CARDINAL) - 2, index)
+    index    = np.where(np.isnan(wind_spd), len(CARDINAL) - 1, index)
+    return CARDINAL[index]
@@ -0,0 +1,278 @@
+""" Defines the dependency graph of derived variables and display values used by
+the Raspberry Pi Python console for WeatherFlow Tempest and Smart Home Weather
+stations to recalculate only the values whose inputs have changed.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib.observation_value import obs_value
+from lib                   import derived_variables as derive
+
+# Import required Python modules
+from datetime import datetime, timedelta
+import collections
+import pytz
+
+# Define derived variable node. Each node is recalculated when one of its inputs
+# has changed, unless the optional skip function returns True. Inputs are
+# device observations, derived variables calculated by earlier nodes, the
+# pseudo-input 'day' that changes at midnight station time, or the pseudo-input
+# 'skyTime' that changes with each SKY or TEMPEST observation
+node = collections.namedtuple('node', ['key', 'types', 'inputs', 'calculate', 'skip'], defaults=[None])
+
+# Define display value. Each display value is reformatted when its source
+# observation has changed
+display = collections.namedtuple('display', ['key', 'types', 'source', 'units', 'format'])
+
+# Define device types that provide each group of observations
+OUT_AIR = ('obs_out_air', 'obs_st')
+SKY     = ('obs_sky', 'obs_st')
+IN_AIR  = ('obs_in_air',)
+
+# Define device observation holding the observation time of each message type
+TIME_SOURCE = {'obs_st':      'obTime',  'obs_out_air': 'obTime',       'obs_in_air': 'obTime',
+               'obs_sky':     'windSpd', 'rapid_wind':  'rapidWindSpd', 'evt_strike': 'strikeTime'}
+
+# Define derived variable nodes in dependency order
+NODES = [
+    node('feelsLike',    OUT_AIR, ('outTemp', 'humidity', 'windSpd'),
+         lambda p, device, config: derive.feels_like(p.device_obs['outTemp'], p.device_obs['humidity'], p.device_obs['windSpd'], config)),
+    node('dewPoint',     OUT_AIR, ('outTemp', 'humidity'),
+         lambda p, device, config: derive.dew_point(p.device_obs['outTemp'], p.device_obs['humidity'])),
+    node('outTempDiff',  OUT_AIR, ('outTemp', 'obTime'),
+         lambda p, device, config: derive.temp_diff(p.device_obs['outTemp'], p.device_obs['obTime'], device, p.obs_buffer[device], config)),
+    node('outTempTrend', OUT_AIR, ('outTemp', 'obTime'),
+         lambda p, device, config: derive.temp_trend(p.device_obs['outTemp'], p.device_obs['obTime'], device, p.obs_buffer[device], config)),
+    node('outTempMax',   OUT_AIR, ('outTemp', 'day'),
+         lambda p, device, config: derive.temp_max(p.device_obs['outTemp'], p.device_obs['obTime'], p.aggregates['outTempMax'], device, p.api_data, config)),
+    node('outTempMin',   OUT_AIR, ('outTemp', 'day'),
+         lambda p, device, config: derive.temp_min(p.device_obs['outTemp'], p.device_obs['obTime'], p.aggregates['outTempMin'], device, p.api_data, config)),
+    node('SLP',          OUT_AIR, ('pressure',),
+         lambda p, device, config: derive.SLP(p.device_obs['pressure'], device, config)),
+    node('SLPTrend',     OUT_AIR, ('pressure', 'obTime'),
+         lambda p, device, config: derive.SLP_trend(p.device_obs['pressure'], p.device_obs['obTime'], device, p.obs_buffer[device], config)),
+    node('SLPMax',       OUT_AIR, ('pressure', 'day'),
+         lambda p, device, config: derive.SLP_max(p.device_obs['pressure'], p.device_obs['obTime'], p.aggregates['SLPMax'], device, p.api_data, config)),
+    node('SLPMin',       OUT_AIR, ('pressure', 'day'),
+         lambda p, device, config: derive.SLP_min(p.device_obs['pressure'], p.device_obs['obTime'], p.aggregates['SLPMin'], device, p.api_data, config)),
+    node('strikeCount',  OUT_AIR, ('strikeMinute', 'obTime', 'day'),
+         lambda p, device, config: derive.strike_count(p.device_obs['strikeMinute'], p.derive_obs['strikeCount'], device, p.api_data, config),
+         lambda old, new: not new['strikeMinute'][0] and old['day'] == new['day']),
+    node('strikeFreq',   OUT_AIR, ('obTime',),
+         lambda p, device, config: derive.strike_frequency(p.device_obs['obTime'], device, p.obs_buffer[device], config)),
+    node('strikeDeltaT', OUT_AIR + ('evt_strike',), ('strikeTime', 'obTime'),
+         lambda p, device, config: derive.strike_delta_t(p.device_obs['strikeTime'], config)),
+    node('uvIndex',      SKY, ('uvIndex',),
+         lambda p, device, config: derive.uv_index(p.device_obs['uvIndex'])),
+    node('peakSun',      SKY, ('radiation', 'skyTime'),
+         lambda p, device, config: derive.peak_sun_hours(p.device_obs['radiation'], ob_time(p.device_obs['radiation']), p.derive_obs['peakSun'], p.aggregates['peakSun'], device, p.api_data, config)),
+    node('windSpd',      SKY, ('windSpd',),
+         lambda p, device, config: derive.beaufort_scale(p.device_obs['windSpd'])),
+    node('windDir',      SKY, ('windDir', 'windSpd'),
+         lambda p, device, config: derive.cardinal_wind_dir(p.device_obs['windDir'], p.device_obs['windSpd'])),
+    node('windAvg',      SKY, ('windSpd', 'skyTime'),
+         lambda p, device, config: derive.avg_wind_speed(p.device_obs['windSpd'], ob_time(p.device_obs['windSpd']), p.aggregates['windAvg'], device, p.api_data, config)),
+    node('gustMax',      SKY, ('windGust', 'day'),
+         lambda p, device, config: derive.max_wind_gust(p.device_obs['windGust'], ob_time(p.device_obs['windGust']), p.aggregates['gustMax'], device, p.api_data, config)),
+    node('rainRate',     SKY, ('minuteRain',),
+         lambda p, device, config: derive.rain_rate(p.device_obs['minuteRain'])),
+    node('rainAccum',    SKY, ('minuteRain', 'dailyRain', 'skyTime', 'day'),
+         lambda p, device, config: derive.rain_accumulation(p.device_obs['minuteRain'], p.device_obs['dailyRain'], p.derive_obs['rainAccum'], device, p.api_data, config),
+         lambda old, new: not new['minuteRain'][0] and old['dailyRain'] == new['dailyRain'] and old['day'] == new['day']),
+    node('inTempMax',    IN_AIR, ('inTemp', 'day'),
+         lambda p, device, config: derive.temp_max(p.device_obs['inTemp'], p.device_obs['obTime'], p.aggregates['inTempMax'], device, p.api_data, config)),
+    node('inTempMin',    IN_AIR, ('inTemp', 'day'),
+         lambda p, device, config: derive.temp_min(p.device_obs['inTemp'], p.device_obs['obTime'], p.aggregates['inTempMin'], device, p.api_data, config)),
+    node('rapidWindDir', ('rapid_wind',), ('rapidWindDir', 'rapidWindSpd'),
+         lambda p, device, config: derive.cardinal_wind_dir(p.device_obs['rapidWindDir'], p.device_obs['rapidWindSpd'])),
+]
+
+# Define display values. Sources are ('device_obs' | 'derive_obs', key[, field])
+DISPLAY = [
+    display('outTemp',       OUT_AIR, ('device_obs', 'outTemp'),              'Temp',      'Temp'),
+    display('FeelsLike',     OUT_AIR, ('derive_obs', 'feelsLike'),            'Temp',      'Temp'),
+    display('DewPoint',      OUT_AIR, ('derive_obs', 'dewPoint'),             'Temp',      'Temp'),
+    display('outTempDiff',   OUT_AIR, ('derive_obs', 'outTempDiff'),          'Temp',      'Temp'),
+    display('outTempTrend',  OUT_AIR, ('derive_obs', 'outTempTrend'),         'Temp',      'Temp'),
+    display('outTempMax',    OUT_AIR, ('derive_obs', 'outTempMax'),           'Temp',      ['Temp', 'Time']),
+    display('outTempMin',    OUT_AIR, ('derive_obs', 'outTempMin'),           'Temp',      ['Temp', 'Time']),
+    display('Humidity',      OUT_AIR, ('device_obs', 'humidity'),             'Other',     'Humidity'),
+    display('SLP',           OUT_AIR, ('derive_obs', 'SLP'),                  'Pressure',  'Pressure'),
+    display('SLPTrend',      OUT_AIR, ('derive_obs', 'SLPTrend'),             'Pressure',  'Pressure'),
+    display('SLPMax',        OUT_AIR, ('derive_obs', 'SLPMax'),               'Pressure',  ['Pressure', 'Time']),
+    display('SLPMin',        OUT_AIR, ('derive_obs', 'SLPMin'),               'Pressure',  ['Pressure', 'Time']),
+    display('StrikeDist',    OUT_AIR + ('evt_strike',), ('device_obs', 'strikeDist'),   'Distance', 'StrikeDistance'),
+    display('StrikeDeltaT',  OUT_AIR + ('evt_strike',), ('derive_obs', 'strikeDeltaT'), 'Other',    'TimeDelta'),
+    display('StrikeFreq',    OUT_AIR, ('derive_obs', 'strikeFreq'),           'Other',     'StrikeFrequency'),
+    display('Strikes3hr',    OUT_AIR, ('device_obs', 'strike3hr'),            'Other',     'StrikeCount'),
+    display('StrikesToday',  OUT_AIR, ('derive_obs', 'strikeCount', 'today'), 'Other',    'StrikeCount'),
+    display('StrikesMonth',  OUT_AIR, ('derive_obs', 'strikeCount', 'month'), 'Other',    'StrikeCount'),
+    display('StrikesYear',   OUT_AIR, ('derive_obs', 'strikeCount', 'year'),  'Other',     'StrikeCount'),
+    display('Radiation',     SKY,     ('device_obs', 'radiation'),            'Other',     'Radiation'),
+    display('UVIndex',       SKY,     ('derive_obs', 'uvIndex'),              'Other',     'UV'),
+    display('peakSun',       SKY,     ('derive_obs', 'peakSun'),              'Other',     'peakSun'),
+    display('RainRate',      SKY,     ('derive_obs', 'rainRate'),             'Precip',    'Precip'),
+    display('TodayRain',     SKY,     ('derive_obs', 'rainAccum', 'today'),     'Precip',  'Precip'),
+    display('YesterdayRain', SKY,     ('derive_obs', 'rainAccum', 'yesterday'), 'Precip',  'Precip'),
+    display('MonthRain',     SKY,     ('derive_obs', 'rainAccum', 'month'),     'Precip',  'Precip'),
+    display('YearRain',      SKY,     ('derive_obs', 'rainAccum', 'year'),      'Precip',  'Precip'),
+    display('WindSpd',       SKY,     ('derive_obs', 'windSpd'),              'Wind',      'Wind'),
+    display('WindGust',      SKY,     ('device_obs', 'windGust'),             'Wind',      'Wind'),
+    display('AvgWind',       SKY,     ('derive_obs', 'windAvg'),              'Wind',      'Wind'),
+    display('MaxGust',       SKY,     ('derive_obs', 'gustMax'),              'Wind',      'Wind'),
+    display('WindDir',       SKY,     ('derive_obs', 'windDir'),              'Direction', 'Direction'),
+    display('inTemp',        IN_AIR,  ('device_obs', 'inTemp'),               'Temp',      'Temp'),
+    display('inTempMax',     IN_AIR,  ('derive_obs', 'inTempMax'),            'Temp',      ['Temp', 'Time']),
+    display('inTempMin',     IN_AIR,  ('derive_obs', 'inTempMin'),            'Temp',      ['Temp', 'Time']),
+    display('rapidSpd',      ('rapid_wind',), ('device_obs', 'rapidWindSpd'), 'Wind',      'Wind'),
+    display('rapidDir',      ('rapid_wind',), ('derive_obs', 'rapidWindDir'), 'degrees',   'Direction'),
+]
+
+
+# ==============================================================================
+# DEFINE 'derived_graph' CLASS
+# ==============================================================================
+class derived_graph():
+
+    """ Evaluates the derived variable nodes for each device observation. A node
+    is only recalculated when one of its inputs has changed since it was last
+    calculated, or when its last value is missing. Changed device observations
+    are tracked separately for each device type, so that a message evaluated
+    while another message is still being parsed does not consume the changes
+    of that message
+
+    INPUTS:
+        config              Station configuration
+    """
+
+    def __init__(self, config):
+        self.Tz       = pytz.timezone(config['Station']['Timezone'])
+        self.day      = None
+        self.day_end  = None
+        self.inputs   = {}
+        self.seen     = {}
+        self.nodes    = {device_type: [item for item in NODES if device_type in item.types]
+                         for item in NODES for device_type in item.types}
+        self.skipped  = 0
+
+    def station_day(self, ob_time):
+
+        """ Return the current day in the station timezone. The end of the day
+        is cached so that the day is only recalculated at midnight
+
+        INPUTS:
+            ob_time             Observation time                              [s]
+
+        OUTPUT:
+            day                 Ordinal of the current day in station timezone
+        """
+
+        if ob_time is None:
+            return self.day
+        if self.day_end is None or ob_time >= self.day_end:
+            date = datetime.fromtimestamp(ob_time, self.Tz).date()
+            self.day     = date.toordinal()
+            self.day_end = self.Tz.localize(datetime.combine(date + timedelta(days=1), datetime.min.time())).timestamp()
+        return self.day
+
+    def evaluate(self, parser, device, config, device_type):
+
+        """ Recalculate the derived variables for a device observation whose
+        inputs have changed
+
+        INPUTS:
+            parser              Observation parser object
+            device              Device ID
+            config              Station configuration
+            device_type         Device type
+
+        OUTPUT:
+            changed             Set of device and derived observation sources
+                                that have changed
+        """
+
+        # Find device observations that have changed since this device type
+        # was last evaluated
+        seen    = self.seen.setdefault(device_type, {})
+        changed = set()
+        for key, value in parser.device_obs.items():
+            if seen.get(key) != value:
+                seen[key] = value
+                changed.add(('device_obs', key))
+        self.station_day(parser.device_obs[TIME_SOURCE[device_type]].time)
+
+        # Recalculate each node whose inputs have changed, or whose last value
+        # is missing
+        for item in self.nodes.get(device_type, []):
+            current = {name: self.value(parser, name) for name in item.inputs}
+            previous = self.inputs.get(('node', item.key))
+            if previous == current and not missing(parser.derive_obs[item.key]):
+                continue
+            if (previous is not None and item.skip is not None
+                    and not missing(parser.derive_obs[item.key]) and item.skip(previous, current)):
+                self.inputs[('node', item.key)] = current
+                self.skipped += 1
+                continue
+            self.inputs[('node', item.key)] = current
+            value = item.calculate(parser, device, config)
+            if value != parser.derive_obs[item.key]:
+                parser.derive_obs[item.key] = value
+                changed.add(('derive_obs', item.key))
+        return changed
+
+    def value(self, parser, name):
+
+        """ Return the current value of a node input
+        """
+
+        if name == 'day':
+            return self.day
+        if name == 'skyTime':
+            return parser.device_obs['windSpd'].time
+        if name in parser.device_obs:
+            return parser.device_obs[name]
+        return parser.derive_obs[name]
+
+
+def ob_time(value):
+
+    """ Return the time of a device observation. SKY observations do not set
+    obTime, so aggregates of SKY and TEMPEST observations use the time of the
+    observation itself
+
+    INPUTS:
+        value               Device observation
+
+    OUTPUT:
+        ob_time             Observation time                              [s]
+    """
+
+    return obs_value(value.time, 's', value.time)
+
+
+def missing(value):
+
+    """ Return True if a derived variable has no value
+
+    INPUTS:
+        value               Derived variable, or dictionary of derived variables
+
+    OUTPUT:
+        missing             True if any derived variable has no value
+    """
+
+    if isinstance(value, dict):
+        return any(field[0] is None for field in value.values())
+    return value[0] is None
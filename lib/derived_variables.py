@@ -19,6 +19,7 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 from lib.request_api import weatherflow_api
 from lib.system      import system
 from lib             import derived_variables as derive
+from lib             import derived_arrays
 
 # Import required Python modules
 from kivy.logger  import Logger
@@ -183,7 +184,7 @@ def SLP(pressure, device, config):
     return [SLP, 'mb', SLP]
 
 
-def SLP_trend(pressure, ob_time, device, api_data, config):
+def SLP_trend(pressure, ob_time, device, obs_buffer, config):
 
     """ Calculate the pressure trend from the sea level pressure over the last
         three hours
@@ -192,7 +193,7 @@ def SLP_trend(pressure, ob_time, device, api_data, config):
         pressure            Station pressure from AIR/TEMPEST device        [mb]
         ob_time             Time of latest observation                      [s]
         device              Device ID
-        api_data            WeatherFlow REST API data
+        obs_buffer          24 hour observation buffer
         config              Station configuration
 
     OUTPUT:
@@ -214,26 +215,18 @@ def SLP_trend(pressure, ob_time, device, api_data, config):
     elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
         index_bucket_a  = 6
 
-    # If REST API services are enabled, extract required observations from
-    # WeatherFlow API data based on device type indicated in API call
-    if (int(config['System']['rest_api'])
-            and '24Hrs' in api_data[device]
-            and weatherflow_api.verify_response(api_data[device]['24Hrs'], 'obs')):
-        data_24hrs = api_data[device]['24Hrs'].json()['obs']
-        api_time   = [ob[0]              for ob in data_24hrs if ob[index_bucket_a] is not None]
-        api_pres   = [ob[index_bucket_a] for ob in data_24hrs if ob[index_bucket_a] is not None]
-        try:
-            d_time = [abs(T - (ob_time[0] - 3 * 3600)) for T in api_time]
-            if min(d_time) < 5 * 60:
-                pres_3h  = [api_pres[d_time.index(min(d_time))], 'mb']
-                time_3h  = [api_time[d_time.index(min(d_time))], 's']
-                pres_0h  = pressure
-                time_0h  = ob_time
-            else:
+    # Extract observation nearest to three hours ago from the 24 hour
+    # observation buffer
+    if len(obs_buffer):
+        nearest = obs_buffer.nearest(index_bucket_a, ob_time[0] - 3 * 3600, 5 * 60)
+        if nearest is not None:
+            pres_3h  = [nearest[1], 'mb']
+            time_3h  = [nearest[0], 's']
+            pres_0h  = pressure
+            time_0h  = ob_time
+        else:
+            if obs_buffer.seeded:
                 Logger.warning(f'SLP_trend: {system().log_time()} - no data in 3 hour window')
-                return error_output
-        except Exception as error:
-            Logger.warning(f'SLP_trend: {system().log_time()} - {error}')
             return error_output
     else:
         return error_output
@@ -286,14 +279,47 @@ def SLP_trend(pressure, ob_time, device, api_data, config):
     return [trend, 'mb/hr', trend_txt, tendency]
 
 
-def SLP_max(pressure, ob_time, max_pres, device, api_data, config):
+def seed_aggregate(aggregate, index_bucket_a, device, api_data, config, convert=None):
+
+    """ Seed a daily aggregate when the console is initialising. If REST API
+    services are enabled, the aggregate is seeded from all data for the current
+    day downloaded from the WeatherFlow API. Otherwise the aggregate starts from
+    the current observation
+
+    INPUTS:
+        aggregate           Daily aggregate
+        index_bucket_a      Index of observation in websocket packets
+        device              Device ID
+        api_data            WeatherFlow REST API data
+        config              Station configuration
+        convert             Optional function applied to the list of API
+                            values
+
+    OUTPUT:
+        seeded              True if the daily aggregate is seeded
+    """
+
+    if aggregate.seeded:
+        return True
+    if not int(config['System']['rest_api']):
+        aggregate.seed([], [])
+    elif ('today' in api_data[device]
+            and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
+        api_time, api_value = api_data[device]['today'].column(index_bucket_a)
+        if convert is not None:
+            api_value = convert(api_value)
+        aggregate.seed(api_time, api_value)
+    return aggregate.seeded
+
+
+def SLP_max(pressure, ob_time, aggregate, device, api_data, config):
 
     """ Calculate maximum SLP pressure since midnight station time
 
     INPUTS:
         pressure            Station pressure from AIR/TEMPEST device        [mb]
         ob_time             Time of latest observation                      [s]
-        max_pres            Daily maximum SLP pressure                      [mb]
+        aggregate           Daily maximum SLP pressure aggregate
         device              Device ID
         api_data            WeatherFlow REST API data
         config              Station configuration
@@ -314,70 +340,38 @@ def SLP_max(pressure, ob_time, max_pres, device, api_data, config):
     # Calculate sea level pressure
     SLP = derive.SLP(pressure, device, config)
 
-    # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
-    time_now = datetime.now(pytz.utc).astimezone(Tz)
-
-    # Define index of temperature in websocket packets
+    # Define index of pressure in websocket packets
     if str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]:
         index_bucket_a  = 1
     elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
         index_bucket_a  = 6
 
-    # If console is initialising and REST API services are enabled, download all
-    # data for current day using Weatherflow API and calculate daily maximum
-    # pressure
-    if int(config['System']['rest_api']) and max_pres[0] is None:
-        if ('today' in api_data[device]
-                and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
-            data_today = api_data[device]['today'].json()['obs']
-            ob_time    = [item[0]                       for item in data_today if item[index_bucket_a] is not None]
-            pressure   = [[item[index_bucket_a], 'mb']  for item in data_today if item[index_bucket_a] is not None]
-            SLP        = [derive.SLP(P, device, config) for P    in pressure]
-            try:
-                max_pres   = [max(SLP)[0], 'mb', ob_time[SLP.index(max(SLP))], 's', max(SLP)[0], ob_time[SLP.index(max(SLP))]]
-            except Exception as error:
-                Logger.warning(f'SLP_max: {system().log_time()} - {error}')
-                max_pres = error_output
-        else:
-            max_pres = error_output
-
-    # If console is initialising and REST API services are disabled, set daily
-    # minimum pressure to current temperature
-    elif not int(config['System']['rest_api']) and max_pres[0] is None:
-        max_pres = [SLP[0], 'mb', ob_time[0], 's', SLP[0], ob_time[0]]
-
-    # Else if midnight has passed, reset maximum pressure
-    elif time_now.date() > datetime.fromtimestamp(max_pres[5], Tz).date():
-        max_pres = [SLP[0], 'mb', ob_time[0], 's', SLP[0], ob_time[0]]
-
-    # Else if current pressure is greater than maximum recorded pressure, update
-    # maximum pressure
-    elif SLP[0] > max_pres[4]:
-        max_pres = [SLP[0], 'mb', ob_time[0], 's', SLP[0], ob_time[0]]
-
-    # Else maximum pressure unchanged, return existing values
-    else:
-        max_pres = [max_pres[4], 'mb', max_pres[2], 's', max_pres[4], ob_time[0]]
+    # If console is initialising, seed daily maximum pressure from all data for
+    # current day. Then update daily maximum pressure with current pressure. The
+    # aggregate is reset when midnight has passed
+    if not seed_aggregate(aggregate, index_bucket_a, device, api_data, config,
+                          lambda P: derived_arrays.SLP(P, device, config).tolist()):
+        return error_output
+    aggregate.update(ob_time[0], SLP[0])
 
     # Return required variables
-    return max_pres
+    return [aggregate.value, 'mb', aggregate.time, 's', aggregate.value, ob_time[0]]
 
 
-def SLP_min(pressure, ob_time, min_pres, device, api_data, config):
+def SLP_min(pressure, ob_time, aggregate, device, api_data, config):
 
     """ Calculate minimum SLP pressure since midnight station time
 
     INPUTS:
         pressure            Station pressure from AIR/TEMPEST device        [mb]
         ob_time             Time of latest observation                      [s]
-        max_pres            Daily minimum SLP pressure                      [mb]
+        aggregate           Daily minimum SLP pressure aggregate
         device              Device ID
         api_data            WeatherFlow REST API data
         config              Station configuration
 
     OUTPUT:
-        max_pres            Daily minimum SLP pressure                      [mb]
+        min_pres            Daily minimum SLP pressure                      [mb]
     """
 
     # Return None if required variables are missing
@@ -392,57 +386,25 @@ def SLP_min(pressure, ob_time, min_pres, device, api_data, config):
     # Calculate sea level pressure
     SLP = derive.SLP(pressure, device, config)
 
-    # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
-    time_now = datetime.now(pytz.utc).astimezone(Tz)
-
-    # Define index of temperature in websocket packets
+    # Define index of pressure in websocket packets
     if str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]:
         index_bucket_a  = 1
     elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
         index_bucket_a  = 6
 
-    # If console is initialising and REST API services are enabled, download all
-    # data for current day using Weatherflow API and calculate daily minimum
-    # pressure
-    if int(config['System']['rest_api']) and min_pres[0] is None:
-        if ('today' in api_data[device]
-                and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
-            data_today = api_data[device]['today'].json()['obs']
-            ob_time    = [item[0]                       for item in data_today if item[index_bucket_a] is not None]
-            pressure   = [[item[index_bucket_a], 'mb']  for item in data_today if item[index_bucket_a] is not None]
-            SLP        = [derive.SLP(P, device, config) for P    in pressure]
-            try:
-                min_pres   = [min(SLP)[0], 'mb', ob_time[SLP.index(min(SLP))], 's', min(SLP)[0], ob_time[SLP.index(min(SLP))]]
-            except Exception as error:
-                Logger.warning(f'SLP_min: {system().log_time()} - {error}')
-                min_pres = error_output
-        else:
-            min_pres = error_output
-
-    # If console is initialising and REST API services are disabled, set daily
-    # minimum pressure to current temperature
-    elif not int(config['System']['rest_api']) and min_pres[0] is None:
-        min_pres = [SLP[0], 'mb', ob_time[0], 's', SLP[0], ob_time[0]]
-
-    # Else if midnight has passed, reset maximum and minimum pressure
-    elif time_now.date() > datetime.fromtimestamp(min_pres[5], Tz).date():
-        min_pres = [SLP[0], 'mb', ob_time[0], 's', SLP[0], ob_time[0]]
-
-    # Else if current pressure is less than minimum recorded pressure, update
-    # minimum pressure and time
-    elif SLP[0] < min_pres[4]:
-        min_pres = [SLP[0], 'mb', ob_time[0], 's', SLP[0], ob_time[0]]
-
-    # Else minimum pressure unchanged, return existing values
-    else:
-        min_pres = [min_pres[4], 'mb', min_pres[2], 's', min_pres[4], ob_time[0]]
+    # If console is initialising, seed daily minimum pressure from all data for
+    # current day. Then update daily minimum pressure with current pressure. The
+    # aggregate is reset when midnight has passed
+    if not seed_aggregate(aggregate, index_bucket_a, device, api_data, config,
+                          lambda P: derived_arrays.SLP(P, device, config).tolist()):
+        return error_output
+    aggregate.update(ob_time[0], SLP[0])
 
     # Return required variables
-    return min_pres
+    return [aggregate.value, 'mb', aggregate.time, 's', aggregate.value, ob_time[0]]
 
 
-def temp_diff(out_temp, ob_time, device, api_data, config):
+def temp_diff(out_temp, ob_time, device, obs_buffer, config):
 
     """ Calculate 24 hour temperature difference
 
@@ -450,7 +412,7 @@ def temp_diff(out_temp, ob_time, device, api_data, config):
         out_temp            Current temperature from AIR/TEMPEST device  [deg C]
         ob_time             Observation time                             [s]
         device              Device ID
-        api_data            WeatherFlow REST API data
+        obs_buffer          24 hour observation buffer
         config              Station configuration
 
     OUTPUT:
@@ -472,24 +434,16 @@ def temp_diff(out_temp, ob_time, device, api_data, config):
     elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
         index_bucket_a  = 7
 
-    # If REST API services are enabled, extract required observations from
-    # WeatherFlow API data based on device type indicated in API call
-    if (int(config['System']['rest_api'])
-            and '24Hrs' in api_data[device]
-            and weatherflow_api.verify_response(api_data[device]['24Hrs'], 'obs')):
-        data_24hrs = api_data[device]['24Hrs'].json()['obs']
-        api_time   = [ob[0]              for ob in data_24hrs if ob[index_bucket_a] is not None]
-        api_temp   = [ob[index_bucket_a] for ob in data_24hrs if ob[index_bucket_a] is not None]
-        try:
-            d_time   = ob_time[0] - api_time[0]
-            if d_time > 86400 - (5 * 60) and d_time < 86400 + (5 * 60):
-                temp_24h = api_temp[0]
-                temp_0h  = out_temp[0]
-            else:
+    # Extract observation nearest to 24 hours ago from the 24 hour observation
+    # buffer
+    if len(obs_buffer):
+        nearest = obs_buffer.nearest(index_bucket_a, ob_time[0] - 86400, 5 * 60)
+        if nearest is not None:
+            temp_24h = nearest[1]
+            temp_0h  = out_temp[0]
+        else:
+            if obs_buffer.seeded:
                 Logger.warning(f'temp_diff: {system().log_time()} - no data in 24 hour window')
-                return error_output
-        except Exception as error:
-            Logger.warning(f'temp_diff: {system().log_time()} - {error}')
             return error_output
     else:
         return error_output
@@ -513,7 +467,7 @@ def temp_diff(out_temp, ob_time, device, api_data, config):
     return [d_temp, 'dc', diff_txt]
 
 
-def temp_trend(out_temp, ob_time, device, api_data, config):
+def temp_trend(out_temp, ob_time, device, obs_buffer, config):
 
     """ Calculate 3 hour temperature trend
 
@@ -521,7 +475,7 @@ def temp_trend(out_temp, ob_time, device, api_data, config):
         out_temp            Current temperature from AIR/TEMPEST device  [deg C]
         ob_time             Observation time                             [s]
         device              Device ID
-        api_data            WeatherFlow REST API data
+        obs_buffer          24 hour observation buffer
         config              Station configuration
 
     OUTPUT:
@@ -543,26 +497,17 @@ def temp_trend(out_temp, ob_time, device, api_data, config):
     elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
         index_bucket_a  = 7
 
-    # If REST API services are enabled, extract required observations from
-    # WeatherFlow API data based on device type indicated in API call
-    if (int(config['System']['rest_api'])
-            and '24Hrs' in api_data[device]
-            and weatherflow_api.verify_response(api_data[device]['24Hrs'], 'obs')):
-        data_24hrs = api_data[device]['24Hrs'].json()['obs']
-        api_time   = [ob[0]              for ob in data_24hrs if ob[index_bucket_a] is not None]
-        api_temp   = [ob[index_bucket_a] for ob in data_24hrs if ob[index_bucket_a] is not None]
-        try:
-            d_time   = [abs(T - (ob_time[0] - 3 * 3600)) for T in api_time]
-            if min(d_time) < 5 * 60:
-                temp_3h  = api_temp[d_time.index(min(d_time))]
-                time_3h  = api_time[d_time.index(min(d_time))]
-                temp_0h  = out_temp[0]
-                time_0h  = ob_time[0]
-            else:
+    # Extract observation nearest to three hours ago from the 24 hour
+    # observation buffer
+    if len(obs_buffer):
+        nearest = obs_buffer.nearest(index_bucket_a, ob_time[0] - 3 * 3600, 5 * 60)
+        if nearest is not None:
+            time_3h, temp_3h = nearest
+            temp_0h  = out_temp[0]
+            time_0h  = ob_time[0]
+        else:
+            if obs_buffer.seeded:
                 Logger.warning(f'temp_trend: {system().log_time()} - no data in 3 hour window')
-                return error_output
-        except Exception as error:
-            Logger.warning(f'temp_trend: {system().log_time()} - {error}')
             return error_output
     else:
         return error_output
@@ -586,14 +531,14 @@ def temp_trend(out_temp, ob_time, device, api_data, config):
     return [trend, 'c/hr', Color]
 
 
-def temp_max(temp, ob_time, max_temp, device, api_data, config):
+def temp_max(temp, ob_time, aggregate, device, api_data, config):
 
     """ Calculate maximum temperature since midnight station time
 
     INPUTS:
         temp                Current temperature  from AIR/TEMPEST device [deg C]
         ob_time             Observation time                             [s]
-        max_temp            Daily maximum temperature                    [deg C]
+        aggregate           Daily maximum temperature aggregate
         device              Device ID
         api_data            WeatherFlow REST API data
         config              Station configuration
@@ -611,10 +556,6 @@ def temp_max(temp, ob_time, max_temp, device, api_data, config):
         Logger.warning(f'temp_max: {system().log_time()} - ob_time is None')
         return error_output
 
-    # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
-    time_now = datetime.now(pytz.utc).astimezone(Tz)
-
     # Define index of temperature in websocket packets
     if (str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]
             or str(device) in [config['Station']['InAirID'], config['Station']['InAirSN']]):
@@ -622,54 +563,25 @@ def temp_max(temp, ob_time, max_temp, device, api_data, config):
     elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
         index_bucket_a  = 7
 
-    # If console is initialising and REST API services are enabled, download all
-    # data for current day using Weatherflow API and calculate daily maximum
-    # temperature
-    if int(config['System']['rest_api']) and max_temp[0] is None:
-        if ('today' in api_data[device]
-                and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
-            data_today = api_data[device]['today'].json()['obs']
-            api_time   = [item[0]              for item in data_today if item[index_bucket_a] is not None]
-            api_temp   = [item[index_bucket_a] for item in data_today if item[index_bucket_a] is not None]
-            try:
-                max_temp = [max(api_temp), 'c', api_time[api_temp.index(max(api_temp))], 's', max(api_temp), api_time[api_temp.index(max(api_temp))]]
-            except Exception as error:
-                Logger.warning(f'temp_max: {system().log_time()} - {error}')
-                max_temp = error_output
-        else:
-            max_temp = error_output
-
-    # If console is initialising and REST API services are disabled, set daily
-    # maximum temperature to current temperature
-    elif not int(config['System']['rest_api']) and max_temp[0] is None:
-        max_temp = [temp[0], 'c', ob_time[0], 's', temp[0], ob_time[0]]
-
-    # Else if midnight has passed, reset maximum temperature to current
-    # temperature
-    elif time_now.date() > datetime.fromtimestamp(max_temp[5], Tz).date():
-        max_temp = [temp[0], 'c', ob_time[0], 's', temp[0], ob_time[0]]
-
-    # Else if current temperature is greater than maximum recorded temperature,
-    # update maximum temperature
-    elif temp[0] > max_temp[4]:
-        max_temp = [temp[0], 'c', ob_time[0], 's', temp[0], ob_time[0]]
-
-    # Else maximum temperature unchanged, return existing values
-    else:
-        max_temp = [max_temp[4], 'c', max_temp[2], 's', max_temp[4], ob_time[0]]
+    # If console is initialising, seed daily maximum temperature from all data
+    # for current day. Then update daily maximum temperature with current
+    # temperature. The aggregate is reset when midnight has passed
+    if not seed_aggregate(aggregate, index_bucket_a, device, api_data, config):
+        return error_output
+    aggregate.update(ob_time[0], temp[0])
 
     # Return required variables
-    return max_temp
+    return [aggregate.value, 'c', aggregate.time, 's', aggregate.value, ob_time[0]]
 
 
-def temp_min(temp, ob_time, min_temp, device, api_data, config):
+def temp_min(temp, ob_time, aggregate, device, api_data, config):
 
     """ Calculate minimum temperature since midnight station time
 
     INPUTS:
         temp                Current temperature  from AIR/TEMPEST device [deg C]
         ob_time             Observation time                             [s]
-        min_temp            Daily minimum temperature                    [deg C]
+        aggregate           Daily minimum temperature aggregate
         device              Device ID
         api_data            WeatherFlow REST API data
         config              Station configuration
@@ -681,16 +593,12 @@ def temp_min(temp, ob_time, min_temp, device, api_data, config):
     # Return None if required variables are missing
     error_output = [None, 'c', '-', None, time.time()]
     if temp[0] is None:
-        Logger.warning(f'temp_min: {system().log_time()} - Temp is None')
+        Logger.warning(f'temp_min: {system().log_time()} - temp is None')
         return error_output
     elif ob_time[0] is None:
         Logger.warning(f'temp_min: {system().log_time()} - ob_time is None')
         return error_output
 
-    # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
-    time_now = datetime.now(pytz.utc).astimezone(Tz)
-
     # Define index of temperature in websocket packets
     if (str(device) in [config['Station']['OutAirID'], config['Station']['OutAirSN']]
             or str(device) in [config['Station']['InAirID'], config['Station']['InAirSN']]):
@@ -698,43 +606,15 @@ def temp_min(temp, ob_time, min_temp, device, api_data, config):
     elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
         index_bucket_a  = 7
 
-    # If console is initialising and REST API services are enabled, download all
-    # data for current day using Weatherflow API and calculate daily minimum
-    # temperature
-    if int(config['System']['rest_api']) and min_temp[0] is None:
-        if 'today' in api_data[device] and weatherflow_api.verify_response(api_data[device]['today'], 'obs'):
-            data_today = api_data[device]['today'].json()['obs']
-            api_time   = [item[0]              for item in data_today if item[index_bucket_a] is not None]
-            api_temp   = [item[index_bucket_a] for item in data_today if item[index_bucket_a] is not None]
-            try:
-                min_temp = [min(api_temp), 'c', api_time[api_temp.index(min(api_temp))], 's', min(api_temp), api_time[api_temp.index(min(api_temp))]]
-            except Exception as error:
-                Logger.warning(f'temp_min: {system().log_time()} - {error}')
-                min_temp = error_output
-        else:
-            min_temp = error_output
-
-    # If console is initialising and REST API services are disabled, set daily
-    # minimum temperature to current temperature
-    elif not int(config['System']['rest_api']) and min_temp[0] is None:
-        min_temp = [temp[0], 'c', ob_time[0], 's', temp[0], ob_time[0]]
-
-    # Else if midnight has passed, reset minimum temperature to current
-    # temperature
-    elif time_now.date() > datetime.fromtimestamp(min_temp[5], Tz).date():
-        min_temp = [temp[0], 'c', ob_time[0], 's', temp[0], ob_time[0]]
-
-    # Else if current temperature is less than minimum recorded temperature,
-    # update minimum temperature
-    elif temp[0] < min_temp[4]:
-        min_temp = [temp[0], 'c', ob_time[0], 's', temp[0], ob_time[0]]
-
-    # Else minimum temperature unchanged, return existing values
-    else:
-        min_temp = [min_temp[4], 'c', min_temp[2], 's', min_temp[4], ob_time[0]]
+    # If console is initialising, seed daily minimum temperature from all data
+    # for current day. Then update daily minimum temperature with current
+    # temperature. The aggregate is reset when midnight has passed
+    if not seed_aggregate(aggregate, index_bucket_a, device, api_data, config):
+        return error_output
+    aggregate.update(ob_time[0], temp[0])
 
     # Return required variables
-    return min_temp
+    return [aggregate.value, 'c', aggregate.time, 's', aggregate.value, ob_time[0]]
 
 
 def strike_delta_t(strike_time, config):
@@ -751,7 +631,7 @@ def strike_delta_t(strike_time, config):
     # Return None if required variables are missing
     error_output = [None, 's', None]
     if strike_time[0] is None:
-        if config['System']['Connection'] != 'UDP':
+        if config['System']['Connection'] not in ['UDP', 'Hybrid']:
             Logger.warning(f'strike_delta_t: {system().log_time()} - strike_time is None')
         return error_output
 
@@ -763,7 +643,7 @@ def strike_delta_t(strike_time, config):
     return delta_t
 
 
-def strike_frequency(ob_time, device, api_data, config):
+def strike_frequency(ob_time, device, obs_buffer, config):
 
     """ Calculate lightning strike frequency over the previous 10 minutes and
         three hours
@@ -771,7 +651,7 @@ def strike_frequency(ob_time, device, api_data, config):
     INPUTS:
         ob_time             Time of latest observation
         device              Device ID
-        api_data            WeatherFlow REST API data
+        obs_buffer          24 hour observation buffer
         config              Station configuration
 
     OUTPUT:
@@ -791,22 +671,15 @@ def strike_frequency(ob_time, device, api_data, config):
     elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
         index_bucket_a  = 15
 
-    # If REST API services are enabled, extract lightning strike count over the
-    # last three hours
-    if (int(config['System']['rest_api'])
-            and '24Hrs' in api_data[device]
-            and weatherflow_api.verify_response(api_data[device]['24Hrs'], 'obs')):
-        data_24hrs = api_data[device]['24Hrs'].json()['obs']
-        api_time   = [ob[0] for ob in data_24hrs if ob[index_bucket_a] is not None]
-        try:
-            d_time   = [abs(T - (ob_time[0] - 3 * 3600)) for T in api_time]
-            if min(d_time) < 5 * 60:
-                count_3h = [ob[index_bucket_a] for ob in data_24hrs[d_time.index(min(d_time)):] if ob[index_bucket_a] is not None]
-            else:
+    # Extract lightning strike count over the last three hours from the 24 hour
+    # observation buffer
+    if len(obs_buffer):
+        nearest = obs_buffer.nearest(index_bucket_a, ob_time[0] - 3 * 3600, 5 * 60)
+        if nearest is not None:
+            count_3h = obs_buffer.column(index_bucket_a, nearest[0])[1]
+        else:
+            if obs_buffer.seeded:
                 Logger.warning(f'strike_freq: {system().log_time()} - no data in 3 hour window')
-                count_3h = None
-        except Exception as error:
-            Logger.warning(f'strike_freq: {system().log_time()} - {error}')
             count_3h = None
     else:
         count_3h = None
@@ -821,23 +694,15 @@ def strike_frequency(ob_time, device, api_data, config):
     else:
         frequency_3h = [None, '/min']
 
-    # If REST API services are enabled, extract lightning strike count over the
-    # last 10 minutes
-    if (int(config['System']['rest_api'])
-            and '24Hrs' in api_data[device]
-            and weatherflow_api.verify_response(api_data[device]['24Hrs'], 'obs')):
-        data_24hrs = api_data[device]['24Hrs'].json()['obs']
-        data_24hrs = api_data[device]['24Hrs'].json()['obs']
-        api_time   = [ob[0] for ob in data_24hrs if ob[index_bucket_a] is not None]
-        try:
-            d_time   = [abs(T - (ob_time[0] - 600)) for T in api_time]
-            if min(d_time) < 2 * 60:
-                count_10m = [ob[index_bucket_a] for ob in data_24hrs[d_time.index(min(d_time)):] if ob[index_bucket_a] is not None]
-            else:
+    # Extract lightning strike count over the last 10 minutes from the 24 hour
+    # observation buffer
+    if len(obs_buffer):
+        nearest = obs_buffer.nearest(index_bucket_a, ob_time[0] - 600, 2 * 60)
+        if nearest is not None:
+            count_10m = obs_buffer.column(index_bucket_a, nearest[0])[1]
+        else:
+            if obs_buffer.seeded:
                 Logger.warning(f'strike_freq: {system().log_time()} - no data in 10 minute window')
-                count_10m = None
-        except Exception as error:
-            Logger.warning(f'strike_freq: {system().log_time()} - {error}')
             count_10m = None
     else:
         count_10m = None
@@ -908,8 +773,7 @@ def strike_count(count, strike_count, device, api_data, config):
     if int(config['System']['rest_api']) and strike_count['today'][0] is None:
         if not int(config['System']['stats_endpoint']):
             if 'today' in api_data[device] and weatherflow_api.verify_response(api_data[device]['today'], 'obs'):
-                data_today = api_data[device]['today'].json()['obs']
-                strikes = [item[index_bucket_a] for item in data_today if item[index_bucket_a] is not None]
+                strikes = api_data[device]['today'].column(index_bucket_a)[1]
                 try:
                     today_strikes = [sum(x for x in strikes), 'count', sum(x for x in strikes), time.time()]
                 except Exception as error:
@@ -919,7 +783,7 @@ def strike_count(count, strike_count, device, api_data, config):
                 today_strikes = error_output
         elif int(config['System']['stats_endpoint']):
             if 'statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_day'):
-                statistics = api_data[device]['statistics'].json()
+                statistics = api_data[device]['statistics'].data
                 if statistics["stats_day"][-1][0] == day_date:
                     strikes = statistics["stats_day"][-1][24]
                     try:
@@ -960,8 +824,7 @@ def strike_count(count, strike_count, device, api_data, config):
     elif int(config['System']['rest_api']) and strike_count['month'][0] is None:
         if not int(config['System']['stats_endpoint']):
             if 'month' in api_data[device] and weatherflow_api.verify_response(api_data[device]['month'], 'obs'):
-                month_data  = api_data[device]['month'].json()['obs']
-                strikes     = [item[index_bucket_e] for item in month_data if item[index_bucket_e] is not None]
+                strikes     = api_data[device]['month'].column(index_bucket_e)[1]
                 try:
                     month_strikes = [sum(x for x in strikes), 'count', sum(x for x in strikes), time.time()]
                     if today_strikes[0] is not None:
@@ -974,7 +837,7 @@ def strike_count(count, strike_count, device, api_data, config):
                 month_strikes = error_output
         elif int(config['System']['stats_endpoint']):
             if 'statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_month'):
-                statistics = api_data[device]['statistics'].json()
+                statistics = api_data[device]['statistics'].data
                 if statistics["stats_month"][-1][0] == month_date:
                     strikes = statistics["stats_month"][-1][24]
                     try:
@@ -1016,8 +879,7 @@ def strike_count(count, strike_count, device, api_data, config):
     elif int(config['System']['rest_api']) and strike_count['year'][0] is None:
         if not int(config['System']['stats_endpoint']):
             if 'year' in api_data[device] and weatherflow_api.verify_response(api_data[device]['year'], 'obs'):
-                year_data = api_data[device]['year'].json()['obs']
-                strikes   = [item[index_bucket_e] for item in year_data if item[index_bucket_e] is not None]
+                strikes   = api_data[device]['year'].column(index_bucket_e)[1]
                 try:
                     year_strikes = [sum(x for x in strikes), 'count', sum(x for x in strikes), time.time()]
                     if today_strikes[0] is not None:
@@ -1030,7 +892,7 @@ def strike_count(count, strike_count, device, api_data, config):
                 year_strikes = error_output
         elif int(config['System']['stats_endpoint']):
             if 'statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_year'):
-                statistics = api_data[device]['statistics'].json()
+                statistics = api_data[device]['statistics'].data
                 if statistics["stats_year"][-1][0] == year_date:
                     strikes = statistics["stats_year"][-1][24]
                     try:
@@ -1161,8 +1023,9 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
         else:
             today_rain = error_output
 
-    # Else, set current daily rainfall accumulation for UDP connections
-    elif config['System']['Connection'] == 'UDP':
+    # Else, set current daily rainfall accumulation for UDP and Hybrid
+    # connections
+    elif config['System']['Connection'] in ['UDP', 'Hybrid']:
 
         # If console is initialising and REST API services are enabled, download
         # all data for current day using Weatherflow API and calculate todays's
@@ -1170,8 +1033,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
         if int(config['System']['rest_api']) and rain_accum['today'][0] is None:
             if not int(config['System']['stats_endpoint']):
                 if 'today' in api_data[device] and weatherflow_api.verify_response(api_data[device]['today'], 'obs'):
-                    today_data = api_data[device]['today'].json()['obs']
-                    rain_data = [item[index_bucket_a] for item in today_data if item[index_bucket_a] is not None]
+                    rain_data = api_data[device]['today'].column(index_bucket_a)[1]
                     try:
                         today_rain = [sum(x for x in rain_data), 'mm', sum(x for x in rain_data), time.time()]
                     except Exception as error:
@@ -1181,7 +1043,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
                     today_rain = error_output
             elif int(config['System']['stats_endpoint']):    
                 if ('statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_day')):
-                    statistics = api_data[device]['statistics'].json()
+                    statistics = api_data[device]['statistics'].data
                     if statistics["stats_day"][-1][0] == day_date:
                         rain_data = statistics["stats_day"][-1][28]
                         try:
@@ -1217,8 +1079,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
     if int(config['System']['rest_api']) and rain_accum['yesterday'][0] is None:
         if not int(config['System']['stats_endpoint']):
             if 'yesterday' in api_data[device] and weatherflow_api.verify_response(api_data[device]['yesterday'], 'obs'):
-                yesterday_data = api_data[device]['yesterday'].json()['obs']
-                rain_data = [item[index_bucket_a] for item in yesterday_data if item[index_bucket_a] is not None]
+                rain_data = api_data[device]['yesterday'].column(index_bucket_a)[1]
                 try:
                     yesterday_rain = [sum(x for x in rain_data), 'mm', sum(x for x in rain_data), time.time()]
                 except Exception as error:
@@ -1228,7 +1089,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
                 yesterday_rain = error_output
         elif int(config['System']['stats_endpoint']):   
             if ('statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_day')):
-                statistics = api_data[device]['statistics'].json()
+                statistics = api_data[device]['statistics'].data
                 if statistics["stats_day"][-2][0] == yesterday_date:
                     rain_data = statistics["stats_day"][-2][28]
                     try:
@@ -1271,8 +1132,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
         if today_rain[0] is not None:
             if not int(config['System']['stats_endpoint']):
                 if 'month' in api_data[device] and weatherflow_api.verify_response(api_data[device]['month'], 'obs'):
-                    month_data = api_data[device]['month'].json()['obs']
-                    rain_data  = [item[index_bucket_e] for item in month_data if item[index_bucket_e] is not None]
+                    rain_data  = api_data[device]['month'].column(index_bucket_e)[1]
                     try:
                         month_rain = [sum(x for x in rain_data), 'mm', sum(x for x in rain_data), time.time()]
                         month_rain[0] += today_rain[0]
@@ -1283,7 +1143,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
                     month_rain = error_output
             elif int(config['System']['stats_endpoint']):
                 if ('statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_month')):
-                    statistics = api_data[device]['statistics'].json()
+                    statistics = api_data[device]['statistics'].data
                     if statistics["stats_month"][-1][0] == month_date:
                         rain_data = statistics["stats_month"][-1][28]
                         try:
@@ -1337,8 +1197,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
         if today_rain[0] is not None:
             if not int(config['System']['stats_endpoint']):
                 if 'year' in api_data[device] and weatherflow_api.verify_response(api_data[device]['year'], 'obs'):
-                    year_data = api_data[device]['year'].json()['obs']
-                    rain_data = [item[index_bucket_e] for item in year_data if item[index_bucket_e] is not None]
+                    rain_data = api_data[device]['year'].column(index_bucket_e)[1]
                     try:
                         year_rain = [sum(x for x in rain_data), 'mm', sum(x for x in rain_data), time.time()]
                         year_rain[0] += today_rain[0]
@@ -1349,7 +1208,7 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
                     year_rain = error_output
             elif int(config['System']['stats_endpoint']):
                 if ('statistics' in api_data[device] and weatherflow_api.verify_response(api_data[device]['statistics'], 'stats_month')):
-                    statistics = api_data[device]['statistics'].json()
+                    statistics = api_data[device]['statistics'].data
                     if statistics["stats_year"][-1][0] == year_date:
                         rain_data = statistics["stats_year"][-1][28]
                         try:
@@ -1393,13 +1252,14 @@ def rain_accumulation(minute_rain, daily_rain, rain_accum, device, api_data, con
     return {'today': today_rain, 'yesterday': yesterday_rain, 'month': month_rain, 'year': year_rain}
 
 
-def avg_wind_speed(wind_spd, avg_wind, device, api_data, config):
+def avg_wind_speed(wind_spd, ob_time, aggregate, device, api_data, config):
 
     """ Calculate the average windspeed since midnight station time
 
     INPUTS:
         wind_spd            Wind speed                                  [m/s]
-        avg_wind            Average wind speed since midnight           [m/s]
+        ob_time             Observation time                            [s]
+        aggregate           Average wind speed aggregate
         device              Device ID
         api_data            WeatherFlow REST API data
         config              Station configuration
@@ -1413,10 +1273,9 @@ def avg_wind_speed(wind_spd, avg_wind, device, api_data, config):
     if wind_spd[0] is None:
         Logger.warning(f'avgSpeed: {system().log_time()} - wind_spd is None')
         return error_output
-
-    # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
-    time_now = datetime.now(pytz.utc).astimezone(Tz)
+    elif ob_time[0] is None:
+        Logger.warning(f'avgSpeed: {system().log_time()} - ob_time is None')
+        return error_output
 
     # Define index of wind speed in websocket packets
     if str(device) in [config['Station']['SkyID'], config['Station']['SkySN']]:
@@ -1424,50 +1283,25 @@ def avg_wind_speed(wind_spd, avg_wind, device, api_data, config):
     elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
         index_bucket_a = 2
 
-    # If console is initialising and REST API services are enabled, download all
-    # data for current day using Weatherflow API and calculate daily averaged
-    # windspeed
-    if int(config['System']['rest_api']) and avg_wind[0] is None:
-        if ('today' in api_data[device]
-                and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
-            today_data = api_data[device]['today'].json()['obs']
-            wind_spd = [item[index_bucket_a] for item in today_data if item[index_bucket_a] is not None]
-            try:
-                average = sum(x for x in wind_spd) / len(wind_spd)
-                wind_avg = [average, 'mps', average, len(wind_spd), time.time()]
-            except Exception as error:
-                Logger.warning(f'avgSpeed: {system().log_time()} - {error}')
-                wind_avg = error_output
-        else:
-            wind_avg = error_output
-
-    # If console is initialising and REST API services are not enabled,
-    # set daily averaged wind speed to current wind speed
-    elif not int(config['System']['rest_api']) and avg_wind[0] is None:
-        wind_avg = [wind_spd[0], 'mps', wind_spd[0], 1, time.time()]
-
-    # Else if midnight has passed, reset daily averaged wind speed
-    elif time_now.date() > datetime.fromtimestamp(avg_wind[4], Tz).date():
-        wind_avg = [wind_spd[0], 'mps', wind_spd[0], 1, time.time()]
-
-    # Else, calculate current daily averaged wind speed
-    else:
-        length = avg_wind[3] + 1
-        current_avg = avg_wind[2]
-        updated_avg = (length - 1) / length * current_avg + 1 / length * wind_spd[0]
-        wind_avg    = [updated_avg, 'mps', updated_avg, length, time.time()]
+    # If console is initialising, seed daily averaged wind speed from all data
+    # for current day. Then update daily averaged wind speed with current wind
+    # speed. The aggregate is reset when midnight has passed
+    if not seed_aggregate(aggregate, index_bucket_a, device, api_data, config):
+        return error_output
+    aggregate.update(ob_time[0], wind_spd[0])
 
     # Return daily averaged wind speed
-    return wind_avg
+    return [aggregate.value, 'mps', aggregate.value, aggregate.count, time.time()]
 
 
-def max_wind_gust(wind_gust, max_gust, device, api_data, config):
+def max_wind_gust(wind_gust, ob_time, aggregate, device, api_data, config):
 
     """ Calculate the maximum wind gust since midnight station time
 
     INPUTS:
         wind_gust           Wind gust                               [m/s]
-        max_gust            Maximum wind gust since midnight        [m/s]
+        ob_time             Observation time                        [s]
+        aggregate           Maximum wind gust aggregate
         device              Device ID
         api_data            WeatherFlow REST API data
         config              Station configuration
@@ -1481,52 +1315,25 @@ def max_wind_gust(wind_gust, max_gust, device, api_data, config):
     if wind_gust[0] is None:
         Logger.warning(f'max_gust: {system().log_time()} - wind_gust is None')
         return error_output
+    elif ob_time[0] is None:
+        Logger.warning(f'max_gust: {system().log_time()} - ob_time is None')
+        return error_output
 
-    # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
-    time_now = datetime.now(pytz.utc).astimezone(Tz)
-
-    # Define index of wind speed in websocket packets
+    # Define index of wind gust in websocket packets
     if str(device) in [config['Station']['SkyID'], config['Station']['SkySN']]:
         index_bucket_a = 6
     elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
         index_bucket_a = 3
 
-    # If console is initialising and REST API services are enabled, download all
-    # data for current day using Weatherflow API and calculate maximum wind gust
-    if int(config['System']['rest_api']) and max_gust[0] is None:
-        if ('today' in api_data[device]
-                and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
-            today_data = api_data[device]['today'].json()['obs']
-            wind_gust = [item[index_bucket_a] for item in today_data if item[index_bucket_a] is not None]
-            try:
-                max_gust  = [max(x for x in wind_gust), 'mps', max(x for x in wind_gust), time.time()]
-            except Exception as error:
-                Logger.warning(f'max_gust: {system().log_time()} - {error}')
-                max_gust = error_output
-        else:
-            max_gust = error_output
-
-    # If console is initialising and REST API services are not enabled,
-    # set maximum wind gust to current wind gust
-    elif not int(config['System']['rest_api']) and max_gust[0] is None:
-        max_gust = [wind_gust[0], 'mps', wind_gust[0], time.time()]
-
-    # Else if midnight has passed, reset maximum recorded wind gust
-    elif time_now.date() > datetime.fromtimestamp(max_gust[3], Tz).date():
-        max_gust = [wind_gust[0], 'mps', wind_gust[0], time.time()]
-
-    # Else if current gust speed is greater than maximum recorded gust speed,
-    # update maximum gust speed
-    elif wind_gust[0] > max_gust[2]:
-        max_gust = [wind_gust[0], 'mps', wind_gust[0], time.time()]
-
-    # Else maximum gust speed is unchanged, return existing value
-    else:
-        max_gust = [max_gust[2], 'mps', max_gust[2], time.time()]
+    # If console is initialising, seed maximum wind gust from all data for
+    # current day. Then update maximum wind gust with current wind gust. The
+    # aggregate is reset when midnight has passed
+    if not seed_aggregate(aggregate, index_bucket_a, device, api_data, config):
+        return error_output
+    aggregate.update(ob_time[0], wind_gust[0])
 
     # Return maximum wind gust
-    return max_gust
+    return [aggregate.value, 'mps', aggregate.value, time.time()]
 
 
 def cardinal_wind_dir(wind_dir, wind_spd=[1, 'mps']):
@@ -1647,13 +1454,15 @@ def uv_index(uv_level):
     return index
 
 
-def peak_sun_hours(radiation, peak_sun, device, api_data, config):
+def peak_sun_hours(radiation, ob_time, peak_sun, aggregate, device, api_data, config):
 
     """ Calculate peak sun hours since midnight and daily solar potential
 
     INPUTS:
         Radiation           Solar radiation                        [W/m^2]
+        ob_time             Observation time                       [s]
         peak_sun            Peak sun hours since midnight          [hours]
+        aggregate           Daily solar energy aggregate
         device              Device ID
         api_data            WeatherFlow REST API data
         config              Station configuration
@@ -1667,13 +1476,13 @@ def peak_sun_hours(radiation, peak_sun, device, api_data, config):
     if radiation[0] is None:
         Logger.warning(f'peak_sun: {system().log_time()} - radiation is None')
         return error_output
-
-    # Define current time in station timezone
-    Tz = pytz.timezone(config['Station']['Timezone'])
-    time_now = datetime.now(pytz.utc).astimezone(Tz)
+    elif ob_time[0] is None:
+        Logger.warning(f'peak_sun: {system().log_time()} - ob_time is None')
+        return error_output
 
     # Calculate time of sunrise and sunset or use existing values
-    if peak_sun[0] is None or time_now > datetime.fromtimestamp(peak_sun[5], Tz):
+    time_now = time.time()
+    if peak_sun[0] is None or time_now > peak_sun[5]:
         observer          = ephem.Observer()
         observer.pressure = 0
         observer.lat      = str(config['Station']['Latitude'])
@@ -1691,41 +1500,18 @@ def peak_sun_hours(radiation, peak_sun, device, api_data, config):
     elif str(device) in [config['Station']['TempestID'], config['Station']['TempestSN']]:
         index_bucket_a = 11
 
-    # If console is initialising and REST API services are enabled, download all
-    # data for current day using Weatherflow API and calculate Peak Sun Hours
-    if int(config['System']['rest_api']) and peak_sun[0] is None:
-        if ('today' in api_data[device]
-                and weatherflow_api.verify_response(api_data[device]['today'], 'obs')):
-            data_today = api_data[device]['today'].json()['obs']
-            radiation = [item[index_bucket_a] for item in data_today if item[index_bucket_a] is not None]
-            try:
-                watt_hrs = sum([item * (1 / 60) for item in radiation])
-                peak_sun = [watt_hrs / 1000, 'hrs', watt_hrs, sunrise, sunset, time.time()]
-            except Exception as error:
-                Logger.warning(f'peak_sun: {system().log_time()} - {error}')
-                return error_output
-        else:
-            return error_output
-
-    # If console is initialising and REST API services are not enabled,
-    # calculate current Peak Sun Hours
-    elif not int(config['System']['rest_api']) and peak_sun[0] is None:
-        watt_hrs = radiation[0] * (1 / 60)
-        peak_sun = [watt_hrs / 1000, 'hrs', watt_hrs, sunrise, sunset, time.time()]
-
-    # Else if midnight has passed, reset Peak Sun Hours
-    elif time_now.date() > datetime.fromtimestamp(peak_sun[6], Tz).date():
-        watt_hrs = radiation[0] * (1 / 60)
-        peak_sun = [watt_hrs / 1000, 'hrs', watt_hrs, sunrise, sunset, time.time()]
-
-    # Else calculate current Peak Sun Hours
-    else:
-        watt_hrs = peak_sun[3] + radiation[0] * (1 / 60)
-        peak_sun = [watt_hrs / 1000, 'hrs', watt_hrs, sunrise, sunset, time.time()]
+    # If console is initialising, seed daily solar energy from all data for
+    # current day. Then update daily solar energy with current radiation and
+    # calculate Peak Sun Hours. The aggregate is reset when midnight has passed
+    if not seed_aggregate(aggregate, index_bucket_a, device, api_data, config):
+        return error_output
+    aggregate.update(ob_time[0], radiation[0])
+    watt_hrs = aggregate.value
+    peak_sun = [watt_hrs / 1000, 'hrs', watt_hrs, sunrise, sunset, time_now]
 
     # Calculate proportion of daylight hours that have passed
-    if datetime.fromtimestamp(sunrise, Tz) <= time_now <= datetime.fromtimestamp(sunset, Tz):
-        daylight_factor = (time.time() - sunrise) / (sunset - sunrise)
+    if sunrise <= time_now <= sunset:
+        daylight_factor = (time_now - sunrise) / (sunset - sunrise)
     else:
         daylight_factor = 1
 
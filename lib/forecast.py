@@ -16,21 +16,19 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Import required library modules
-from lib.system import system
-from lib        import observation_format as observation
-from lib        import derived_variables  as derive
-from lib        import properties
+from lib.request_api import http_client
+from lib             import observation_format as observation
+from lib             import derived_variables  as derive
+from lib             import properties
+from lib             import update_bus
 
 # Import required Kivy modules
-from kivy.network.urlrequest import UrlRequest
-from kivy.logger             import Logger
 from kivy.clock              import Clock
 from kivy.app                import App
 
 # Import required system modules
 from datetime   import datetime, timedelta, time
 import time     as UNIX
-import certifi
 import bisect
 import pytz
 
@@ -50,9 +48,7 @@ class forecast():
         # Reset the forecast and schedule new forecast to be generated
         self.met_data = properties.Met()
         self.update_display()
-        if hasattr(self.app, 'ForecastPanel'):
-            for panel in getattr(self.app, 'ForecastPanel'):
-                panel.setForecastIcon()
+        update_bus.get().panel('ForecastPanel', 'setForecastIcon')
         Clock.schedule_once(self.fetch_forecast)
 
     def fetch_forecast(self, *largs):
@@ -66,12 +62,9 @@ class forecast():
             URL = 'https://swd.weatherflow.com/swd/rest/better_forecast?token={}&station_id={}'
             URL = URL.format(self.app.config['Keys']['WeatherFlow'],
                              self.app.config['Station']['StationID'])
-            UrlRequest(URL,
-                       on_success=self.success_forecast,
-                       on_failure=self.fail_forecast,
-                       on_error=self.fail_forecast,
-                       timeout=int(self.app.config['System']['Timeout']),
-                       ca_file=certifi.where())
+            http_client.request(URL, self.app.config,
+                                on_success=self.success_forecast,
+                                on_failure=self.fail_forecast)
 
     def schedule_forecast(self, dt):
 
@@ -95,8 +88,8 @@ class forecast():
         API. Parse forecast response
 
         INPUTS:
-            Request             UrlRequest object
-            Response            UrlRequest response
+            Request             http_request object
+            Response            Decoded API response
 
         """
 
@@ -110,8 +103,8 @@ class forecast():
         Reschedule fetch_forecast in 300 seconds
 
         INPUTS:
-            Request             UrlRequest object
-            Response            UrlRequest response
+            Request             http_request object
+            Response            Decoded API response or request error
 
         """
 
@@ -136,9 +129,7 @@ class forecast():
         self.update_display()
 
         # Update forecast icon
-        if hasattr(self.app, 'ForecastPanel'):
-            for panel in getattr(self.app, 'ForecastPanel'):
-                panel.setForecastIcon()
+        update_bus.get().panel('ForecastPanel', 'setForecastIcon')
 
         # Schedule new forecast to be downloaded in 5 minutes. Note secondsSched
         # refers to number of seconds since the function was last called.
@@ -285,9 +276,7 @@ class forecast():
             self.update_display()
 
             # Update forecast icon
-            if hasattr(self.app, 'ForecastPanel'):
-                for panel in getattr(self.app, 'ForecastPanel'):
-                    panel.setForecastIcon()
+            update_bus.get().panel('ForecastPanel', 'setForecastIcon')
 
             # Schedule new forecast
             Clock.schedule_once(self.schedule_forecast)
@@ -299,16 +288,7 @@ class forecast():
 
     def update_display(self):
 
-        """ Update display with new forecast variables. Catch ReferenceErrors to
-        prevent console crashing
+        """ Post new forecast variables to the display update bus
         """
 
-        # Update display values with new derived observations
-        reference_error = False
-        for Key, Value in list(self.met_data.items()):
-            try:
-                self.app.CurrentConditions.Met[Key] = Value
-            except ReferenceError:
-                if not reference_error:
-                    Logger.warning(f'astro: {system().log_time()} - Reference error')
-                    reference_error = True
+        update_bus.get().post_dict('Met', self.met_data)
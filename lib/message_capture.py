@@ -0,0 +1,106 @@
+""" Defines the message capture file that records the raw Websocket and UDP
+messages received by the Raspberry Pi Python console for WeatherFlow Tempest
+and Smart Home Weather stations so that they can be replayed offline.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required Python modules
+import threading
+import time
+
+
+# ==============================================================================
+# DEFINE 'message_capture' CLASS
+# ==============================================================================
+class message_capture():
+
+    """ Append-only capture file of raw messages. Each message is written on a
+    single line as "<receive time> <source> <raw message>", where source is
+    'udp' or 'websocket'
+
+    INPUTS:
+        path                Path to capture file
+    """
+
+    def __init__(self, path):
+
+        # Define instance variables
+        self.path  = path
+        self.file  = open(path, 'a', encoding='utf-8', buffering=1)
+        self.lock  = threading.Lock()
+        self.count = 0
+
+    @classmethod
+    def from_config(cls, config):
+
+        """ Open the capture file defined in the station configuration
+
+        INPUTS:
+            config              Console configuration object
+
+        OUTPUT:
+            capture             message_capture object, or None if capture is
+                                disabled
+        """
+
+        path = config['System'].get('CaptureFile', '').strip()
+        if path:
+            return cls(path)
+        return None
+
+    def write(self, source, message):
+
+        """ Append raw message to the capture file
+
+        INPUTS:
+            source              Message source: 'udp' or 'websocket'
+            message             Raw message as bytes or str
+        """
+
+        if isinstance(message, bytes):
+            message = message.decode('utf-8', 'replace')
+        message = message.replace('\r', ' ').replace('\n', ' ')
+        line    = f'{time.time():.3f} {source} {message}\n'
+        with self.lock:
+            if not self.file.closed:
+                self.file.write(line)
+                self.count += 1
+
+    def close(self):
+
+        """ Close the capture file
+        """
+
+        with self.lock:
+            self.file.close()
+
+
+def read(path):
+
+    """ Read the messages in a capture file
+
+    INPUTS:
+        path                Path to capture file
+
+    OUTPUT:
+        messages            Generator of (receive time, source, raw message)
+                            tuples in the order they were captured
+    """
+
+    with open(path, encoding='utf-8') as capture_file:
+        for line in capture_file:
+            fields = line.rstrip('\n').split(' ', 2)
+            if len(fields) == 3:
+                yield float(fields[0]), fields[1], fields[2]
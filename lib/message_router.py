@@ -0,0 +1,194 @@
+""" Defines the message router that dispatches Websocket and UDP messages
+received by the Raspberry Pi Python console for WeatherFlow Tempest and Smart
+Home Weather stations to the observation parser.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required Python modules
+import collections
+
+# Define message route. Messages with no lane are parsed inline on the
+# connection service event loop; messages with no slot have no watchdog. The
+# device is the configured device ID the observation parser keys on, or the
+# serial number if no device ID is configured
+route = collections.namedtuple('route', ['handler', 'lane', 'slot', 'device'])
+
+# Define message types parsed by the console
+MESSAGE_TYPES = ('obs_st', 'obs_sky', 'obs_air', 'rapid_wind', 'evt_strike')
+
+# Define default number of messages remembered by the de-duplication cache
+DEDUP_SIZE = 256
+
+
+# ==============================================================================
+# DEFINE 'message_dedup' CLASS
+# ==============================================================================
+class message_dedup():
+
+    """ Bounded least-recently-used cache of the messages received from one or
+    more connection services. Used to discard messages that have already been
+    received from another connection service
+
+    INPUTS:
+        size                Maximum number of messages to remember
+    """
+
+    def __init__(self, size=DEDUP_SIZE):
+
+        # Define instance variables
+        self.size       = size
+        self.cache      = collections.OrderedDict()
+        self.duplicates = 0
+
+    def seen(self, key):
+
+        """ Return True if the message has already been received, otherwise
+        remember the message and return False
+
+        INPUTS:
+            key                 Message key
+
+        OUTPUT:
+            seen                True if the message is a duplicate
+        """
+
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.duplicates += 1
+            return True
+        self.cache[key] = True
+        if len(self.cache) > self.size:
+            self.cache.popitem(last=False)
+        return False
+
+
+def message_time(message):
+
+    """ Return the observation or event time of a message
+
+    INPUTS:
+        message             Decoded message
+
+    OUTPUT:
+        ob_time             Observation or event time, or None if missing  [s]
+    """
+
+    try:
+        if 'obs' in message:
+            return message['obs'][0][0]
+        if 'ob' in message:
+            return message['ob'][0]
+        if 'evt' in message:
+            return message['evt'][0]
+    except (IndexError, KeyError, TypeError):
+        pass
+    return None
+
+
+# ==============================================================================
+# DEFINE 'message_router' CLASS
+# ==============================================================================
+class message_router():
+
+    """ Routing table that maps (message type, device) to the observation parser
+    function, parse executor lane and watchdog slot for that message. The table
+    is built once from the station configuration and must be rebuilt whenever
+    the station or devices are switched
+
+    INPUTS:
+        parser              Observation parser object
+        executor            Parse executor object
+        config              Console configuration object
+        key                 Device key used by the connection service: 'SN' for
+                            UDP messages or 'ID' for Websocket messages
+        dedup               Optional message_dedup object shared between
+                            connection services
+    """
+
+    def __init__(self, parser, executor, config, key, dedup=None):
+
+        # Define instance variables
+        self.parser   = parser
+        self.executor = executor
+        self.key      = key
+        self.dedup    = dedup
+        self.routes   = {}
+        self.devices  = set()
+        self.build(config)
+
+    def build(self, config):
+
+        """ Build the routing table from the station configuration
+
+        INPUTS:
+            config              Console configuration object
+        """
+
+        # Define station devices and the configured device ID of each
+        self.config = config
+        tempest = config['Station']['Tempest' + self.key]
+        sky     = config['Station']['Sky'     + self.key]
+        out_air = config['Station']['OutAir'  + self.key]
+        in_air  = config['Station']['InAir'   + self.key]
+        tempest_id = config['Station']['TempestID'] or tempest
+        sky_id     = config['Station']['SkyID']     or sky
+        out_air_id = config['Station']['OutAirID']  or out_air
+        in_air_id  = config['Station']['InAirID']   or in_air
+
+        # Define message routes for each station device
+        routes = {}
+        if tempest:
+            routes[('obs_st',     tempest)] = route(self.parser.parse_obs_st,     'obs_st',      'obs_st',      tempest_id)
+            routes[('rapid_wind', tempest)] = route(self.parser.parse_rapid_wind, None,          'rapid_wind',  tempest_id)
+            routes[('evt_strike', tempest)] = route(self.parser.parse_evt_strike, None,          None,          tempest_id)
+        if sky:
+            routes[('obs_sky',    sky)]     = route(self.parser.parse_obs_sky,    'obs_sky',     'obs_sky',     sky_id)
+            routes[('rapid_wind', sky)]     = route(self.parser.parse_rapid_wind, None,          'rapid_wind',  sky_id)
+        if out_air:
+            routes[('obs_air',    out_air)] = route(self.parser.parse_obs_out_air, 'obs_out_air', 'obs_out_air', out_air_id)
+            routes[('evt_strike', out_air)] = route(self.parser.parse_evt_strike,  None,          None,          out_air_id)
+        if in_air:
+            routes[('obs_air',    in_air)]  = route(self.parser.parse_obs_in_air,  'obs_in_air',  'obs_in_air',  in_air_id)
+
+        # Replace routing table
+        self.routes  = routes
+        self.devices = {device for device in [tempest, sky, out_air, in_air] if device}
+
+    def dispatch(self, message_type, device, message):
+
+        """ Dispatch message to the observation parser. Messages already
+        received by another connection service are not dispatched
+
+        INPUTS:
+            message_type        Message type
+            device              Device serial number or device ID as a string
+            message             Decoded message
+
+        OUTPUT:
+            route               Route used to dispatch message, or None if the
+                                message is not from a station device
+        """
+
+        message_route = self.routes.get((message_type, device))
+        if message_route is not None:
+            if self.dedup is not None:
+                ob_time = message_time(message)
+                if ob_time is not None and self.dedup.seen((message_type, message_route.device, ob_time)):
+                    return message_route
+            if message_route.lane is None:
+                message_route.handler(message, self.config)
+            else:
+                self.executor.submit(message_route.lane, message_route.handler, message, self.config)
+        return message_route
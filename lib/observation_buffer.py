@@ -0,0 +1,237 @@
+""" Defines the fixed-capacity observation buffer that holds the last twenty-four
+hours of device observations required by the Raspberry Pi Python console for
+WeatherFlow Tempest and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required Python modules
+from array import array
+import math
+
+# Define default buffer capacity. Twenty-four hours of one minute observations
+# plus a margin for devices reporting slightly faster than once per minute
+CAPACITY = 1500
+
+
+# ==============================================================================
+# DEFINE 'obs_buffer' CLASS
+# ==============================================================================
+class obs_buffer():
+
+    """ Fixed-capacity ring buffer of device observations. Each observation
+    field is stored in its own preallocated array, with missing values stored
+    as NaN. Once the buffer is full the oldest observation is overwritten.
+
+    INPUTS:
+        width               Number of observation fields to store
+        capacity            Maximum number of observations to store
+    """
+
+    def __init__(self, width, capacity=CAPACITY):
+
+        # Define instance variables
+        self.width    = width
+        self.capacity = capacity
+        self.head     = 0
+        self.count    = 0
+        self.seeded   = False
+
+        # Preallocate observation arrays
+        self.columns  = [array('d', [math.nan]) * capacity for _ in range(width)]
+
+    def __len__(self):
+        return self.count
+
+    def latest_time(self):
+
+        """ Return the time of the latest observation in the buffer
+
+        OUTPUT:
+            ob_time             Time of latest observation                [s]
+        """
+
+        if self.count:
+            return self.columns[0][(self.head - 1) % self.capacity]
+        return None
+
+    def append(self, ob):
+
+        """ Append a single observation to the buffer. Observations that are not
+        newer than the latest buffered observation are ignored
+
+        INPUTS:
+            ob                  Observation list from Websocket/UDP message or
+                                WeatherFlow API
+        """
+
+        # Ignore observations with no time or that are out of order
+        if not ob or ob[0] is None:
+            return
+        latest_time = self.latest_time()
+        if latest_time is not None and ob[0] <= latest_time:
+            return
+
+        # Store observation fields, converting missing values to NaN
+        for ii, column in enumerate(self.columns):
+            value = ob[ii] if ii < len(ob) else None
+            column[self.head] = math.nan if value is None else value
+        self.head  = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def seed(self, obs):
+
+        """ Seed the buffer with observations from the WeatherFlow API. Buffered
+        observations newer than the API data are retained
+
+        INPUTS:
+            obs                 List of observations from WeatherFlow API
+        """
+
+        # Merge API observations with newer buffered observations
+        obs = [ob for ob in obs if ob and ob[0] is not None]
+        if obs:
+            last_time = obs[-1][0]
+            obs += [ob for ob in self.rows() if ob[0] > last_time]
+            self.clear()
+            for ob in obs:
+                self.append(ob)
+        self.seeded = True
+
+    def clear(self):
+
+        """ Remove all observations from the buffer
+        """
+
+        for column in self.columns:
+            for ii in range(self.capacity):
+                column[ii] = math.nan
+        self.head  = 0
+        self.count = 0
+
+    def rows(self):
+
+        """ Return all buffered observations in chronological order
+
+        OUTPUT:
+            obs                 List of observations
+        """
+
+        first = (self.head - self.count) % self.capacity
+        obs = []
+        for ii in range(self.count):
+            jj = (first + ii) % self.capacity
+            obs.append([None if column[jj] != column[jj] else column[jj] for column in self.columns])
+        return obs
+
+    def position(self, ob_time):
+
+        """ Return the position, in chronological order, of the first buffered
+        observation that is not older than the specified time. Buffered
+        observations are in time order, so the position is found by binary
+        search
+
+        INPUTS:
+            ob_time             Observation time                          [s]
+
+        OUTPUT:
+            position            Position of observation, or the number of
+                                buffered observations if all are older
+        """
+
+        first = (self.head - self.count) % self.capacity
+        time  = self.columns[0]
+        low   = 0
+        high  = self.count
+        while low < high:
+            middle = (low + high) // 2
+            if time[(first + middle) % self.capacity] < ob_time:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def nearest(self, index, target, tolerance):
+
+        """ Return the time and value of the buffered observation of a single
+        field that is nearest to the target time. Missing values are skipped
+
+        INPUTS:
+            index               Index of required observation field
+            target              Target observation time                    [s]
+            tolerance           Maximum difference between the observation
+                                time and the target time                  [s]
+
+        OUTPUT:
+            nearest             Tuple of observation time and value, or None
+                                if there is no observation within tolerance
+        """
+
+        first    = (self.head - self.count) % self.capacity
+        position = self.position(target)
+        time     = self.columns[0]
+        field    = self.columns[index]
+
+        # Find nearest observation with a valid value at or after the target
+        # time and before the target time
+        after = None
+        for ii in range(position, self.count):
+            jj = (first + ii) % self.capacity
+            if time[jj] - target >= tolerance:
+                break
+            if field[jj] == field[jj]:
+                after = jj
+                break
+        before = None
+        for ii in range(position - 1, -1, -1):
+            jj = (first + ii) % self.capacity
+            if target - time[jj] >= tolerance:
+                break
+            if field[jj] == field[jj]:
+                before = jj
+                break
+
+        # Return the nearest of the two observations
+        if before is None and after is None:
+            return None
+        if after is None or (before is not None and target - time[before] <= time[after] - target):
+            return time[before], field[before]
+        return time[after], field[after]
+
+    def column(self, index, start_time=None):
+
+        """ Return the time and value of each buffered observation of a single
+        field in chronological order. Missing values are removed
+
+        INPUTS:
+            index               Index of required observation field
+            start_time          Optional start time of required window     [s]
+
+        OUTPUT:
+            times               List of observation times                  [s]
+            values              List of observation values
+        """
+
+        first  = (self.head - self.count) % self.capacity
+        start  = self.position(start_time) if start_time is not None else 0
+        time   = self.columns[0]
+        field  = self.columns[index]
+        times  = []
+        values = []
+        for ii in range(start, self.count):
+            jj = (first + ii) % self.capacity
+            if field[jj] == field[jj]:
+                times.append(time[jj])
+                values.append(field[jj])
+        return times, values
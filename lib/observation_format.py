@@ -16,11 +16,109 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Import required modules
-from lib      import derived_variables as derive
-from datetime import datetime
+from lib.observation_value import obs_value
+from lib                   import derived_variables as derive
+from datetime              import datetime
 import pytz
 
 
+def _scale(factor, label, offset=0):
+
+    """ Return a conversion that scales the observation value and sets the unit
+    label. Missing values are left as None
+    """
+
+    return lambda value: (value if value is None else value * factor + offset, label)
+
+
+def _wind_spd(Unit):
+
+    """ Return a conversion from wind speed in m/s to the Beaufort scale
+    """
+
+    return lambda value: (value if value is None else derive.beaufort_scale([value, 'mps'])[2], Unit)
+
+
+def _wind_dir(Unit):
+
+    """ Return a conversion from wind direction in degrees to the required wind
+    direction unit
+    """
+
+    def convert(value):
+        if value is None:
+            return '-', ''
+        elif value == 'calm':
+            return 'Calm', ''
+        elif Unit == 'cardinal':
+            return derive.cardinal_wind_dir([value, 'degrees'])[2], ''
+        return value, 'degrees'
+    return convert
+
+
+# Define unit conversions for each required output unit, keyed by the unit
+# marker of the observation being converted
+CONVERSIONS = {'f':        {'c':     _scale(9 / 5, 'f', 32),
+                            'dc':    _scale(9 / 5, 'f'),
+                            'c/hr':  _scale(9 / 5, 'f/hr')},
+               'c':        {'dc':    _scale(1, 'c')},
+               'inhg':     {'mb':    _scale(0.0295301, ' inHg'),
+                            'mb/hr': _scale(0.0295301, ' inHg/hr')},
+               'mmhg':     {'mb':    _scale(0.750063, ' mmHg'),
+                            'mb/hr': _scale(0.750063, ' mmHg/hr')},
+               'hpa':      {'mb':    _scale(1, ' hPa'),
+                            'mb/hr': _scale(1, ' hPa/hr')},
+               'mb':       {'mb':    _scale(1, ' mb'),
+                            'mb/hr': _scale(1, ' mb/hr')},
+               'mph':      {'mps':   _scale(2.2369362920544, 'mph')},
+               'lfm':      {'mps':   _scale(2.2369362920544, 'mph')},
+               'kts':      {'mps':   _scale(1.9438, 'kts')},
+               'kph':      {'mps':   _scale(3.6, 'km/h')},
+               'bft':      {'mps':   _wind_spd('bft')},
+               'mps':      {'mps':   _scale(1, 'm/s')},
+               'degrees':  {'degrees': _wind_dir('degrees')},
+               'cardinal': {'degrees': _wind_dir('cardinal')},
+               'in':       {'mm':    _scale(0.0393701, ' in'),
+                            'mm/hr': _scale(0.0393701, ' in/hr')},
+               'cm':       {'mm':    _scale(0.1, ' cm'),
+                            'mm/hr': _scale(0.1, ' cm/hr')},
+               'mm':       {'mm':    _scale(1, ' mm'),
+                            'mm/hr': _scale(1, ' mm/hr')},
+               'mi':       {'km':    _scale(0.62137, 'miles')},
+               }
+
+
+def convert(Obs, conversions):
+
+    """ Converts the observation using the unit conversions for the required
+    output unit
+
+    INPUTS:
+        Obs             Observations with current units
+        conversions     Unit conversions keyed by unit marker
+
+    OUTPUT:
+        cObs            Observation converted into required unit
+    """
+
+    # Convert single device observation directly from its unit
+    if isinstance(Obs, obs_value):
+        if Obs.unit in conversions:
+            return list(conversions[Obs.unit](Obs.value))
+        return Obs.list()
+
+    # Convert each value that is followed by a unit marker with a conversion to
+    # the required unit
+    cObs = list(Obs)
+    if conversions:
+        for ii, marker in enumerate(Obs):
+            if type(marker) is str and marker in conversions:
+                cObs[ii - 1], cObs[ii] = conversions[marker](Obs[ii - 1])
+
+    # Return converted observations
+    return cObs
+
+
 def units(Obs, Unit):
 
     """ Sets the required observation units
@@ -33,161 +131,246 @@ def units(Obs, Unit):
         cObs            Observation converted into required unit
     """
 
-    # Convert temperature observations
-    cObs = Obs[:]
-    if Unit in ['f', 'c']:
-        for ii, T in enumerate(Obs):
-            if T == 'c':
-                if Unit == 'f':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * (9 / 5) + 32
-                    cObs[ii] = 'f'
-                else:
-                    cObs[ii - 1] = Obs[ii - 1]
-                    cObs[ii] = 'c'
-            if T in ['dc', 'c/hr']:
-                if Unit == 'f':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * (9 / 5)
-                    if T == 'dc':
-                        cObs[ii] = 'f'
-                    elif T == 'c/hr':
-                        cObs[ii] = 'f/hr'
-                else:
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1]
-                    if T == 'dc':
-                        cObs[ii] = 'c'
-
-    # Convert pressure and pressure trend observations
-    elif Unit in ['inhg', 'mmhg', 'hpa', 'mb']:
-        for ii, P in enumerate(Obs):
-            if P in ['mb', 'mb/hr']:
-                if Unit == 'inhg':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 0.0295301
-                    if P == 'mb':
-                        cObs[ii] = ' inHg'
-                    else:
-                        cObs[ii] = ' inHg/hr'
-                elif Unit == 'mmhg':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 0.750063
-                    if P == 'mb':
-                        cObs[ii] = ' mmHg'
-                    else:
-                        cObs[ii] = ' mmHg/hr'
-                elif Unit == 'hpa':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1]
-                    if P == 'mb':
-                        cObs[ii] = ' hPa'
-                    else:
-                        cObs[ii] = ' hPa/hr'
-                else:
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1]
-                    if P == 'mb':
-                        cObs[ii] = ' mb'
-                    else:
-                        cObs[ii] = ' mb/hr'
-
-    # Convert windspeed observations
-    elif Unit in ['mph', 'lfm', 'kts', 'kph', 'bft', 'mps']:
-        for ii, W in enumerate(Obs):
-            if W == 'mps':
-                if Unit == 'mph' or Unit == 'lfm':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 2.2369362920544
-                    cObs[ii] = 'mph'
-                elif Unit == 'kts':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 1.9438
-                    cObs[ii] = 'kts'
-                elif Unit == 'kph':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 3.6
-                    cObs[ii] = 'km/h'
-                elif Unit == 'bft':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = derive.beaufort_scale(Obs[ii - 1:ii + 1])[2]
-                    cObs[ii] = 'bft'
-                else:
-                    cObs[ii - 1] = Obs[ii - 1]
-                    cObs[ii] = 'm/s'
-
-    # Convert wind direction observations
-    elif Unit in ['degrees', 'cardinal']:
-        for ii, W in enumerate(Obs):
-            if W == 'degrees':
-                if cObs[ii - 1] is None:
-                    cObs[ii - 1] = '-'
-                    cObs[ii] = ''
-                elif cObs[ii - 1] == 'calm':
-                    cObs[ii - 1] = 'Calm'
-                    cObs[ii] = ''
-                elif Unit == 'cardinal':
-                    cObs[ii - 1] = derive.cardinal_wind_dir(Obs[ii - 1:ii + 1])[2]
-                    cObs[ii] = ''
-                else:
-                    cObs[ii - 1] = Obs[ii - 1]
-                    cObs[ii] = 'degrees'
-
-    # Convert rain accumulation and rain rate observations
-    elif Unit in ['in', 'cm', 'mm']:
-        for ii, Prcp in enumerate(Obs):
-            if Prcp in ['mm', 'mm/hr']:
-                if Unit == 'in':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 0.0393701
-                    if Prcp == 'mm':
-                        cObs[ii] = ' in'
-                    else:
-                        cObs[ii] = ' in/hr'
-                elif Unit == 'cm':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 0.1
-                    if Prcp == 'mm':
-                        cObs[ii] = ' cm'
-                    else:
-                        cObs[ii] = ' cm/hr'
-                else:
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1]
-                    if Prcp == 'mm':
-                        cObs[ii] = ' mm'
-                    else:
-                        cObs[ii] = ' mm/hr'
-
-    # Convert distance observations
-    elif Unit in ['km', 'mi']:
-        for ii, Dist in enumerate(Obs):
-            if Dist == 'km':
-                if Unit == 'mi':
-                    if Obs[ii - 1] is not None:
-                        cObs[ii - 1] = Obs[ii - 1] * 0.62137
-                    cObs[ii] = 'miles'
-
-    # Convert other observations
-    elif Unit in ['metric', 'imperial']:
-        for ii, other in enumerate(Obs):
-            if other == 'Wm2':
-                pass
-            elif other == 'index':
-                pass
-            elif other == 'hrs':
-                pass
-            elif other == '/min':
-                pass
-            elif other == 'count':
-                pass
-            elif other == 's':
-                pass
-            elif other == '%':
-                pass
+    return convert(Obs, CONVERSIONS.get(Unit, {}))
+
+
+def _number(spec, zero=None, digits=None, label=None):
+
+    """ Return a formatter that formats the value before the unit marker with
+    the format spec, formats values that round to zero without a sign, and
+    optionally sets the unit label
+    """
+
+    def formatter(cObs, ii):
+        value = cObs[ii - 1]
+        if value is None:
+            cObs[ii - 1] = '-'
+        elif zero is not None and round(value, digits) == 0.0:
+            cObs[ii - 1] = zero.format(abs(value))
+        else:
+            cObs[ii - 1] = spec.format(value)
+        if label is not None:
+            cObs[ii] = label
+    return formatter
+
+
+def _wind(cObs, ii):
+
+    """ Format wind speed to one decimal place below 10 and to the nearest whole
+    number above
+    """
+
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+    elif round(cObs[ii - 1], 1) < 10:
+        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
+    else:
+        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
 
-    # Return converted observations
-    return cObs
+
+def _precip(minimum, text, digits, label=None):
+
+    """ Return a formatter for rain accumulation and rain rate. Values below the
+    minimum are replaced by the text, and the number of decimal places falls
+    from each of the digits in turn as the value passes 10, 100, ...
+    """
+
+    def formatter(cObs, ii):
+        if label is not None:
+            cObs[ii] = label
+        value = cObs[ii - 1]
+        if value is None:
+            cObs[ii - 1] = '-'
+        elif value == 0:
+            cObs[ii - 1] = '{:.0f}'.format(value)
+        elif value < minimum:
+            cObs[ii - 1] = text
+            if text == 'Trace':
+                cObs[ii] = ''
+        else:
+            for jj, digit in enumerate(digits):
+                if round(value, digit) < 10**(jj + 1):
+                    cObs[ii - 1] = '{:.{}f}'.format(value, digit)
+                    break
+            else:
+                cObs[ii - 1] = '{:.0f}'.format(value)
+    return formatter
+
+
+def _uv(cObs, ii):
+
+    """ Format UV index, adding the missing UV level and colour if required
+    """
+
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+        cObs.extend(['-', '#646464'])
+    else:
+        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
+
+
+def _strike_count(cObs, ii):
+
+    """ Format lightning strike count, in thousands above 1000 strikes
+    """
+
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+    elif cObs[ii - 1] < 1000:
+        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+    else:
+        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1] / 1000) + ' k'
+
+
+def _strike_distance(error):
+
+    """ Return a formatter for lightning strike distance as a range either side
+    of the reported distance
+    """
+
+    def formatter(cObs, ii):
+        if cObs[ii - 1] is None:
+            cObs[ii - 1] = '-'
+        else:
+            cObs[ii - 1] = '{:.0f}'.format(max(cObs[ii - 1] - error, 0)) + '-' + '{:.0f}'.format(cObs[ii - 1] + error)
+    return formatter
+
+
+def _strike_frequency(cObs, ii):
+
+    """ Format lightning strike frequency
+    """
+
+    if cObs[ii - 1] is None:
+        cObs[ii - 1] = '-'
+    elif cObs[ii - 1].is_integer():
+        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
+    else:
+        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
+    cObs[ii] = ' /min'
+
+
+def _time(config):
+
+    """ Return a formatter for observation times in the station timezone and
+    configured time format
+    """
+
+    Tz = pytz.timezone(config['Station']['Timezone'])
+    if config['Display']['TimeFormat'] == '12 hr':
+        if config['System']['Hardware'] == 'Other':
+            Format = '%#I:%M %p'
+        else:
+            Format = '%-I:%M %p'
+    else:
+        Format = '%H:%M'
+
+    def formatter(cObs, ii):
+        if cObs[ii - 1] is None:
+            cObs[ii - 1] = '-'
+        else:
+            cObs[ii - 1] = datetime.fromtimestamp(cObs[ii - 1], Tz).strftime(Format)
+    return formatter
+
+
+def _time_delta(cObs, ii):
+
+    """ Format the time since an observation as the two largest units of days,
+    hours and minutes. The full observation is replaced
+    """
+
+    if cObs[ii - 1] is None:
+        cObs[:] = ['-', '-', '-', '-', cObs[2]]
+        return
+    days, remainder  = divmod(cObs[ii - 1], 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if days >= 1:
+        if days >= 100:
+            cObs[:] = ['{:.0f}'.format(days), 'days', '-', '-', cObs[2]]
+        else:
+            cObs[:] = ['{:.0f}'.format(days), 'day' if days == 1 else 'days',
+                       '{:.0f}'.format(hours), 'hour' if hours == 1 else 'hours', cObs[2]]
+    elif hours >= 1:
+        cObs[:] = ['{:.0f}'.format(hours), 'hour' if hours == 1 else 'hours',
+                   '{:.0f}'.format(minutes), 'min' if minutes == 1 else 'mins', cObs[2]]
+    elif minutes == 0:
+        cObs[:] = ['< 1', 'minute', '-', '-', cObs[2]]
+    else:
+        cObs[:] = ['{:.0f}'.format(minutes), 'minute' if minutes == 1 else 'minutes', '-', '-', cObs[2]]
+
+
+# Define formatters for each observation type, keyed by the unit marker of the
+# value being formatted
+FORMATS = {'Temp':            {'c':       _number('{:.1f}',  '{:.1f}', 1, u'\N{DEGREE CELSIUS}'),
+                               'f':       _number('{:.1f}',  '{:.1f}', 1, u'\N{DEGREE FAHRENHEIT}'),
+                               'c/hr':    _number('{:+.1f}', '{:.1f}', 1, u'\N{DEGREE CELSIUS}/hr'),
+                               'f/hr':    _number('{:+.1f}', '{:.1f}', 1, u'\N{DEGREE FAHRENHEIT}/hr')},
+           'forecastTemp':    {'c':       _number('{:.0f}',  '{:.0f}', 1, u'\N{DEGREE CELSIUS}'),
+                               'f':       _number('{:.0f}',  '{:.0f}', 1, u'\N{DEGREE FAHRENHEIT}')},
+           'Pressure':        {'inHg':    _number('{:.3f}', '{:.3f}', 3),
+                               'inHg/hr': _number('{:.3f}', '{:.3f}', 3),
+                               'mmHg':    _number('{:.2f}', '{:.2f}', 2),
+                               'mmHg/hr': _number('{:.2f}', '{:.2f}', 2),
+                               'hPa':     _number('{:.1f}', '{:.1f}', 1),
+                               'hPa/hr':  _number('{:.1f}', '{:.1f}', 1),
+                               'mb':      _number('{:.1f}', '{:.1f}', 1),
+                               'mb/hr':   _number('{:.1f}', '{:.1f}', 1)},
+           'Wind':            dict.fromkeys(['mph', 'kts', 'km/h', 'bft', 'm/s'], _wind),
+           'forecastWind':    dict.fromkeys(['mph', 'kts', 'km/h', 'bft', 'm/s'], _number('{:.0f}')),
+           'Direction':       {'degrees': _number('{:.0f}', label=u'\u00B0')},
+           'Precip':          {'mm':      _precip(0.127,  'Trace', (1,)),
+                               'cm':      _precip(0.0127, 'Trace', (2, 1)),
+                               'in':      _precip(0.005,  'Trace', (2, 1), u'\u0022'),
+                               'mm/hr':   _precip(0.1,    '<0.1',  (1,)),
+                               'cm/hr':   _precip(0.01,   '<0.01', (2, 1)),
+                               'in/hr':   _precip(0.01,   '<0.01', (2, 1))},
+           'Humidity':        {'%':       _number('{:.0f}')},
+           'Radiation':       {'Wm2':     _number('{:.0f}', label=' W/m' + u'\u00B2')},
+           'UV':              {'index':   _uv},
+           'peakSun':         {'hrs':     _number('{:.2f}')},
+           'Battery':         {'v':       _number('{:.2f}')},
+           'StrikeCount':     {'count':   _strike_count},
+           'StrikeDistance':  {'km':      _strike_distance(3),
+                               'miles':   _strike_distance(3 * 0.62137)},
+           'StrikeFrequency': {'/min':    _strike_frequency},
+           'TimeDelta':       {'s':       _time_delta},
+           }
+
+
+def pipeline(Unit, obType, config=[]):
+
+    """ Compiles the unit conversion and formatting of an observation into a
+    single function. Configuration choices are resolved once when the pipeline
+    is compiled, so pipelines must be recompiled when the configuration changes
+
+    INPUTS:
+        Unit            Required output unit, or None to leave units unchanged
+        obType          Observation type, or list of observation types
+        config          Console configuration object
+
+    OUTPUT:
+        pipeline        Function returning the observation converted into the
+                        required unit and formatted for display
+    """
+
+    # Resolve unit conversions and formatters for each observation type
+    conversions = CONVERSIONS.get(Unit, {})
+    formatters  = []
+    for Type in (obType if isinstance(obType, list) else [obType]):
+        formatters.append({'s': _time(config)} if Type == 'Time' else FORMATS.get(Type, {}))
+
+    def pipeline(Obs):
+        cObs = convert(Obs, conversions)
+        Obs  = cObs[:]
+        for formats in formatters:
+            for ii, marker in enumerate(Obs):
+                if isinstance(marker, str):
+                    formatter = formats.get(marker.strip())
+                    if formatter is not None:
+                        formatter(cObs, ii)
+        return cObs
+    return pipeline
 
 
 def format(Obs, obType, config=[]):
@@ -196,330 +379,11 @@ def format(Obs, obType, config=[]):
 
     INPUTS:
         Obs             Observations with units
-        obType            Observation type
+        obType          Observation type
+        config          Console configuration object
 
     OUTPUT:
         cObs            Formatted observation based on specified obType
     """
 
-    # Convert obType to list if required
-    if not isinstance(obType, list):
-        obType = [obType]
-
-    # Format temperature observations
-    cObs = Obs[:]
-    for Type in obType:
-        if Type == 'Temp':
-            for ii, T in enumerate(Obs):
-                if isinstance(T, str) and T.strip() in ['c', 'f']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    elif round(cObs[ii - 1], 1) == 0.0:
-                        cObs[ii - 1] = '{:.1f}'.format(abs(cObs[ii - 1]))
-                    else:
-                        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                    if T.strip() == 'c':
-                        cObs[ii] = u'\N{DEGREE CELSIUS}'
-                    elif T.strip() == 'f':
-                        cObs[ii] = u'\N{DEGREE FAHRENHEIT}'
-                elif isinstance(T, str) and T.strip() in ['c/hr', 'f/hr']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    elif round(cObs[ii - 1], 1) == 0.0:
-                        cObs[ii - 1] = '{:.1f}'.format(abs(cObs[ii - 1]))
-                    else:
-                        cObs[ii - 1] = '{:+.1f}'.format(cObs[ii - 1])
-                    if T.strip() == 'c/hr':
-                        cObs[ii] = u'\N{DEGREE CELSIUS}/hr'
-                    elif T.strip() == 'f/hr':
-                        cObs[ii] = u'\N{DEGREE FAHRENHEIT}/hr'
-        elif Type == 'forecastTemp':
-            for ii, T in enumerate(Obs):
-                if isinstance(T, str) and T.strip() in ['c', 'f']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    elif round(cObs[ii - 1], 1) == 0.0:
-                        cObs[ii - 1] = '{:.0f}'.format(abs(cObs[ii - 1]))
-                    else:
-                        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                    if T.strip() == 'c':
-                        cObs[ii] = u'\N{DEGREE CELSIUS}'
-                    elif T.strip() == 'f':
-                        cObs[ii] = u'\N{DEGREE FAHRENHEIT}'
-
-        # Format pressure observations
-        elif Type == 'Pressure':
-            for ii, P in enumerate(Obs):
-                if isinstance(P, str) and P.strip() in ['inHg/hr', 'inHg', 'mmHg/hr', 'mmHg', 'hPa/hr', 'mb/hr', 'hPa', 'mb']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        if P.strip() in ['inHg/hr', 'inHg']:
-                            if round(cObs[ii - 1], 3) == 0.0:
-                                cObs[ii - 1] = '{:.3f}'.format(abs(cObs[ii - 1]))
-                            else:
-                                cObs[ii - 1] = '{:.3f}'.format(cObs[ii - 1])
-                        elif P.strip() in ['mmHg/hr', 'mmHg']:
-                            if round(cObs[ii - 1], 2) == 0.0:
-                                cObs[ii - 1] = '{:.2f}'.format(abs(cObs[ii - 1]))
-                            else:
-                                cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
-                        elif P.strip() in ['hPa/hr', 'mb/hr', 'hPa', 'mb']:
-                            if round(cObs[ii - 1], 1) == 0.0:
-                                cObs[ii - 1] = '{:.1f}'.format(abs(cObs[ii - 1]))
-                            else:
-                                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-
-        # Format windspeed observations
-        elif Type == 'Wind':
-            for ii, W in enumerate(Obs):
-                if isinstance(W, str) and W.strip() in ['mph', 'kts', 'km/h', 'bft', 'm/s']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        if round(cObs[ii - 1], 1) < 10:
-                            cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                        else:
-                            cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-        elif Type == 'forecastWind':
-            for ii, W in enumerate(Obs):
-                if isinstance(W, str) and W.strip() in ['mph', 'kts', 'km/h', 'bft', 'm/s']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-
-        # Format wind direction observations
-        elif Type == 'Direction':
-            for ii, D in enumerate(Obs):
-                if isinstance(D, str) and D.strip() in ['degrees']:
-                    cObs[ii] = u'\u00B0'
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-
-        # Format rain accumulation and rain rate observations
-        elif Type == 'Precip':
-            for ii, Prcp in enumerate(Obs):
-                if isinstance(Prcp, str):
-                    if Prcp.strip() == 'mm':
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            if cObs[ii - 1] == 0:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                            elif cObs[ii - 1] < 0.127:
-                                cObs[ii - 1] = 'Trace'
-                                cObs[ii] = ''
-                            elif round(cObs[ii - 1], 1) < 10:
-                                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                            else:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                    elif Prcp.strip() == 'cm':
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            if cObs[ii - 1] == 0:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                            elif cObs[ii - 1] < 0.0127:
-                                cObs[ii - 1] = 'Trace'
-                                cObs[ii] = ''
-                            elif round(cObs[ii - 1], 2) < 10:
-                                cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
-                            elif round(cObs[ii - 1], 1) < 100:
-                                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                            else:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                    elif Prcp.strip() == 'in':
-                        cObs[ii] = u'\u0022'
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            if cObs[ii - 1] == 0:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                            elif cObs[ii - 1] < 0.005:
-                                cObs[ii - 1] = 'Trace'
-                                cObs[ii] = ''
-                            elif round(cObs[ii - 1], 2) < 10:
-                                cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
-                            elif round(cObs[ii - 1], 1) < 100:
-                                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                            else:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                    elif Prcp.strip() == 'mm/hr':
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            if cObs[ii - 1] == 0:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                            elif cObs[ii - 1] < 0.1:
-                                cObs[ii - 1] = '<0.1'
-                            elif round(cObs[ii - 1], 1) < 10:
-                                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                            else:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                    elif Prcp.strip() in ['in/hr', 'cm/hr']:
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            if cObs[ii - 1] == 0:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                            elif cObs[ii - 1] < 0.01:
-                                cObs[ii - 1] = '<0.01'
-                            elif round(cObs[ii - 1], 2) < 10:
-                                cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
-                            elif round(cObs[ii - 1], 1) < 100:
-                                cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                            else:
-                                cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-
-        # Format humidity observations
-        elif Type == 'Humidity':
-            for ii, H in enumerate(Obs):
-                if isinstance(H, str) and H.strip() == '%':
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-
-        # Format solar radiation observations
-        elif Type == 'Radiation':
-            for ii, Rad in enumerate(Obs):
-                if isinstance(Rad, str) and Rad.strip() == 'Wm2':
-                    cObs[ii]   = ' W/m' + u'\u00B2'
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-
-        # Format UV observations
-        elif Type == 'UV':
-            for ii, UV in enumerate(Obs):
-                if isinstance(UV, str) and UV.strip() == 'index':
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                        cObs.extend(['-', '#646464'])
-                    else:
-                        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-
-        # Format Peak Sun Hours observations
-        elif Type == 'peakSun':
-            for ii, psh in enumerate(Obs):
-                if isinstance(psh, str) and psh.strip() == 'hrs':
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
-
-        # Format battery voltage observations
-        elif Type == 'Battery':
-            for ii, V in enumerate(Obs):
-                if isinstance(V, str) and V.strip() == 'v':
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        cObs[ii - 1] = '{:.2f}'.format(cObs[ii - 1])
-
-        # Format lightning strike count observations
-        elif Type == 'StrikeCount':
-            for ii, L in enumerate(Obs):
-                if isinstance(L, str) and L.strip() == 'count':
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    elif cObs[ii - 1] < 1000:
-                        cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                    else:
-                        cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1] / 1000) + ' k'
-
-        # Format lightning strike distance observations
-        elif Type == 'StrikeDistance':
-            for ii, StrikeDist in enumerate(Obs):
-                if isinstance(StrikeDist, str):
-                    if StrikeDist.strip() in ['km']:
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            cObs[ii - 1] = '{:.0f}'.format(max(cObs[ii - 1] - 3, 0)) + '-' +  '{:.0f}'.format(cObs[ii - 1] + 3)
-                    elif StrikeDist.strip() in ['miles']:
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                        else:
-                            cObs[ii - 1] = '{:.0f}'.format(max(cObs[ii - 1] - 3 * 0.62137, 0)) + '-' +  '{:.0f}'.format(cObs[ii - 1] + 3 * 0.62137)
-
-        # Format lightning strike frequency observations
-        elif Type == 'StrikeFrequency':
-            for ii, StrikeFreq in enumerate(Obs):
-                if isinstance(StrikeFreq, str):
-                    if StrikeFreq.strip() in ['/min']:
-                        if cObs[ii - 1] is None:
-                            cObs[ii - 1] = '-'
-                            cObs[ii] = ' /min'
-                        elif cObs[ii - 1].is_integer():
-                            cObs[ii - 1] = '{:.0f}'.format(cObs[ii - 1])
-                            cObs[ii] = ' /min'
-                        else:
-                            cObs[ii - 1] = '{:.1f}'.format(cObs[ii - 1])
-                            cObs[ii] = ' /min'
-
-        # Format time difference observations
-        elif Type == 'Time':
-            for ii, Time in enumerate(Obs):
-                if isinstance(Time, str) and Time.strip() in ['s']:
-                    if cObs[ii - 1] is None:
-                        cObs[ii - 1] = '-'
-                    else:
-                        Tz = pytz.timezone(config['Station']['Timezone'])
-                        if config['Display']['TimeFormat'] == '12 hr':
-                            if config['System']['Hardware'] == 'Other':
-                                Format = '%#I:%M %p'
-                            else:
-                                Format = '%-I:%M %p'
-                        else:
-                            Format = '%H:%M'
-                        cObs[ii - 1] = datetime.fromtimestamp(cObs[ii - 1], Tz).strftime(Format)
-
-        # Format time difference observations
-        elif Type == 'TimeDelta':
-            for ii, Delta in enumerate(Obs):
-                if isinstance(Delta, str) and Delta.strip() in ['s']:
-                    if cObs[ii - 1] is None:
-                        cObs = ['-', '-', '-', '-', cObs[2]]
-                    else:
-                        days, remainder  = divmod(cObs[ii - 1], 86400)
-                        hours, remainder = divmod(remainder, 3600)
-                        minutes, seconds = divmod(remainder, 60)
-                        if days >= 1:
-                            if days == 1:
-                                if hours == 1:
-                                    cObs = ['{:.0f}'.format(days), 'day', '{:.0f}'.format(hours), 'hour', cObs[2]]
-                                else:
-                                    cObs = ['{:.0f}'.format(days), 'day', '{:.0f}'.format(hours), 'hours', cObs[2]]
-                            elif days <= 99:
-                                if hours == 1:
-                                    cObs = ['{:.0f}'.format(days), 'days', '{:.0f}'.format(hours), 'hour', cObs[2]]
-                                else:
-                                    cObs = ['{:.0f}'.format(days), 'days', '{:.0f}'.format(hours), 'hours', cObs[2]]
-                            elif days >= 100:
-                                cObs = ['{:.0f}'.format(days), 'days', '-', '-', cObs[2]]
-                        elif hours >= 1:
-                            if hours == 1:
-                                if minutes == 1:
-                                    cObs = ['{:.0f}'.format(hours), 'hour', '{:.0f}'.format(minutes), 'min', cObs[2]]
-                                else:
-                                    cObs = ['{:.0f}'.format(hours), 'hour', '{:.0f}'.format(minutes), 'mins', cObs[2]]
-                            elif hours > 1:
-                                if minutes == 1:
-                                    cObs = ['{:.0f}'.format(hours), 'hours', '{:.0f}'.format(minutes), 'min', cObs[2]]
-                                else:
-                                    cObs = ['{:.0f}'.format(hours), 'hours', '{:.0f}'.format(minutes), 'mins', cObs[2]]
-                        else:
-                            if minutes == 0:
-                                cObs = ['< 1', 'minute', '-', '-', cObs[2]]
-                            elif minutes == 1:
-                                cObs = ['{:.0f}'.format(minutes), 'minute', '-', '-', cObs[2]]
-                            else:
-                                cObs = ['{:.0f}'.format(minutes), 'minutes', '-', '-', cObs[2]]
-
-    # Return formatted observations
-    return cObs
+    return pipeline(None, obType, config)(Obs)
@@ -16,24 +16,37 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Import required library modules
-from lib.request_api import weatherflow_api
-from lib.system      import system
-from lib             import derived_variables  as derive
-from lib             import observation_format as observation
-from lib             import properties
+from lib.request_api        import weatherflow_api
+from lib.observation_buffer import obs_buffer
+from lib.observation_value  import obs_value
+from lib.system             import system
+from lib                    import archive
+from lib                    import daily_totals
+from lib                    import daily_aggregates
+from lib                    import derived_graph
+from lib                    import snapshot
+from lib                    import update_bus
+from lib                    import observation_format as observation
+from lib                    import properties
 
 # Import required Kivy modules
-from kivy.logger  import Logger
-from kivy.clock   import mainthread
-from kivy.app     import App
+from kivy.logger            import Logger
+from kivy.app               import App
+
+# Import required Python modules
+import time
+
+# Define maximum time that the main thread waits for active parse jobs to
+# finish before the display is reset or reformatted                         [s]
+IDLE_TIMEOUT = 5
 
 # Define empty deviceObs dictionary
-device_obs = {'obTime':       [None, 's'],                'pressure':     [None, 'mb'],              'outTemp':      [None, 'c'],
-              'inTemp':       [None, 'c'],                'humidity':     [None, '%'],               'windSpd':      [None, 'mps'],
-              'windGust':     [None, 'mps'],              'windDir':      [None, 'degrees'],         'rapidWindSpd': [None, 'mps'],
-              'rapidWindDir': [None, 'degrees'],          'uvIndex':      [None, 'index'],           'radiation':    [None, 'Wm2'],
-              'minuteRain':   [None, 'mm'],               'dailyRain':    [None, 'mm'],              'strikeMinute': [None, 'count'],
-              'strikeTime':   [None, 's'],                'strikeDist':   [None, 'km'],              'strike3hr':    [None, 'count'],
+device_obs = {'obTime':       obs_value(None, 's'),         'pressure':     obs_value(None, 'mb'),        'outTemp':      obs_value(None, 'c'),
+              'inTemp':       obs_value(None, 'c'),         'humidity':     obs_value(None, '%'),         'windSpd':      obs_value(None, 'mps'),
+              'windGust':     obs_value(None, 'mps'),       'windDir':      obs_value(None, 'degrees'),   'rapidWindSpd': obs_value(None, 'mps'),
+              'rapidWindDir': obs_value(None, 'degrees'),   'uvIndex':      obs_value(None, 'index'),     'radiation':    obs_value(None, 'Wm2'),
+              'minuteRain':   obs_value(None, 'mm'),        'dailyRain':    obs_value(None, 'mm'),        'strikeMinute': obs_value(None, 'count'),
+              'strikeTime':   obs_value(None, 's'),         'strikeDist':   obs_value(None, 'km'),        'strike3hr':    obs_value(None, 'count'),
               }
 
 # Define empty deriveObs dictionary
@@ -67,6 +80,7 @@ class obs_parser():
         # Define instance variables
         self.display_obs = properties.Obs()
         self.api_data    = {}
+        self.obs_buffer  = {}
         self.transmit    = 1
         self.flag_api    = [1, 1, 1, 1]
 
@@ -74,9 +88,25 @@ class obs_parser():
         self.app = App.get_running_app()
         self.app.obsParser = self
 
+        # Open local observation archive and daily summary cache
+        self.archive      = archive.get(self.app.config)
+        self.daily_totals = daily_totals.get(self.app.config)
+
         # Define device and derived observations dictionary
         self.device_obs = device_obs.copy()
         self.derive_obs = derive_obs.copy()
+        self.aggregates = daily_aggregates.create(self.app.config)
+        self.derived_graph = derived_graph.derived_graph(self.app.config)
+
+        # Compile unit conversion and formatting pipelines for display values
+        self.compile_pipelines(self.app.config)
+
+        # Restore device and derived observations from warm-start snapshot
+        self.snapshot_file = self.app.config['System'].get('SnapshotFile', '').strip()
+        self.snapshot_time = time.time()
+        self.backfill      = {}
+        if self.snapshot_file:
+            snapshot.load(self, self.snapshot_file, self.app.config)
 
     def parse_obs_st(self, message, config):
 
@@ -93,11 +123,15 @@ class obs_parser():
         else:
             return
 
-        # Extract TEMPEST device_id. Initialise API data dictionary
+        # Extract TEMPEST device_id. Messages from the configured device are
+        # keyed by its device ID, so that UDP and Websocket messages share
+        # the same observation buffer and API data. Initialise API data
+        # dictionary
         if 'device_id' in message:
             device_id = message['device_id']
         elif 'serial_number' in message:
             device_id = message['serial_number']
+        device_id = config['Station']['TempestID'] or device_id
         if int(config['System']['rest_api']) and config['Station']['TempestID']:
             api_device_id = config['Station']['TempestID']
             self.api_data[device_id] = {'flagAPI': self.flag_api[0]}
@@ -107,31 +141,36 @@ class obs_parser():
             if self.display_obs['obs_st']['obs'][0] == latest_ob[0]:
                 return
 
+        # Archive latest TEMPEST observation
+        self.archive_ob('obs', device_id, latest_ob)
+
         # Extract required observations from latest TEMPEST Websocket JSON
-        self.device_obs['obTime']       = [latest_ob[0],  's']
-        self.device_obs['windSpd']      = [latest_ob[2],  'mps']
-        self.device_obs['windGust']     = [latest_ob[3],  'mps']
-        self.device_obs['windDir']      = [latest_ob[4],  'degrees']
-        self.device_obs['pressure']     = [latest_ob[6],  'mb']
-        self.device_obs['outTemp']      = [latest_ob[7],  'c']
-        self.device_obs['humidity']     = [latest_ob[8],  '%']
-        self.device_obs['uvIndex']      = [latest_ob[10], 'index']
-        self.device_obs['radiation']    = [latest_ob[11], 'Wm2']
-        self.device_obs['minuteRain']   = [latest_ob[12], 'mm']
-        self.device_obs['strikeMinute'] = [latest_ob[15], 'count']
+        self.device_obs['obTime']       = obs_value(latest_ob[0],  's', latest_ob[0])
+        self.device_obs['windSpd']      = obs_value(latest_ob[2],  'mps', latest_ob[0])
+        self.device_obs['windGust']     = obs_value(latest_ob[3],  'mps', latest_ob[0])
+        self.device_obs['windDir']      = obs_value(latest_ob[4],  'degrees', latest_ob[0])
+        self.device_obs['pressure']     = obs_value(latest_ob[6],  'mb', latest_ob[0])
+        self.device_obs['outTemp']      = obs_value(latest_ob[7],  'c', latest_ob[0])
+        self.device_obs['humidity']     = obs_value(latest_ob[8],  '%', latest_ob[0])
+        self.device_obs['uvIndex']      = obs_value(latest_ob[10], 'index', latest_ob[0])
+        self.device_obs['radiation']    = obs_value(latest_ob[11], 'Wm2', latest_ob[0])
+        self.device_obs['minuteRain']   = obs_value(latest_ob[12], 'mm', latest_ob[0])
+        self.device_obs['strikeMinute'] = obs_value(latest_ob[15], 'count', latest_ob[0])
         if len(latest_ob) > 18:
-            self.device_obs['dailyRain']    = [latest_ob[18], 'mm']
+            self.device_obs['dailyRain']    = obs_value(latest_ob[18], 'mm', latest_ob[0])
 
         # Extract lightning strike data from the latest TEMPEST Websocket JSON
         # "summary" object
         if 'summary' in message:
-            self.device_obs['strikeTime'] = [message['summary']['strike_last_epoch'] if 'strike_last_epoch' in message['summary'] else None, 's']
-            self.device_obs['strikeDist'] = [message['summary']['strike_last_dist']  if 'strike_last_dist'  in message['summary'] else None, 'km']
-            self.device_obs['strike3hr']  = [message['summary']['strike_count_3h']   if 'strike_count_3h'   in message['summary'] else None, 'count']
+            self.device_obs['strikeTime'] = obs_value(message['summary']['strike_last_epoch'] if 'strike_last_epoch' in message['summary'] else None, 's')
+            self.device_obs['strikeDist'] = obs_value(message['summary']['strike_last_dist']  if 'strike_last_dist'  in message['summary'] else None, 'km')
+            self.device_obs['strike3hr']  = obs_value(message['summary']['strike_count_3h']   if 'strike_count_3h'   in message['summary'] else None, 'count')
+
+        # Update 24 hour TEMPEST observation buffer
+        self.update_obs_buffer(device_id, latest_ob, 18, config['Station']['TempestID'], config)
 
         # Request required TEMPEST data from the WeatherFlow API
         if int(config['System']['rest_api']) and config['Station']['TempestID']:
-            self.api_data[device_id]['24Hrs'] = weatherflow_api.last_24h(api_device_id, latest_ob[0], config)
             if self.api_data[device_id]['flagAPI']:
                 if (self.derive_obs['SLPMin'][0] is None
                     or self.derive_obs['SLPMax'][0] is None
@@ -142,12 +181,12 @@ class obs_parser():
                     or self.derive_obs['peakSun'][0] is None
                     or self.derive_obs['rainAccum']['today'][0] is None
                     or self.derive_obs['strikeCount']['today'][0] is None):
-                    self.api_data[device_id]['today'] = weatherflow_api.today(api_device_id, config)
+                    self.api_data[device_id]['today'] = self.fetch_today(api_device_id, config)
                 if self.derive_obs['rainAccum']['yesterday'][0] is None:
-                    self.api_data[device_id]['yesterday'] = weatherflow_api.yesterday(api_device_id, config)
+                    self.api_data[device_id]['yesterday'] = self.fetch_yesterday(api_device_id, config)
                 if (self.derive_obs['rainAccum']['month'][0] is None
                     or self.derive_obs['strikeCount']['month'][0] is None):
-                    self.api_data[device_id]['month'] = weatherflow_api.month(api_device_id, config)
+                    self.api_data[device_id]['month'] = self.fetch_month(api_device_id, config)
                 if int(config['System']['stats_endpoint']):
                     if (self.derive_obs['rainAccum']['month'][0] is None
                         or self.derive_obs['strikeCount']['month'][0] is None
@@ -157,10 +196,10 @@ class obs_parser():
                 elif not int(config['System']['stats_endpoint']):
                     if (self.derive_obs['rainAccum']['month'][0] is None
                         or self.derive_obs['strikeCount']['month'][0] is None):
-                        self.api_data[device_id]['month'] = weatherflow_api.month(api_device_id, config)
+                        self.api_data[device_id]['month'] = self.fetch_month(api_device_id, config)
                     if (self.derive_obs['rainAccum']['year'][0] is None
                         or self.derive_obs['strikeCount']['year'][0] is None):
-                        self.api_data[device_id]['year']  = weatherflow_api.year(api_device_id, config)
+                        self.api_data[device_id]['year']  = self.fetch_year(api_device_id, config)
         self.flag_api[0] = 0
 
         # Store latest TEMPEST JSON message
@@ -184,11 +223,15 @@ class obs_parser():
         else:
             return
 
-        # Extract SKY device_id. Initialise API data dictionary
+        # Extract SKY device_id. Messages from the configured device are
+        # keyed by its device ID, so that UDP and Websocket messages share
+        # the same observation buffer and API data. Initialise API data
+        # dictionary
         if 'device_id' in message:
             device_id = message['device_id']
         elif 'serial_number' in message:
             device_id = message['serial_number']
+        device_id = config['Station']['SkyID'] or device_id
         if int(config['System']['rest_api']) and config['Station']['SkyID']:
             api_device_id = config['Station']['SkyID']
             self.api_data[device_id] = {'flagAPI': self.flag_api[1]}
@@ -198,15 +241,18 @@ class obs_parser():
             if self.display_obs['obs_sky']['obs'][0] == latest_ob[0]:
                 return
 
+        # Archive latest SKY observation
+        self.archive_ob('obs', device_id, latest_ob)
+
         # Extract required observations from latest SKY Websocket JSON
-        self.device_obs['uvIndex']    = [latest_ob[2],  'index']
-        self.device_obs['minuteRain'] = [latest_ob[3],  'mm']
-        self.device_obs['windSpd']    = [latest_ob[5],  'mps']
-        self.device_obs['windGust']   = [latest_ob[6],  'mps']
-        self.device_obs['windDir']    = [latest_ob[7],  'degrees']
-        self.device_obs['radiation']  = [latest_ob[10], 'Wm2']
+        self.device_obs['uvIndex']    = obs_value(latest_ob[2],  'index', latest_ob[0])
+        self.device_obs['minuteRain'] = obs_value(latest_ob[3],  'mm', latest_ob[0])
+        self.device_obs['windSpd']    = obs_value(latest_ob[5],  'mps', latest_ob[0])
+        self.device_obs['windGust']   = obs_value(latest_ob[6],  'mps', latest_ob[0])
+        self.device_obs['windDir']    = obs_value(latest_ob[7],  'degrees', latest_ob[0])
+        self.device_obs['radiation']  = obs_value(latest_ob[10], 'Wm2', latest_ob[0])
         if latest_ob[11] is not None:
-            self.device_obs['dailyRain']  = [latest_ob[11], 'mm']
+            self.device_obs['dailyRain']  = obs_value(latest_ob[11], 'mm', latest_ob[0])
 
         # Request required SKY data from the WeatherFlow API
         if int(config['System']['rest_api']) and config['Station']['SkyID']:
@@ -214,18 +260,18 @@ class obs_parser():
                 if (self.derive_obs['windAvg'][0] is None
                     or self.derive_obs['gustMax'][0] is None
                     or self.derive_obs['peakSun'][0] is None):
-                    self.api_data[device_id]['today'] = weatherflow_api.today(api_device_id, config)
+                    self.api_data[device_id]['today'] = self.fetch_today(api_device_id, config)
                 if self.derive_obs['rainAccum']['yesterday'][0] is None:
-                    self.api_data[device_id]['yesterday'] = weatherflow_api.yesterday(api_device_id, config)
+                    self.api_data[device_id]['yesterday'] = self.fetch_yesterday(api_device_id, config)
                 if int(config['System']['stats_endpoint']):
                     if (self.derive_obs['rainAccum']['month'][0] is None
                         or self.derive_obs['rainAccum']['year'][0] is None):
                         self.api_data[device_id]['statistics'] = weatherflow_api.statistics(config['Station']['StationID'], config)            
                 elif not int(config['System']['stats_endpoint']):
                     if self.derive_obs['rainAccum']['month'][0] is None:
-                        self.api_data[device_id]['month'] = weatherflow_api.month(api_device_id, config)
+                        self.api_data[device_id]['month'] = self.fetch_month(api_device_id, config)
                     if self.derive_obs['rainAccum']['year'][0] is None:
-                        self.api_data[device_id]['year'] = weatherflow_api.year(api_device_id, config)
+                        self.api_data[device_id]['year'] = self.fetch_year(api_device_id, config)
         self.flag_api[1] = 0
 
         # Store latest SKY JSON message
@@ -249,11 +295,15 @@ class obs_parser():
         else:
             return
 
-        # Extract outdoor AIR device_id. Initialise API data dictionary
+        # Extract outdoor AIR device_id. Messages from the configured device are
+        # keyed by its device ID, so that UDP and Websocket messages share
+        # the same observation buffer and API data. Initialise API data
+        # dictionary
         if 'device_id' in message:
             device_id = message['device_id']
         elif 'serial_number' in message:
             device_id = message['serial_number']
+        device_id = config['Station']['OutAirID'] or device_id
         if int(config['System']['rest_api']) and config['Station']['OutAirID']:
             api_device_id = config['Station']['OutAirID']
             self.api_data[device_id] = {'flagAPI': self.flag_api[2]}
@@ -263,39 +313,44 @@ class obs_parser():
             if self.display_obs['obs_out_air']['obs'][0] == latest_ob[0]:
                 return
 
+        # Archive latest outdoor AIR observation
+        self.archive_ob('obs', device_id, latest_ob)
+
         # Extract required observations from latest outdoor AIR Websocket JSON
-        self.device_obs['obTime']       = [latest_ob[0], 's']
-        self.device_obs['pressure']     = [latest_ob[1], 'mb']
-        self.device_obs['outTemp']      = [latest_ob[2], 'c']
-        self.device_obs['humidity']     = [latest_ob[3], '%']
-        self.device_obs['strikeMinute'] = [latest_ob[4], 'count']
+        self.device_obs['obTime']       = obs_value(latest_ob[0], 's', latest_ob[0])
+        self.device_obs['pressure']     = obs_value(latest_ob[1], 'mb', latest_ob[0])
+        self.device_obs['outTemp']      = obs_value(latest_ob[2], 'c', latest_ob[0])
+        self.device_obs['humidity']     = obs_value(latest_ob[3], '%', latest_ob[0])
+        self.device_obs['strikeMinute'] = obs_value(latest_ob[4], 'count', latest_ob[0])
 
         # Extract lightning strike data from the latest outdoor AIR Websocket
         # JSON "Summary" object
         if 'summary' in message:
-            self.device_obs['strikeTime'] = [message['summary']['strike_last_epoch'] if 'strike_last_epoch' in message['summary'] else None, 's']
-            self.device_obs['strikeDist'] = [message['summary']['strike_last_dist']  if 'strike_last_dist'  in message['summary'] else None, 'km']
-            self.device_obs['strike3hr']  = [message['summary']['strike_count_3h']   if 'strike_count_3h'   in message['summary'] else None, 'count']
+            self.device_obs['strikeTime'] = obs_value(message['summary']['strike_last_epoch'] if 'strike_last_epoch' in message['summary'] else None, 's')
+            self.device_obs['strikeDist'] = obs_value(message['summary']['strike_last_dist']  if 'strike_last_dist'  in message['summary'] else None, 'km')
+            self.device_obs['strike3hr']  = obs_value(message['summary']['strike_count_3h']   if 'strike_count_3h'   in message['summary'] else None, 'count')
+
+        # Update 24 hour outdoor AIR observation buffer
+        self.update_obs_buffer(device_id, latest_ob, 8, config['Station']['OutAirID'], config)
 
         # Request required outdoor AIR data from the WeatherFlow API
         if int(config['System']['rest_api']) and config['Station']['OutAirID']:
-            self.api_data[device_id]['24Hrs'] = weatherflow_api.last_24h(api_device_id, latest_ob[0], config)
             if self.api_data[device_id]['flagAPI']:
                 if (self.derive_obs['SLPMin'][0] is None
                     or self.derive_obs['SLPMax'][0] is None
                     or self.derive_obs['outTempMin'][0] is None
                     or self.derive_obs['outTempMax'][0] is None
                     or self.derive_obs['strikeCount']['today'][0] is None):
-                    self.api_data[device_id]['today'] = weatherflow_api.today(api_device_id, config)
+                    self.api_data[device_id]['today'] = self.fetch_today(api_device_id, config)
                 if int(config['System']['stats_endpoint']):
                     if (self.derive_obs['strikeCount']['month'][0] is None
                         or self.derive_obs['strikeCount']['year'][0] is None):
                         self.api_data[device_id]['statistics'] = weatherflow_api.statistics(config['Station']['StationID'], config)
                 elif not int(config['System']['stats_endpoint']):
                     if self.derive_obs['strikeCount']['month'][0] is None:
-                        self.api_data[device_id]['month'] = weatherflow_api.month(api_device_id, config)
+                        self.api_data[device_id]['month'] = self.fetch_month(api_device_id, config)
                     if self.derive_obs['strikeCount']['year'][0] is None:
-                        self.api_data[device_id]['year']  = weatherflow_api.year(api_device_id, config)
+                        self.api_data[device_id]['year']  = self.fetch_year(api_device_id, config)
         self.flag_api[2] = 0
 
         # Store latest outdoor AIR JSON message
@@ -319,11 +374,15 @@ class obs_parser():
         else:
             return
 
-        # Extract indoor AIR device_id. Initialise API data dictionary
+        # Extract indoor AIR device_id. Messages from the configured device are
+        # keyed by its device ID, so that UDP and Websocket messages share
+        # the same observation buffer and API data. Initialise API data
+        # dictionary
         if 'device_id' in message:
             device_id = message['device_id']
         elif 'serial_number' in message:
             device_id = message['serial_number']
+        device_id = config['Station']['InAirID'] or device_id
         if int(config['System']['rest_api']) and config['Station']['InAirID']:
             api_device_id = config['Station']['InAirID']
             self.api_data[device_id] = {'flagAPI': self.flag_api[3]}
@@ -333,16 +392,19 @@ class obs_parser():
             if self.display_obs['obs_in_air']['obs'][0] == latest_ob[0]:
                 return
 
+        # Archive latest indoor AIR observation
+        self.archive_ob('obs', device_id, latest_ob)
+
         # Extract required observations from latest indoor AIR Websocket JSON
-        self.device_obs['obTime'] = [latest_ob[0], 's']
-        self.device_obs['inTemp'] = [latest_ob[2], 'c']
+        self.device_obs['obTime'] = obs_value(latest_ob[0], 's', latest_ob[0])
+        self.device_obs['inTemp'] = obs_value(latest_ob[2], 'c', latest_ob[0])
 
         # Request required indoor AIR data from the WeatherFlow API
         if int(config['System']['rest_api']) and config['Station']['InAirID']:
             if (self.api_data[device_id]['flagAPI']
                     or self.derive_obs['inTempMin'][0] is None
                     or self.derive_obs['inTempMax'][0] is None):
-                self.api_data[device_id]['today'] = weatherflow_api.today(api_device_id, config)
+                self.api_data[device_id]['today'] = self.fetch_today(api_device_id, config)
         self.flag_api[3] = 0
 
         # Store latest indoor AIR JSON message
@@ -367,27 +429,31 @@ class obs_parser():
         else:
             return
 
-        # Extract device ID
+        # Extract device ID, using the configured device ID if available
         if 'device_id' in message:
             device_id = message['device_id']
         elif 'serial_number' in message:
             device_id = message['serial_number']
+        device_id = config['Station']['TempestID'] or config['Station']['SkyID'] or device_id
 
         # Discard duplicate rapid_wind Websocket messages
         if 'rapid_wind' in self.display_obs:
             if self.display_obs['rapid_wind']['ob'][0] == latest_ob[0]:
                 return
 
+        # Archive latest rapid_wind observation
+        self.archive_ob('rapid_wind', device_id, latest_ob)
+
         # Extract required observations from latest rapid_wind Websocket JSON
-        self.device_obs['rapidWindSpd'] = [latest_ob[1], 'mps']
-        self.device_obs['rapidWindDir'] = [latest_ob[2], 'degrees']
+        self.device_obs['rapidWindSpd'] = obs_value(latest_ob[1], 'mps', latest_ob[0])
+        self.device_obs['rapidWindDir'] = obs_value(latest_ob[2], 'degrees', latest_ob[0])
 
         # Extract wind direction from previous rapid_wind Websocket JSON
         if 'rapid_wind' in self.device_obs:
             previous_ob = self.device_obs['rapid_wind']['ob']
-            rapidWindDirOld = [previous_ob[2], 'degrees']
+            rapidWindDirOld = obs_value(previous_ob[2], 'degrees', previous_ob[0])
         else:
-            rapidWindDirOld = [0, 'degrees']
+            rapidWindDirOld = obs_value(0, 'degrees')
 
         # If windspeed is zero, freeze direction at last direction of non-zero
         # wind speed and edit latest rapid_wind Websocket JSON message.
@@ -418,20 +484,24 @@ class obs_parser():
         else:
             return
 
-        # Extract device ID
+        # Extract device ID, using the configured device ID if available
         if 'device_id' in message:
             device_id = message['device_id']
         elif 'serial_number' in message:
             device_id = message['serial_number']
+        device_id = config['Station']['TempestID'] or config['Station']['OutAirID'] or device_id
 
         # Discard duplicate evt_strike Websocket messages
         if 'evt_strike' in self.display_obs:
             if self.display_obs['evt_strike']['evt'][0] == latest_evt[0]:
                 return
 
+        # Archive latest evt_strike event
+        self.archive_ob('evt_strike', device_id, latest_evt)
+
         # Extract required observations from latest evt_strike Websocket JSON
-        self.device_obs['strikeTime'] = [latest_evt[0], 's']
-        self.device_obs['strikeDist'] = [latest_evt[1], 'km']
+        self.device_obs['strikeTime'] = obs_value(latest_evt[0], 's', latest_evt[0])
+        self.device_obs['strikeDist'] = obs_value(latest_evt[1], 'km', latest_evt[0])
 
         # Store latest evt_strike JSON message
         self.display_obs['evt_strike'] = message
@@ -439,6 +509,138 @@ class obs_parser():
         # Calculate derived observations
         self.calc_derived_variables(device_id, config, 'evt_strike')
 
+    def update_obs_buffer(self, device_id, latest_ob, width, api_device_id, config):
+
+        """ Append latest observation to the 24 hour observation buffer for the
+        specified device. Seed the buffer from the WeatherFlow API the first
+        time it is used
+
+        INPUTS:
+            device_id           Configured device ID, or device ID from
+                                Websocket/UDP message
+            latest_ob           Latest observation from Websocket/UDP message
+            width               Number of observation fields to store
+            api_device_id       Device ID for WeatherFlow API requests
+            config              Console configuration object
+        """
+
+        # Create observation buffer for device if required
+        if device_id not in self.obs_buffer:
+            self.obs_buffer[device_id] = obs_buffer(width)
+        buffer = self.obs_buffer[device_id]
+
+        # Seed observation buffer with last 24 hours of data from the local
+        # archive, or from the WeatherFlow API if archive coverage is incomplete
+        if not buffer.seeded and self.archive is not None:
+            data_24hrs = self.archive.window(api_device_id or device_id, latest_ob[0] - 86400, latest_ob[0])
+            if data_24hrs is not None:
+                buffer.seed(data_24hrs.obs)
+        if not buffer.seeded and int(config['System']['rest_api']) and api_device_id:
+            data_24hrs = weatherflow_api.last_24h(api_device_id, latest_ob[0], config)
+            if weatherflow_api.verify_response(data_24hrs, 'obs'):
+                buffer.seed(data_24hrs.obs)
+
+        # Backfill daily aggregates and totals restored from the warm-start
+        # snapshot with observations missed since the snapshot
+        if buffer.seeded and device_id in self.backfill:
+            gap_start = self.backfill.pop(device_id)
+            snapshot.backfill(self, device_id, [ob for ob in buffer.rows() if gap_start < ob[0] < latest_ob[0]], config)
+
+        # Append latest observation to observation buffer
+        buffer.append(latest_ob)
+
+    def archive_ob(self, table, device_id, ob):
+
+        """ Queue observation for writing to the local archive
+
+        INPUTS:
+            table               Archive table: 'obs', 'rapid_wind' or 'evt_strike'
+            device_id           Device ID
+            ob                  Observation from Websocket/UDP message
+        """
+
+        if self.archive is not None:
+            self.archive.insert(table, device_id, ob)
+
+    def fetch_today(self, api_device_id, config):
+
+        """ Return observations from the current day. The local archive is
+        used when it has complete coverage of the day, otherwise the data is
+        downloaded from the WeatherFlow API
+
+        INPUTS:
+            api_device_id       Device ID for WeatherFlow API requests
+            config              Console configuration object
+
+        OUTPUT:
+            api_data            api_response object
+        """
+
+        if self.archive is not None:
+            api_data = self.archive.today(api_device_id, config)
+            if api_data is not None:
+                return api_data
+        return weatherflow_api.today(api_device_id, config)
+
+    def fetch_yesterday(self, api_device_id, config):
+
+        """ Return observations from yesterday. The local archive is used when
+        it has complete coverage of yesterday, otherwise the data is downloaded
+        from the WeatherFlow API
+
+        INPUTS:
+            api_device_id       Device ID for WeatherFlow API requests
+            config              Console configuration object
+
+        OUTPUT:
+            api_data            api_response object
+        """
+
+        if self.archive is not None:
+            api_data = self.archive.yesterday(api_device_id, config)
+            if api_data is not None:
+                return api_data
+        return weatherflow_api.yesterday(api_device_id, config)
+
+    def fetch_month(self, api_device_id, config):
+
+        """ Return daily summary data from the current month. Only days that
+        are not in the daily summary cache are downloaded from the WeatherFlow
+        API
+
+        INPUTS:
+            api_device_id       Device ID for WeatherFlow API requests
+            config              Console configuration object
+
+        OUTPUT:
+            api_data            api_response object
+        """
+
+        if self.daily_totals is not None:
+            api_data = self.daily_totals.month(api_device_id, config)
+            if api_data is not None:
+                return api_data
+        return weatherflow_api.month(api_device_id, config)
+
+    def fetch_year(self, api_device_id, config):
+
+        """ Return daily summary data from the current year. Only days that are
+        not in the daily summary cache are downloaded from the WeatherFlow API
+
+        INPUTS:
+            api_device_id       Device ID for WeatherFlow API requests
+            config              Console configuration object
+
+        OUTPUT:
+            api_data            api_response object
+        """
+
+        if self.daily_totals is not None:
+            api_data = self.daily_totals.year(api_device_id, config)
+            if api_data is not None:
+                return api_data
+        return weatherflow_api.year(api_device_id, config)
+
     def calc_derived_variables(self, device, config, device_type):
 
         """ Calculate derived variables from available device observations
@@ -449,178 +651,86 @@ class obs_parser():
             device_type         Device type
         """
 
-        # Derive variables from available obs_out_air and obs_st observations
-        # Derive variables from available obs_out_air and obs_st observations
-        if device_type in ('obs_out_air', 'obs_st'):
-            self.derive_obs['feelsLike']    = derive.feels_like(self.device_obs['outTemp'], self.device_obs['humidity'], self.device_obs['windSpd'], config)
-            self.derive_obs['dewPoint']     = derive.dew_point(self.device_obs['outTemp'],  self.device_obs['humidity'])
-            self.derive_obs['outTempDiff']  = derive.temp_diff(self.device_obs['outTemp'],  self.device_obs['obTime'], device, self.api_data, config)
-            self.derive_obs['outTempTrend'] = derive.temp_trend(self.device_obs['outTemp'], self.device_obs['obTime'], device, self.api_data, config)
-            self.derive_obs['outTempMax']   = derive.temp_max(self.device_obs['outTemp'],   self.device_obs['obTime'], self.derive_obs['outTempMax'],   device, self.api_data, config)
-            self.derive_obs['outTempMin']   = derive.temp_min(self.device_obs['outTemp'],   self.device_obs['obTime'], self.derive_obs['outTempMin'],   device, self.api_data, config)
-            self.derive_obs['SLP']          = derive.SLP(self.device_obs['pressure'],      device, config)
-            self.derive_obs['SLPTrend']     = derive.SLP_trend(self.device_obs['pressure'], self.device_obs['obTime'], device, self.api_data, config)
-            self.derive_obs['SLPMax']       = derive.SLP_max(self.device_obs['pressure'],   self.device_obs['obTime'], self.derive_obs['SLPMax'], device, self.api_data, config)
-            self.derive_obs['SLPMin']       = derive.SLP_min(self.device_obs['pressure'],   self.device_obs['obTime'], self.derive_obs['SLPMin'], device, self.api_data, config)
-            self.derive_obs['strikeCount']  = derive.strike_count(self.device_obs['strikeMinute'], self.derive_obs['strikeCount'], device, self.api_data, config)
-            self.derive_obs['strikeFreq']   = derive.strike_frequency(self.device_obs['obTime'],   device, self.api_data, config)
-            self.derive_obs['strikeDeltaT'] = derive.strike_delta_t(self.device_obs['strikeTime'], config)
-
-        # Derive variables from available obs_sky and obs_st observations
-        if device_type in ('obs_sky', 'obs_st'):
-            self.derive_obs['uvIndex']   = derive.uv_index(self.device_obs['uvIndex'])
-            self.derive_obs['peakSun']   = derive.peak_sun_hours(self.device_obs['radiation'],  self.derive_obs['peakSun'], device, self.api_data, config)
-            self.derive_obs['windSpd']   = derive.beaufort_scale(self.device_obs['windSpd'])
-            self.derive_obs['windDir']   = derive.cardinal_wind_dir(self.device_obs['windDir'], self.device_obs['windSpd'])
-            self.derive_obs['windAvg']   = derive.avg_wind_speed(self.device_obs['windSpd'],    self.derive_obs['windAvg'], device, self.api_data, config)
-            self.derive_obs['gustMax']   = derive.max_wind_gust(self.device_obs['windGust'],    self.derive_obs['gustMax'], device, self.api_data, config)
-            self.derive_obs['rainRate']  = derive.rain_rate(self.device_obs['minuteRain'])
-            self.derive_obs['rainAccum'] = derive.rain_accumulation(self.device_obs['minuteRain'], self.device_obs['dailyRain'], self.derive_obs['rainAccum'], device, self.api_data, config)
-
-        # Derive variables from available obs_out_air and obs_st observations
-        if device_type == 'obs_in_air':
-            self.derive_obs['inTempMax']   = derive.temp_max(self.device_obs['inTemp'], self.device_obs['obTime'], self.derive_obs['inTempMax'], device, self.api_data, config)
-            self.derive_obs['inTempMin']   = derive.temp_min(self.device_obs['inTemp'], self.device_obs['obTime'], self.derive_obs['inTempMin'], device, self.api_data, config)
-
-        # Derive variables from available rapid_wind observations
-        if device_type == 'rapid_wind':
-            self.derive_obs['rapidWindDir'] = derive.cardinal_wind_dir(self.device_obs['rapidWindDir'], self.device_obs['rapidWindSpd'])
-
-        # Derive variables from available evt_strike observations
-        if device_type == 'evt_strike':
-            self.derive_obs['strikeDeltaT'] = derive.strike_delta_t(self.device_obs['strikeTime'], config)
+        # Recalculate derived variables whose inputs have changed
+        changed = self.derived_graph.evaluate(self, device, config, device_type)
 
         # Format derived observations
-        self.format_derived_variables(config, device_type)
+        self.format_derived_variables(config, device_type, changed)
 
-    def format_derived_variables(self, config, device_type):
+        # Save warm-start snapshot
+        if time.time() - self.snapshot_time >= snapshot.INTERVAL:
+            self.save_snapshot(config)
 
-        """ Format derived variables from available device observations
+    def save_snapshot(self, config):
+
+        """ Save device and derived observations to the warm-start snapshot
+
+        INPUTS:
+            config              Console configuration object
+        """
+
+        self.snapshot_time = time.time()
+        if self.snapshot_file:
+            snapshot.save(self, self.snapshot_file, config)
+
+    def format_derived_variables(self, config, device_type, changed=None):
+
+        """ Format derived variables from available device observations. Only
+        display values whose source observation has changed are reformatted
 
         INPUTS:
             config              Console configuration object
             device_type         Device type
+            changed             Set of changed observation sources, or None to
+                                reformat all display values
         """
 
-        # Convert derived variable units from obs_out_air and obs_st observations
-        if device_type in ('obs_out_air', 'obs_st', 'obs_all'):
-            outTemp        = observation.units(self.device_obs['outTemp'],              config['Units']['Temp'])
-            feelsLike      = observation.units(self.derive_obs['feelsLike'],            config['Units']['Temp'])
-            dewPoint       = observation.units(self.derive_obs['dewPoint'],             config['Units']['Temp'])
-            outTempDiff    = observation.units(self.derive_obs['outTempDiff'],          config['Units']['Temp'])
-            outTempTrend   = observation.units(self.derive_obs['outTempTrend'],         config['Units']['Temp'])
-            outTempMax     = observation.units(self.derive_obs['outTempMax'],           config['Units']['Temp'])
-            outTempMin     = observation.units(self.derive_obs['outTempMin'],           config['Units']['Temp'])
-            humidity       = observation.units(self.device_obs['humidity'],             config['Units']['Other'])
-            SLP            = observation.units(self.derive_obs['SLP'],                  config['Units']['Pressure'])
-            SLPTrend       = observation.units(self.derive_obs['SLPTrend'],             config['Units']['Pressure'])
-            SLPMax         = observation.units(self.derive_obs['SLPMax'],               config['Units']['Pressure'])
-            SLPMin         = observation.units(self.derive_obs['SLPMin'],               config['Units']['Pressure'])
-            strikeDist     = observation.units(self.device_obs['strikeDist'],           config['Units']['Distance'])
-            strikeDeltaT   = observation.units(self.derive_obs['strikeDeltaT'],         config['Units']['Other'])
-            strikeFreq     = observation.units(self.derive_obs['strikeFreq'],           config['Units']['Other'])
-            strike3hr      = observation.units(self.device_obs['strike3hr'],            config['Units']['Other'])
-            strikeToday    = observation.units(self.derive_obs['strikeCount']['today'], config['Units']['Other'])
-            strikeMonth    = observation.units(self.derive_obs['strikeCount']['month'], config['Units']['Other'])
-            strikeYear     = observation.units(self.derive_obs['strikeCount']['year'],  config['Units']['Other'])
-
-        # Convert derived variable units from obs_sky and obs_st observations
-        if device_type in ('obs_sky', 'obs_st', 'obs_all'):
-            rainRate       = observation.units(self.derive_obs['rainRate'],               config['Units']['Precip'])
-            todayRain      = observation.units(self.derive_obs['rainAccum']['today'],     config['Units']['Precip'])
-            yesterdayRain  = observation.units(self.derive_obs['rainAccum']['yesterday'], config['Units']['Precip'])
-            monthRain      = observation.units(self.derive_obs['rainAccum']['month'],     config['Units']['Precip'])
-            yearRain       = observation.units(self.derive_obs['rainAccum']['year'],      config['Units']['Precip'])
-            radiation      = observation.units(self.device_obs['radiation'],              config['Units']['Other'])
-            uvIndex        = observation.units(self.derive_obs['uvIndex'],                config['Units']['Other'])
-            peakSun        = observation.units(self.derive_obs['peakSun'],                config['Units']['Other'])
-            windSpd        = observation.units(self.derive_obs['windSpd'],                config['Units']['Wind'])
-            windDir        = observation.units(self.derive_obs['windDir'],                config['Units']['Direction'])
-            windGust       = observation.units(self.device_obs['windGust'],               config['Units']['Wind'])
-            windAvg        = observation.units(self.derive_obs['windAvg'],                config['Units']['Wind'])
-            windMax        = observation.units(self.derive_obs['gustMax'],                config['Units']['Wind'])
-
-        # Convert derived variable units from obs_in_air observations
-        if device_type in ('obs_in_air',  'obs_all'):
-            inTemp         = observation.units(self.device_obs['inTemp'],    config['Units']['Temp'])
-            inTempMax      = observation.units(self.derive_obs['inTempMax'], config['Units']['Temp'])
-            inTempMin      = observation.units(self.derive_obs['inTempMin'], config['Units']['Temp'])
-
-        # Convert derived variable units from rapid_wind observations
-        if device_type in ('rapid_wind', 'obs_all'):
-            rapidWindSpd   = observation.units(self.device_obs['rapidWindSpd'], config['Units']['Wind'])
-            rapidWindDir   = observation.units(self.derive_obs['rapidWindDir'], 'degrees')
-
-        # Convert derived variable units from available evt_strike observations
-        if device_type in ('evt_strike', 'obs_all'):
-            strikeDist     = observation.units(self.device_obs['strikeDist'],   config['Units']['Distance'])
-            strikeDeltaT   = observation.units(self.derive_obs['strikeDeltaT'], config['Units']['Other'])
-
-        # Format derived variables from obs_air and obs_st observations
-        if device_type in ('obs_out_air', 'obs_st', 'obs_all'):
-            self.display_obs['outTemp']       = observation.format(outTemp,      'Temp')
-            self.display_obs['FeelsLike']     = observation.format(feelsLike,    'Temp')
-            self.display_obs['DewPoint']      = observation.format(dewPoint,     'Temp')
-            self.display_obs['outTempDiff']   = observation.format(outTempDiff,  'Temp')
-            self.display_obs['outTempTrend']  = observation.format(outTempTrend, 'Temp')
-            self.display_obs['outTempMax']    = observation.format(outTempMax,   ['Temp', 'Time'], config)
-            self.display_obs['outTempMin']    = observation.format(outTempMin,   ['Temp', 'Time'], config)
-            self.display_obs['Humidity']      = observation.format(humidity,     'Humidity')
-            self.display_obs['SLP']           = observation.format(SLP,          'Pressure')
-            self.display_obs['SLPTrend']      = observation.format(SLPTrend,     'Pressure')
-            self.display_obs['SLPMax']        = observation.format(SLPMax,       ['Pressure', 'Time'], config)
-            self.display_obs['SLPMin']        = observation.format(SLPMin,       ['Pressure', 'Time'], config)
-            self.display_obs['StrikeDist']    = observation.format(strikeDist,   'StrikeDistance')
-            self.display_obs['StrikeDeltaT']  = observation.format(strikeDeltaT, 'TimeDelta')
-            self.display_obs['StrikeFreq']    = observation.format(strikeFreq,   'StrikeFrequency')
-            self.display_obs['Strikes3hr']    = observation.format(strike3hr,    'StrikeCount')
-            self.display_obs['StrikesToday']  = observation.format(strikeToday,  'StrikeCount')
-            self.display_obs['StrikesMonth']  = observation.format(strikeMonth,  'StrikeCount')
-            self.display_obs['StrikesYear']   = observation.format(strikeYear,   'StrikeCount')
-
-        # Format derived variables from obs_sky and obs_st observations
-        if device_type in ('obs_sky', 'obs_st', 'obs_all'):
-            self.display_obs['Radiation']     = observation.format(radiation,     'Radiation')
-            self.display_obs['UVIndex']       = observation.format(uvIndex,       'UV')
-            self.display_obs['peakSun']       = observation.format(peakSun,       'peakSun')
-            self.display_obs['RainRate']      = observation.format(rainRate,      'Precip')
-            self.display_obs['TodayRain']     = observation.format(todayRain,     'Precip')
-            self.display_obs['YesterdayRain'] = observation.format(yesterdayRain, 'Precip')
-            self.display_obs['MonthRain']     = observation.format(monthRain,     'Precip')
-            self.display_obs['YearRain']      = observation.format(yearRain,      'Precip')
-            self.display_obs['WindSpd']       = observation.format(windSpd,       'Wind')
-            self.display_obs['WindGust']      = observation.format(windGust,      'Wind')
-            self.display_obs['AvgWind']       = observation.format(windAvg,       'Wind')
-            self.display_obs['MaxGust']       = observation.format(windMax,       'Wind')
-            self.display_obs['WindDir']       = observation.format(windDir,       'Direction')
-
-        # Format derived variables from obs_in_air observations
-        if device_type in ('obs_in_air', 'obs_all'):
-            self.display_obs['inTemp']        = observation.format(inTemp,    'Temp')
-            self.display_obs['inTempMax']     = observation.format(inTempMax, ['Temp', 'Time'], config)
-            self.display_obs['inTempMin']     = observation.format(inTempMin, ['Temp', 'Time'], config)
-
-        # Format derived variables from rapid_wind observations
-        if device_type in ('rapid_wind', 'obs_all'):
-            self.display_obs['rapidSpd']      = observation.format(rapidWindSpd, 'Wind')
-            self.display_obs['rapidDir']      = observation.format(rapidWindDir, 'Direction')
-
-        # Format derived variables from evt_strike observations
-        if device_type in ('evt_strike', 'obs_all'):
-            self.display_obs['StrikeDist']    = observation.format(strikeDist,   'StrikeDistance')
-            self.display_obs['StrikeDeltaT']  = observation.format(strikeDeltaT, 'TimeDelta')
+        # Convert units and format each display value whose source has changed
+        updated = []
+        for item in derived_graph.DISPLAY:
+            if device_type != 'obs_all' and device_type not in item.types:
+                continue
+            if changed is not None and item.source[:2] not in changed:
+                continue
+            value = getattr(self, item.source[0])[item.source[1]]
+            if len(item.source) > 2:
+                value = value[item.source[2]]
+            self.display_obs[item.key] = self.pipelines[item.key](value)
+            updated.append(item.key)
 
         # Update display with new variables
-        self.update_display(device_type)
+        self.update_display(device_type, updated)
+
+    def compile_pipelines(self, config):
+
+        """ Compile the unit conversion and formatting pipeline for each display
+        value from the current unit and display settings
+
+        INPUTS:
+            config              Console configuration object
+        """
+
+        self.pipelines = {item.key: observation.pipeline(config['Units'].get(item.units, item.units), item.format, config)
+                          for item in derived_graph.DISPLAY}
+
+    def wait_idle(self):
+
+        """ Wait for active parse jobs to finish. The wait is limited to
+        IDLE_TIMEOUT so that a slow parse job cannot freeze the display
+        """
+
+        if not self.app.connection_client.wait_idle(IDLE_TIMEOUT):
+            Logger.warning(f'obs_parser: {system().log_time()} - Parse jobs still active after {IDLE_TIMEOUT} s')
 
     def reformat_display(self):
 
         """ Reformat display when user changes settings
         """
 
-        # Wait for active threads to finish, then reformat display
-        while self.app.connection_client.activeThreads():
-            pass
+        # Wait for active threads to finish, then recompile pipelines and
+        # reformat display
+        self.wait_idle()
+        self.compile_pipelines(self.app.config)
         self.format_derived_variables(self.app.config, 'obs_all')
 
     def reset_display(self):
@@ -629,71 +739,67 @@ class obs_parser():
         """
 
         # Wait for active threads to finish, then reset display
-        while self.app.connection_client.activeThreads():
-            pass
+        self.wait_idle()
         self.display_obs = properties.Obs()
         self.device_obs  = device_obs.copy()
         self.derive_obs  = derive_obs.copy()
+        self.aggregates  = daily_aggregates.create(self.app.config)
+        self.derived_graph = derived_graph.derived_graph(self.app.config)
+        self.compile_pipelines(self.app.config)
         self.flag_api    = [1, 1, 1, 1]
         self.api_data    = {}
+        self.obs_buffer  = {}
+        self.backfill    = {}
         self.update_display('obs_reset')
 
-    @mainthread
-    def update_display(self, ob_type):
+    def update_display(self, ob_type, keys=None):
 
-        """ Update display with new variables derived from latest websocket
-        message
+        """ Post new variables derived from latest websocket message to the
+        display update bus, which applies them on the next frame
 
         INPUTS:
             ob_type             Latest Websocket message type
+            keys                List of display values that have changed, or
+                                None to update all display values
         """
 
-        # Update display values with new derived observations
-        reference_error = False
-        for key, value in list(self.display_obs.items()):
-            if not (ob_type == 'obs_all' and 'rapid' in key):
-                try:                                                            # Don't update rapidWind display when type is 'all'
-                    self.app.CurrentConditions.Obs[key] = value                 # as the RapidWind rose is not animated in this case
-                except ReferenceError:
-                    if not reference_error:
-                        Logger.warning(f'obs_parser: {system().log_time()} - Reference error {ob_type}')
-                        reference_error = True
-
-        # Update display graphics with new derived observations
+        # Define display values to update. The latest message is always updated
+        if keys is None:
+            items = list(self.display_obs.items())
+        else:
+            items = [(key, self.display_obs[key]) for key in keys + [ob_type] if key in self.display_obs]
+
+        # Post display values with new derived observations. Don't update
+        # rapidWind display when type is 'all' as the RapidWind rose is not
+        # animated in this case
+        bus = update_bus.get()
+        bus.post_dict('Obs', {key: value for key, value in items if not (ob_type == 'obs_all' and 'rapid' in key)})
+
+        # Post display graphics hooks for new derived observations
         if ob_type == 'rapid_wind':
-            if hasattr(self.app, 'WindSpeedPanel'):
-                for panel in getattr(self.app, 'WindSpeedPanel'):
-                    panel.animateWindRose()
+            bus.panel('WindSpeedPanel', 'animateWindRose')
         elif ob_type == 'evt_strike':
             if int(self.app.config['Display']['LightningPanel']):
-                for ii, button in enumerate(self.app.CurrentConditions.button_list):
-                    if "Lightning" in button[3] and button[4] == 'primary':
-                        self.app.CurrentConditions.switchPanel([], button)
-            if hasattr(self.app, 'LightningPanel'):
-                for panel in getattr(self.app, 'LightningPanel'):
-                    panel.setLightningBoltIcon()
-                    panel.animateLightningBoltIcon()
+                bus.hook(self.show_lightning_panel)
+            bus.panel('LightningPanel', 'setLightningBoltIcon')
+            bus.panel('LightningPanel', 'animateLightningBoltIcon')
         else:
             if ob_type in ['obs_st', 'obs_air', 'obs_all', 'obs_reset']:
-                if hasattr(self.app, 'TemperaturePanel'):
-                    for panel in getattr(self.app, 'TemperaturePanel'):
-                        panel.set_feels_like_icon()
-                if hasattr(self.app, 'LightningPanel'):
-                    for panel in getattr(self.app, 'LightningPanel'):
-                        panel.setLightningBoltIcon()
-                if hasattr(self.app, 'BarometerPanel'):
-                    for panel in getattr(self.app, 'BarometerPanel'):
-                        panel.setBarometerArrow()
+                bus.panel('TemperaturePanel', 'set_feels_like_icon')
+                bus.panel('LightningPanel',   'setLightningBoltIcon')
+                bus.panel('BarometerPanel',   'setBarometerArrow')
             if ob_type in ['obs_st', 'obs_sky', 'obs_all', 'obs_reset']:
-                if hasattr(self.app, 'WindSpeedPanel'):
-                    for panel in getattr(self.app, 'WindSpeedPanel'):
-                        panel.setWindIcons()
-                if hasattr(self.app, 'SunriseSunsetPanel'):
-                    for panel in getattr(self.app, 'SunriseSunsetPanel'):
-                        panel.setUVBackground()
-                if hasattr(self.app, 'RainfallPanel'):
-                    for panel in getattr(self.app, 'RainfallPanel'):
-                        panel.animate_rain_rate()
-                if hasattr(self.app, 'TemperaturePanel'):
-                    for panel in getattr(self.app, 'TemperaturePanel'):
-                        panel.set_feels_like_icon()
+                bus.panel('WindSpeedPanel',     'setWindIcons')
+                bus.panel('SunriseSunsetPanel', 'setUVBackground')
+                bus.panel('RainfallPanel',      'animate_rain_rate')
+                bus.panel('TemperaturePanel',   'set_feels_like_icon')
+
+    def show_lightning_panel(self):
+
+        """ Switch the primary Lightning panel into view after a lightning
+        strike
+        """
+
+        for button in self.app.CurrentConditions.button_list:
+            if "Lightning" in button[3] and button[4] == 'primary':
+                self.app.CurrentConditions.switchPanel([], button)
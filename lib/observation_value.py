@@ -0,0 +1,91 @@
+""" Defines the compact observation value used by the Raspberry Pi Python
+console for WeatherFlow Tempest and Smart Home Weather stations to store device
+observations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+# ==============================================================================
+# DEFINE 'obs_value' CLASS
+# ==============================================================================
+class obs_value():
+
+    """ Single device observation with an explicit value, unit, observation time
+    and auxiliary field. The observation also behaves as the legacy
+    [value, unit] list, so that it can be passed to functions that index,
+    slice or extend observation lists
+
+    INPUTS:
+        value               Observation value, or None if missing
+        unit                Observation unit
+        time                Optional observation time                     [s]
+        aux                 Optional auxiliary field
+    """
+
+    __slots__ = ('value', 'unit', 'time', 'aux')
+
+    def __init__(self, value, unit, time=None, aux=None):
+        self.value = value
+        self.unit  = unit
+        self.time  = time
+        self.aux   = aux
+
+    def list(self):
+
+        """ Return the legacy [value, unit] list
+        """
+
+        return [self.value, self.unit]
+
+    def __getitem__(self, index):
+        if index == 0 or index == -2:
+            return self.value
+        if index == 1 or index == -1:
+            return self.unit
+        if isinstance(index, slice):
+            return self.list()[index]
+        raise IndexError('obs_value index out of range')
+
+    def __len__(self):
+        return 2
+
+    def __iter__(self):
+        yield self.value
+        yield self.unit
+
+    def __add__(self, other):
+        return self.list() + list(other)
+
+    def __radd__(self, other):
+        return list(other) + self.list()
+
+    def __eq__(self, other):
+        if isinstance(other, obs_value):
+            return self.value == other.value and self.unit == other.unit
+        if isinstance(other, (list, tuple)):
+            return len(other) == 2 and self.value == other[0] and self.unit == other[1]
+        return NotImplemented
+
+    def __repr__(self):
+        return f'obs_value({self.value!r}, {self.unit!r})'
+
+
+def from_list(value):
+
+    """ Return a device observation from a legacy [value, unit] list, such as a
+    list restored from the warm-start snapshot
+    """
+
+    return value if isinstance(value, obs_value) else obs_value(value[0], value[1])
@@ -0,0 +1,283 @@
+""" Defines the parse executor that runs the observation parser for Websocket and
+UDP messages received by the Raspberry Pi Python console for WeatherFlow Tempest
+and Smart Home Weather stations.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib.system  import system
+
+# Import required Kivy modules
+from kivy.logger import Logger
+
+# Import required Python modules
+import collections
+import threading
+import time
+
+# Define default queue depth and overflow policy
+DEPTH  = 8
+POLICY = 'drop_oldest'
+
+
+# ==============================================================================
+# DEFINE 'parse_lane' CLASS
+# ==============================================================================
+class parse_lane():
+
+    """ Ordered, bounded queue of parse jobs for a single message type, served
+    by one long-lived worker thread
+
+    INPUTS:
+        name                Message type served by lane
+        depth               Maximum number of queued parse jobs
+        policy              Overflow policy: 'drop_oldest', 'drop_newest' or
+                            'coalesce'
+    """
+
+    def __init__(self, name, depth, policy):
+
+        # Define instance variables
+        self.name      = name
+        self.depth     = depth
+        self.policy    = policy
+        self.queue     = collections.deque()
+        self.condition = threading.Condition()
+        self.active    = False
+        self.running   = True
+
+        # Define lane counters
+        self.submitted     = 0
+        self.processed     = 0
+        self.dropped       = 0
+        self.coalesced     = 0
+        self.max_depth     = 0
+        self.latency       = 0.0
+        self.max_latency   = 0.0
+        self.total_latency = 0.0
+
+        # Start worker thread
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, target, args):
+
+        """ Add parse job to the lane, applying the overflow policy if the lane
+        is full
+
+        INPUTS:
+            target              Parse function
+            args                Tuple of arguments passed to parse function
+
+        OUTPUT:
+            accepted            True if parse job was queued
+        """
+
+        with self.condition:
+            self.submitted += 1
+            job = (target, args, time.monotonic())
+            if self.policy == 'coalesce' and self.queue:
+                self.queue[-1] = job
+                self.coalesced += 1
+            elif len(self.queue) >= self.depth:
+                self.dropped += 1
+                Logger.warning(f'parse_executor: {system().log_time()} - {self.name} queue full; message dropped')
+                if self.policy == 'drop_newest':
+                    return False
+                self.queue.popleft()
+                self.queue.append(job)
+            else:
+                self.queue.append(job)
+            self.max_depth = max(self.max_depth, len(self.queue))
+            self.condition.notify_all()
+            return True
+
+    def run(self):
+
+        """ Run queued parse jobs in order until the lane is stopped
+        """
+
+        while True:
+            with self.condition:
+                while self.running and not self.queue:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                target, args, queued_time = self.queue.popleft()
+                self.active = True
+            try:
+                target(*args)
+            except Exception as error:
+                Logger.error(f'parse_executor: {system().log_time()} - {self.name} error: {error}')
+            finally:
+                with self.condition:
+                    self.active         = False
+                    self.processed     += 1
+                    self.latency        = time.monotonic() - queued_time
+                    self.max_latency    = max(self.max_latency, self.latency)
+                    self.total_latency += self.latency
+                    self.condition.notify_all()
+
+    def busy(self):
+
+        """ Return True if the lane has queued or active parse jobs
+        """
+
+        with self.condition:
+            return self.active or bool(self.queue)
+
+    def wait_idle(self, timeout=None):
+
+        """ Block until the lane has no queued or active parse jobs
+
+        INPUTS:
+            timeout             Optional maximum time to wait                [s]
+
+        OUTPUT:
+            idle                True if the lane is idle
+        """
+
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.active and not self.queue, timeout)
+
+    def stop(self):
+
+        """ Stop the worker thread once the active parse job has finished.
+        Queued parse jobs are discarded
+        """
+
+        with self.condition:
+            self.running = False
+            self.queue.clear()
+            self.condition.notify_all()
+
+    def statistics(self):
+
+        """ Return lane counters
+
+        OUTPUT:
+            statistics          Dictionary of lane counters
+        """
+
+        with self.condition:
+            return {'depth':        len(self.queue),
+                    'max_depth':    self.max_depth,
+                    'submitted':    self.submitted,
+                    'processed':    self.processed,
+                    'dropped':      self.dropped,
+                    'coalesced':    self.coalesced,
+                    'latency':      self.latency,
+                    'max_latency':  self.max_latency,
+                    'mean_latency': self.total_latency / self.processed if self.processed else 0.0}
+
+
+# ==============================================================================
+# DEFINE 'parse_executor' CLASS
+# ==============================================================================
+class parse_executor():
+
+    """ Long-lived executor that runs the observation parser off the asyncio
+    event loop. Each message type has its own ordered lane so that a slow
+    parse of one message type does not delay the others
+
+    INPUTS:
+        config              Console configuration object
+    """
+
+    def __init__(self, config):
+
+        # Define queue depth and overflow policy from configuration
+        self.depth  = max(1, int(config['System'].get('ParseQueueDepth', DEPTH)))
+        self.policy = config['System'].get('ParseQueuePolicy', POLICY)
+        if self.policy not in ('drop_oldest', 'drop_newest', 'coalesce'):
+            self.policy = POLICY
+
+        # Define instance variables
+        self.lanes = {}
+        self.lock  = threading.Lock()
+
+    def submit(self, name, target, *args):
+
+        """ Submit parse job to the lane for the specified message type without
+        blocking
+
+        INPUTS:
+            name                Message type
+            target              Parse function
+            args                Arguments passed to parse function
+
+        OUTPUT:
+            accepted            True if parse job was queued
+        """
+
+        with self.lock:
+            if name not in self.lanes:
+                self.lanes[name] = parse_lane(name, self.depth, self.policy)
+            lane = self.lanes[name]
+        return lane.submit(target, args)
+
+    def busy(self):
+
+        """ Return True if any lane has queued or active parse jobs
+        """
+
+        with self.lock:
+            lanes = list(self.lanes.values())
+        return any(lane.busy() for lane in lanes)
+
+    def wait_idle(self, timeout=None):
+
+        """ Block until all lanes have no queued or active parse jobs. The
+        calling thread sleeps until each lane signals that it is idle
+
+        INPUTS:
+            timeout             Optional maximum time to wait for all lanes  [s]
+
+        OUTPUT:
+            idle                True if all lanes are idle
+        """
+
+        with self.lock:
+            lanes = list(self.lanes.values())
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for lane in lanes:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            if not lane.wait_idle(remaining):
+                return False
+        return True
+
+    def stop(self):
+
+        """ Stop all lanes
+        """
+
+        with self.lock:
+            lanes = list(self.lanes.values())
+            self.lanes = {}
+        for lane in lanes:
+            lane.stop()
+
+    def statistics(self):
+
+        """ Return queue depth and latency counters for each lane
+
+        OUTPUT:
+            statistics          Dictionary of lane counters keyed by message
+                                type
+        """
+
+        with self.lock:
+            lanes = dict(self.lanes)
+        return {name: lane.statistics() for name, lane in lanes.items()}
@@ -63,7 +63,7 @@ def Sager():
 
     """ Define the Sager property values """
 
-    return {'Forecast': '-', 'Issued': '-'}
+    return {'Forecast': '-', 'Issued': '-', 'Status': ''}
 
 
 def Status():
@@ -16,7 +16,7 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Import required modules
-import requests
+from lib.request_api import http_client
 
 
 def verify_response(Response, Field):
@@ -50,7 +50,7 @@ def verify_response(Response, Field):
             return False
 
 
-def METAR(Config):
+def METAR(Config, timeout=None):
 
     """ API Request for closest METAR report to station location using CheckWX
     API service
@@ -59,6 +59,7 @@ def METAR(Config):
         Device              Device type (AIR/SKY/TEMPEST)
         endTime             End time of three hour window as a UNIX timestamp
         Config              Station configuration
+        timeout             Optional request timeout overriding config  [s]
 
     OUTPUT:
         Response            API response containing latest three-hourly forecast
@@ -69,7 +70,7 @@ def METAR(Config):
     Template = 'https://api.checkwx.com/metar/lat/{}/lon/{}/radius/100/decoded/'
     URL = Template.format(Config['Station']['Latitude'], Config['Station']['Longitude'])
     try:
-        Data = requests.get(URL, headers=header, timeout=int(Config['System']['Timeout']))
+        Data = http_client.get(URL, Config, headers=header, timeout=timeout)
     except Exception:
         Data = None
 
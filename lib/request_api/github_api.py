@@ -16,7 +16,7 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Import required modules
-import requests
+from lib.request_api import http_client
 
 
 def verify_response(Response, Field):
@@ -68,7 +68,7 @@ def version(Config):
     Template = 'https://api.github.com/repos/{}/{}/releases/latest'
     URL = Template.format('peted-davis', 'WeatherFlow_PiConsole')
     try:
-        Data = requests.get(URL, headers=header, timeout=int(Config['System']['Timeout']))
+        Data = http_client.get(URL, Config, headers=header)
     except Exception:
         Data = None
 
@@ -0,0 +1,191 @@
+""" Defines the pooled HTTP client used by the Raspberry Pi Python console for
+WeatherFlow Tempest and Smart Home Weather stations to make all API requests.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required Kivy modules
+from kivy.clock         import Clock
+
+# Import required Python modules
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters  import HTTPAdapter
+import threading
+import requests
+
+# Define number of pooled keep-alive connections per host and number of
+# threads available for non-blocking requests
+POOL_SIZE = 4
+WORKERS   = 4
+
+# Define shared session and executor
+_session  = None
+_executor = None
+_lock     = threading.Lock()
+
+
+# ==============================================================================
+# DEFINE 'http_request' CLASS
+# ==============================================================================
+class http_request():
+
+    """ Result of a non-blocking HTTP request. Mirrors the attributes of the
+    Kivy UrlRequest object used by the success and failure callbacks
+
+    INPUTS:
+        url                 Requested URL
+    """
+
+    def __init__(self, url):
+        self.url         = url
+        self.resp_status = None
+        self.result      = None
+        self.error       = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.resp_status is not None and self.resp_status < 400
+
+
+def session():
+
+    """ Return the shared keep-alive HTTP session, creating it on first use
+
+    OUTPUT:
+        session             requests Session object
+    """
+
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter  = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            _session.mount('https://', adapter)
+            _session.mount('http://',  adapter)
+            _session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+    return _session
+
+
+def executor():
+
+    """ Return the shared thread pool used for non-blocking requests, creating
+    it on first use
+
+    OUTPUT:
+        executor            ThreadPoolExecutor object
+    """
+
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='http_client')
+    return _executor
+
+
+def request_timeout(config):
+
+    """ Return the request timeout defined in the station configuration
+
+    INPUTS:
+        config              Station configuration
+
+    OUTPUT:
+        timeout             Request timeout                             [s]
+    """
+
+    return int(config['System']['Timeout'])
+
+
+def get(url, config, headers=None, timeout=None):
+
+    """ Blocking GET request using the shared keep-alive session
+
+    INPUTS:
+        url                 Requested URL
+        config              Station configuration
+        headers             Optional dictionary of request headers
+        timeout             Optional request timeout overriding config  [s]
+
+    OUTPUT:
+        response            requests Response object
+    """
+
+    if timeout is None:
+        timeout = request_timeout(config)
+    return session().get(url, headers=headers, timeout=timeout)
+
+
+def request(url, config, on_success=None, on_failure=None, headers=None):
+
+    """ Non-blocking GET request using the shared keep-alive session. The
+    response is downloaded and decoded in a worker thread. If callbacks are
+    specified they are called in the Kivy main thread with the http_request
+    object and either the decoded response or the error
+
+    INPUTS:
+        url                 Requested URL
+        config              Station configuration
+        on_success          Optional callback for a successful request
+        on_failure          Optional callback for a failed request
+        headers             Optional dictionary of request headers
+
+    OUTPUT:
+        future              Future resolving to an http_request object
+    """
+
+    future = executor().submit(fetch, url, headers, request_timeout(config))
+    if on_success is not None or on_failure is not None:
+        future.add_done_callback(lambda future: Clock.schedule_once(lambda dt: dispatch(future, on_success, on_failure)))
+    return future
+
+
+def fetch(url, headers, timeout):
+
+    """ Download and decode the requested URL
+
+    INPUTS:
+        url                 Requested URL
+        headers             Dictionary of request headers
+        timeout             Request timeout                             [s]
+
+    OUTPUT:
+        request             http_request object
+    """
+
+    request = http_request(url)
+    try:
+        response = session().get(url, headers=headers, timeout=timeout)
+        request.resp_status = response.status_code
+        request.result = response.json()
+    except Exception as error:
+        request.error = error
+    return request
+
+
+def dispatch(future, on_success, on_failure):
+
+    """ Pass the result of a non-blocking request to the required callback
+
+    INPUTS:
+        future              Completed Future object
+        on_success          Callback for a successful request
+        on_failure          Callback for a failed request
+    """
+
+    request = future.result()
+    if request.ok:
+        if on_success is not None:
+            on_success(request, request.result)
+    elif on_failure is not None:
+        on_failure(request, request.error if request.error is not None else request.result)
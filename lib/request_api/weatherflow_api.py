@@ -16,17 +16,119 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Import required libray modules
-from lib.system  import system
+from lib.request_api import http_client
+from lib.system      import system
 
 # Import required Kivy modules
 from kivy.logger import Logger
 
 # Import required system modules
 from datetime    import datetime, timedelta
-import requests
+from itertools   import zip_longest
 import pytz
 
 
+# ==============================================================================
+# DEFINE 'api_response' CLASS
+# ==============================================================================
+class api_response():
+
+    """ Validated WeatherFlow API response. The JSON payload is decoded once
+    when the response is received, and any observation matrix is split into
+    one column per observation field
+
+    INPUTS:
+        response            Response object returned by the requests module
+    """
+
+    def __init__(self, response):
+
+        # Define instance variables
+        self.ok      = False
+        self.data    = None
+        self.obs     = None
+        self.columns = ()
+
+        # Decode JSON payload and confirm API status
+        if response is not None and response.ok:
+            try:
+                data = response.json()
+            except ValueError:
+                data = None
+            if isinstance(data, dict):
+                try:
+                    self.ok = 'SUCCESS' in data['status']['status_message']
+                except (KeyError, TypeError):
+                    self.ok = False
+                self.data = data
+
+        # Split observation matrix into observation field columns
+        if self.ok and isinstance(self.data.get('obs'), list):
+            self.obs = self.data['obs']
+            if self.obs and isinstance(self.obs[0], list):
+                self.columns = tuple(zip_longest(*self.obs))
+
+    @classmethod
+    def from_obs(cls, obs):
+
+        """ Create a response from observations held locally rather than
+        downloaded from the WeatherFlow API
+
+        INPUTS:
+            obs                 List of observations
+
+        OUTPUT:
+            api_data            api_response object
+        """
+
+        api_data      = cls(None)
+        api_data.ok   = True
+        api_data.data = {'status': {'status_code': 0, 'status_message': 'SUCCESS'}, 'obs': obs}
+        api_data.obs  = obs
+        if obs:
+            api_data.columns = tuple(zip_longest(*obs))
+        return api_data
+
+    def verify(self, field):
+
+        """ Verifies that the API response is valid and contains the required
+        field
+
+        INPUTS:
+            field               Field in API that is required to confirm validity
+
+        OUTPUT:
+            flag                True or False flag confirming validity of response
+        """
+
+        return self.ok and field in self.data and self.data[field] is not None
+
+    def column(self, index, start_time=None):
+
+        """ Return the time and value of each observation of a single field.
+        Missing values are removed
+
+        INPUTS:
+            index               Index of required observation field
+            start_time          Optional start time of required window     [s]
+
+        OUTPUT:
+            times               List of observation times                  [s]
+            values              List of observation values
+        """
+
+        if index >= len(self.columns):
+            return [], []
+        times  = []
+        values = []
+        for ob_time, value in zip(self.columns[0], self.columns[index]):
+            if value is None or (start_time is not None and ob_time < start_time):
+                continue
+            times.append(ob_time)
+            values.append(value)
+        return times, values
+
+
 def verify_response(api_data, field):
 
     """ Verifies the validity of the API response response
@@ -41,36 +143,21 @@ def verify_response(api_data, field):
     """
     if api_data is None:
         return False
-    if not api_data.ok:
-        return False
-    try:
-        api_data.json()
-    except ValueError:
-        return False
-    else:
-        api_data = api_data.json()
-        if isinstance(api_data, dict):
-            if 'SUCCESS' in api_data['status']['status_message'] and field in api_data and api_data[field] is not None:
-                return True
-            else:
-                return False
-        else:
-            return False
+    return api_data.verify(field)
 
 
 def statistics(station, config):
-    import json
     url_template = 'https://swd.weatherflow.com/swd/rest/stats/station/{}?token={}'
     URL = url_template.format(station, 
                               config['Keys']['WeatherFlow'])
     try:
-        api_data = requests.get(URL, timeout=int(config['System']['Timeout']))
+        api_data = api_response(http_client.get(URL, config))
     except Exception:
         api_data = None
 
     return api_data
 
-def last_6h(device, end_time, config):
+def last_6h(device, end_time, config, timeout=None):
 
     """ API Request for last six hours of data from a WeatherFlow Smart Home
     Weather Station device
@@ -79,6 +166,7 @@ def last_6h(device, end_time, config):
         device              Device ID
         end_time            End time of six hour window as a UNIX timestamp
         config              Station configuration
+        timeout             Optional request timeout overriding config  [s]
 
     OUTPUT:
         api_data            API response containing latest three-hourly forecast
@@ -94,7 +182,7 @@ def last_6h(device, end_time, config):
                               end_time, 
                               config['Keys']['WeatherFlow'])
     try:
-        api_data = requests.get(URL, timeout=int(config['System']['Timeout']))
+        api_data = api_response(http_client.get(URL, config, timeout=timeout))
     except Exception:
         api_data = None
 
@@ -131,7 +219,7 @@ def last_24h(device, end_time, config):
                               end_time, 
                               config['Keys']['WeatherFlow'])
     try:
-        api_data = requests.get(URL, timeout=int(config['System']['Timeout']))
+        api_data = api_response(http_client.get(URL, config))
     except Exception:
         api_data = None
 
@@ -176,7 +264,7 @@ def today(device, config):
                               end_time, 
                               config['Keys']['WeatherFlow'])
     try:
-        api_data = requests.get(URL, timeout=int(config['System']['Timeout']))
+        api_data = api_response(http_client.get(URL, config))
     except Exception:
         api_data = None
 
@@ -223,7 +311,7 @@ def yesterday(device, config):
                               end_time, 
                               config['Keys']['WeatherFlow'])
     try:
-        api_data = requests.get(URL, timeout=int(config['System']['Timeout']))
+        api_data = api_response(http_client.get(URL, config))
     except Exception:
         api_data = None
 
@@ -277,7 +365,7 @@ def month(device, config):
                               end_time, 
                               config['Keys']['WeatherFlow'])
     try:
-        api_data = requests.get(URL, timeout=int(config['System']['Timeout']))
+        api_data = api_response(http_client.get(URL, config))
     except Exception:
         api_data = None
 
@@ -331,7 +419,7 @@ def year(device, config):
                               end_time, 
                               config['Keys']['WeatherFlow'])
     try:
-        api_data = requests.get(URL, timeout=int(config['System']['Timeout']))
+        api_data = api_response(http_client.get(URL, config))
     except Exception:
         api_data = None
 
@@ -344,6 +432,41 @@ def year(device, config):
     return api_data
 
 
+def daily(device, start_time, end_time, config):
+
+    """ API Request for daily summary data between two times from a WeatherFlow
+        Smart Home Weather Station device
+
+    INPUTS:
+        device              Device ID
+        start_time          Start time of requested data                [s]
+        end_time            End time of requested data                  [s]
+        config              Station configuration
+
+    OUTPUT:
+        api_data            API response containing daily summary data
+    """
+
+    # Download WeatherFlow data
+    url_template = 'https://swd.weatherflow.com/swd/rest/observations/device/{}?bucket=e&time_start={}&time_end={}&token={}'
+    URL = url_template.format(device,
+                              int(start_time),
+                              int(end_time),
+                              config['Keys']['WeatherFlow'])
+    try:
+        api_data = api_response(http_client.get(URL, config))
+    except Exception:
+        api_data = None
+
+    # Verify response
+    if config['Keys']['WeatherFlow']:
+        if api_data is None or not verify_response(api_data, 'obs'):
+            Logger.warning(f'request_api: {system().log_time()} - Daily call failed')
+
+    # Return daily summary data
+    return api_data
+
+
 def station_meta_data(station, config):
 
     """ API Request for station meta data from a WeatherFlow Smart Home Weather
@@ -362,7 +485,7 @@ def station_meta_data(station, config):
     URL = url_template.format(station, 
                               config['Keys']['WeatherFlow'])
     try:
-        api_data = requests.get(URL, timeout=int(config['System']['Timeout']))
+        api_data = api_response(http_client.get(URL, config))
     except Exception:
         api_data = None
 
@@ -391,9 +514,8 @@ def forecast(config):
                               config['Station']['StationID'], 
                               config['Station']['Latitude'], 
                               config['Station']['Longitude'])
-    print(URL)
     try:
-        api_data = requests.get(URL, timeout=int(config['System']['Timeout']))
+        api_data = api_response(http_client.get(URL, config))
     except Exception:
         api_data = None
 
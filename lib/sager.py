@@ -25,6 +25,7 @@ from lib.request_api import weatherflow_api, checkwx_api
 from lib.system      import system
 from lib             import derived_variables as derive
 from lib             import properties
+from lib             import update_bus
 
 # Import required Kivy modules
 from kivy.logger import Logger
@@ -42,6 +43,11 @@ import pytz
 # Define global variables
 NaN = float('NaN')
 
+# Define the timeout of each forecast stage and the total time allowed to
+# generate a forecast as multiples of the configured API request timeout
+STAGE_TIMEOUT = {'last_6h': 1, 'metar': 0.5}
+JOB_TIMEOUT   = 2
+
 
 # Define circular mean
 def CircularMean(angles):
@@ -50,18 +56,82 @@ def CircularMean(angles):
     return np.angle(r, deg=True) % 360
 
 
+# ==============================================================================
+# DEFINE 'sager_job' CLASS
+# ==============================================================================
+class sager_job():
+
+    """ Single Sager Weathercaster forecast generation job. The job downloads
+    and reduces the observations required by the forecast in a background
+    thread, and holds its own copy of the forecast variables so that the
+    displayed forecast is only changed on the main thread. Each download stage
+    is limited to its own timeout and to the time remaining in the job
+
+    INPUTS:
+        config              Station configuration
+        issued              Forecast issue time label
+    """
+
+    def __init__(self, config, issued):
+
+        # Define instance variables
+        self.issued     = issued
+        self.sager_data = {'Lat': float(config['Station']['Latitude'])}
+        self.error      = None
+        self.cancelled  = threading.Event()
+        self.timeout    = int(config['System']['Timeout'])
+        self.deadline   = UNIX.monotonic() + JOB_TIMEOUT * self.timeout
+
+    def cancel(self):
+
+        """ Cancel the job. A download in progress is completed, but the job
+        stops before the next stage and its result is discarded
+        """
+
+        self.cancelled.set()
+
+    def stage_timeout(self, stage):
+
+        """ Return the timeout of the next forecast stage
+
+        INPUTS:
+            stage               Forecast stage name
+
+        OUTPUT:
+            timeout             Stage timeout, or None if the job has been
+                                cancelled or has no time remaining          [s]
+        """
+
+        remaining = self.deadline - UNIX.monotonic()
+        if self.cancelled.is_set() or remaining <= 0:
+            return None
+        return min(STAGE_TIMEOUT[stage] * self.timeout, remaining)
+
+    def fail(self, error):
+
+        """ Record the error message that replaces the forecast
+        """
+
+        self.error = '[color=f05e40ff]ERROR:[/color] ' + error
+
+
 class sager_forecast():
 
     def __init__(self):
         self.app = App.get_running_app()
         self.sager_data = properties.Sager()
-        self.device_obs = {}
+        self.job = None
 
     def reset_forecast(self):
 
         ''' Reset the Sager Weathercaster forecast when station ID changes
         '''
 
+        # Cancel any forecast being generated for the previous station
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+
         # Reset the Sager forecast and schedule new forecast to be generated
         self.sager_data = properties.Sager()
         self.update_display()
@@ -70,11 +140,90 @@ class sager_forecast():
     def fetch_forecast(self, dt):
 
         """ Generate new Sager Weathercaster forecast based on the current weather
-        conditions and the trend in conditions over the previous 6 hours
+        conditions and the trend in conditions over the previous 6 hours. The
+        forecast variables are generated in a background thread
+        """
+
+        # Get station timezone and time that the forecast was scheduled for
+        Tz  = pytz.timezone(self.app.config['Station']['Timezone'])
+        sched_time = getattr(self, 'sched_time', datetime.now(pytz.utc).astimezone(Tz))
+
+        # Set time format based on user configuration
+        if self.app.config['Display']['TimeFormat'] == '12 hr':
+            if self.app.config['System']['Hardware'] != 'Other':
+                time_format = '%-I:%M %P'
+            else:
+                time_format = '%I:%M %p'
+        else:
+            time_format = '%H:%M'
+
+        # If no TEMPEST or Sky/Air device combination are available forecast
+        # cannot be generated
+        if (not self.app.config['Station']['TempestID']
+                and not (self.app.config['Station']['SkyID'] and self.app.config['Station']['OutAirID'])):
+            self.sager_data['Forecast'] = '[color=f05e40ff]ERROR:[/color] No devices available to generate forecast'
+            self.sager_data['Issued']   = '-'
+            self.sager_data['Status']   = ''
+            self.update_display()
+            return
+
+        # Cancel any forecast that is still being generated and start new
+        # forecast generation job in a background thread
+        if self.job is not None:
+            self.job.cancel()
+        self.job = sager_job(self.app.config, sched_time.strftime(time_format))
+        threading.Thread(target=self.run_job, args=(self.job,), name='sager', daemon=True).start()
+
+        # Show that the forecast is being generated
+        self.sager_data['Status'] = 'Generating forecast…'
+        self.update_display()
+
+    def run_job(self, job):
+
+        """ Generate the forecast variables for a job in the background thread,
+        then pass the job to the main thread
+
+        INPUTS:
+            job                 sager_job object
+        """
+
+        try:
+            self.generate_forecast(job)
+        except Exception as error:
+            Logger.error(f'sager: {system().log_time()} - Unable to generate forecast: {error}')
+            job.fail('Forecast will be regenerated in 60 minutes')
+        Clock.schedule_once(lambda dt: self.deliver_forecast(job))
+
+    def deliver_forecast(self, job):
+
+        """ Derive and display the Sager Weathercaster forecast from a completed
+        job on the main thread, then schedule the next forecast. Results from
+        cancelled or superseded jobs are discarded
+
+        INPUTS:
+            job                 sager_job object
         """
 
-        # Initialise new thread task to generate Sager forecast
-        threading.Thread(target=self.generate_forecast(), daemon=True).start()
+        # Discard results from cancelled or superseded jobs
+        if job is not self.job or job.cancelled.is_set():
+            return
+        self.job = None
+        self.sager_data.update(job.sager_data)
+        self.sager_data['Status'] = ''
+
+        # Derive Sager Weathercaster forecast
+        if job.error is None:
+            self.get_dial_setting()
+            if self.sager_data['Dial'] is None:
+                job.fail('Forecast will be regenerated in 60 minutes')
+        if job.error is None:
+            self.get_forecast_text()
+            self.sager_data['Issued'] = job.issued
+            Clock.schedule_once(self.schedule_forecast)
+        else:
+            self.sager_data['Forecast'] = job.error
+            self.sager_data['Issued']   = job.issued
+            Clock.schedule_once(self.fail_forecast)
 
     def fail_forecast(self, dt):
 
@@ -121,44 +270,25 @@ class sager_forecast():
         self.app.Sched.sager.cancel()
         self.app.Sched.sager = Clock.schedule_once(self.fetch_forecast, secondsSched)
 
-    def generate_forecast(self):
+    def generate_forecast(self, job):
 
-        ''' Generates the Sager Weathercaster forecast based on the current weather
-        conditions and the trend in conditions over the previous 6 hours
+        ''' Generates the Sager Weathercaster forecast variables based on the
+        current weather conditions and the trend in conditions over the previous
+        6 hours. Runs in the background thread
 
         INPUTS:
-            sagerDict               Dictionary to hold the forecast information
+            job                     sager_job object
             app                     wfpiconsole App object
 
         OUTPUT:
-            sagerDict               Dictionary containing the Sager Weathercaster
-                                    forecast
+            job                     sager_job object containing the Sager
+                                    Weathercaster forecast variables, or the
+                                    error message
         '''
 
-        # Get station timezone, current UNIX timestamp in UTC and time that function
-        # was called
-        Tz  = pytz.timezone(self.app.config['Station']['Timezone'])
-        sched_time = getattr(self, 'sched_time', datetime.now(pytz.utc).astimezone(Tz))
-
-        # Define required station variables for the Sager Weathercaster Forecast
-        self.sager_data['Lat']   = float(self.app.config['Station']['Latitude'])
-
-        # Set time format based on user configuration
-        if self.app.config['Display']['TimeFormat'] == '12 hr':
-            if self.app.config['System']['Hardware'] != 'Other':
-                time_format = '%-I:%M %P'
-            else:
-                time_format = '%I:%M %p'
-        else:
-            time_format = '%H:%M'
-
-        # If no temperatureest or Sky/Air device combination are available forecast
-        # cannot be generated
-        if (not self.app.config['Station']['TempestID']
-                and not (self.app.config['Station']['SkyID'] and self.app.config['Station']['OutAirID'])):
-            self.sager_data['Forecast'] = '[color=f05e40ff]ERROR:[/color] No devices available to generate forecast'
-            self.sager_data['Issued']   = '-'
-            return
+        # Get station timezone and job forecast variables
+        Tz = pytz.timezone(self.app.config['Station']['Timezone'])
+        sager_data = job.sager_data
 
         # Get device ID of pressure sensor
         pres_device = self.app.config['Station']['TempestID'] or self.app.config['Station']['OutAirID']
@@ -166,216 +296,195 @@ class sager_forecast():
         # If applicable, download wind and rain data from last 6 hours from
         # TEMPEST module. If API call fails, return missing data error message
         if self.app.config['Station']['TempestID']:
-            self.device_obs = {}
-            self.get_tempest_data(int(UNIX.time()))
-            if not self.device_obs:
-                self.sager_data['Forecast'] = '[color=f05e40ff]ERROR:[/color] Missing TEMPEST data. Forecast will be regenerated in 60 minutes'
-                self.sager_data['Issued']   = sched_time.strftime(time_format)
-                Clock.schedule_once(self.fail_forecast)
-                return
+            timeout = job.stage_timeout('last_6h')
+            if timeout is None:
+                return job.fail('Forecast timed out. Forecast will be regenerated in 60 minutes')
+            device_obs = self.get_tempest_data(int(UNIX.time()), timeout)
+            if not device_obs:
+                return job.fail('Missing TEMPEST data. Forecast will be regenerated in 60 minutes')
 
         # If applicable, download wind and rain data from last 6 hours from SKY
         # module. If API call fails, return missing data error message
         elif self.app.config['Station']['SkyID']:
-            self.get_sky_data(int(UNIX.time()))
-            if not self.device_obs:
-                self.sager_data['Forecast'] = '[color=f05e40ff]ERROR:[/color] Missing SKY data. Forecast will be regenerated in 60 minutes'
-                self.sager_data['Issued']   = sched_time.strftime(time_format)
-                Clock.schedule_once(self.fail_forecast)
-                return
+            timeout = job.stage_timeout('last_6h')
+            if timeout is None:
+                return job.fail('Forecast timed out. Forecast will be regenerated in 60 minutes')
+            device_obs = self.get_sky_data(int(UNIX.time()), timeout)
+            if not device_obs:
+                return job.fail('Missing SKY data. Forecast will be regenerated in 60 minutes')
 
         # Convert wind and rain data to Numpy arrays, and convert wind speed to
         # miles per hour
-        self.device_obs['time']    = np.array(self.device_obs['time'],   dtype=np.int64)
-        self.device_obs['wind_speed'] = np.array(self.device_obs['wind_speed'], dtype=np.float64) * 2.23694
-        self.device_obs['wind_dir'] = np.array(self.device_obs['wind_dir'], dtype=np.float64)
-        self.device_obs['Rain']    = np.array(self.device_obs['Rain'],   dtype=np.float64)
+        device_obs['time']       = np.array(device_obs['time'],       dtype=np.int64)
+        device_obs['wind_speed'] = np.array(device_obs['wind_speed'], dtype=np.float64) * 2.23694
+        device_obs['wind_dir']   = np.array(device_obs['wind_dir'],   dtype=np.float64)
+        device_obs['Rain']       = np.array(device_obs['Rain'],       dtype=np.float64)
 
         # Define required wind direction variables for the Sager Weathercaster
         # Forecast
-        wind_dir_6h = self.device_obs['wind_dir'][:15]
-        wind_dir  = self.device_obs['wind_dir'][-15:]
+        wind_dir_6h = device_obs['wind_dir'][:15]
+        wind_dir    = device_obs['wind_dir'][-15:]
         if np.all(np.isnan(wind_dir_6h)) or np.all(np.isnan(wind_dir)):
-            self.sager_data['Forecast'] = '[color=f05e40ff]ERROR:[/color] Missing wind direction data. Forecast will be regenerated in 60 minutes'
-            self.sager_data['Issued']   = sched_time.strftime(time_format)
-            Clock.schedule_once(self.fail_forecast)
-            return
+            return job.fail('Missing wind direction data. Forecast will be regenerated in 60 minutes')
         else:
-            self.sager_data['wind_dir_6h'] = CircularMean(wind_dir_6h)
-            self.sager_data['wind_dir']    = CircularMean(wind_dir)
+            sager_data['wind_dir_6h'] = CircularMean(wind_dir_6h)
+            sager_data['wind_dir']    = CircularMean(wind_dir)
 
         # Define required wind speed variables for the Sager Weathercaster
         # Forecast
-        wind_speed_6h = self.device_obs['wind_speed'][:15]
-        wind_speed    = self.device_obs['wind_speed'][-15:]
+        wind_speed_6h = device_obs['wind_speed'][:15]
+        wind_speed    = device_obs['wind_speed'][-15:]
         if np.all(np.isnan(wind_speed_6h)) or np.all(np.isnan(wind_speed)):
-            self.sager_data['Forecast'] = '[color=f05e40ff]ERROR:[/color] Missing wind speed data. Forecast will be regenerated in 60 minutes'
-            self.sager_data['Issued']   = sched_time.strftime(time_format)
-            Clock.schedule_once(self.fail_forecast)
-            return
+            return job.fail('Missing wind speed data. Forecast will be regenerated in 60 minutes')
         else:
-            self.sager_data['wind_speed_6h'] = np.nanmean(wind_speed_6h)
-            self.sager_data['wind_speed']  = np.nanmean(wind_speed)
+            sager_data['wind_speed_6h'] = np.nanmean(wind_speed_6h)
+            sager_data['wind_speed']    = np.nanmean(wind_speed)
 
         # Define required rainfall variables for the Sager Weathercaster Forecast
-        last_rain = np.where(self.device_obs['Rain'] > 0)[0]
+        last_rain = np.where(device_obs['Rain'] > 0)[0]
         if last_rain.size == 0:
-            self.sager_data['last_rain'] = math.inf
+            sager_data['last_rain'] = math.inf
         else:
-            last_rain = self.device_obs['time'][last_rain.max()]
+            last_rain = device_obs['time'][last_rain.max()]
             last_rain = datetime.fromtimestamp(last_rain, Tz)
             last_rain = datetime.now(pytz.utc).astimezone(Tz) - last_rain
-            self.sager_data['last_rain'] = last_rain.total_seconds() / 60
+            sager_data['last_rain'] = last_rain.total_seconds() / 60
 
         # If applicable, download temperature and pressure from last 6 hours
         # from AIR module. If API call fails, return missing data error message
         if self.app.config['Station']['OutAirID']:
-            self.get_air_data(int(UNIX.time()))
-            if not self.device_obs:
-                self.sager_data['Forecast'] = '[color=f05e40ff]ERROR:[/color] Missing AIR data. Forecast will be regenerated in 60 minutes'
-                self.sager_data['Issued']   = sched_time.strftime(time_format)
-                Clock.schedule_once(self.fail_forecast)
-                return
+            timeout = job.stage_timeout('last_6h')
+            if timeout is None:
+                return job.fail('Forecast timed out. Forecast will be regenerated in 60 minutes')
+            device_obs = self.get_air_data(int(UNIX.time()), timeout)
+            if not device_obs:
+                return job.fail('Missing AIR data. Forecast will be regenerated in 60 minutes')
 
         # Convert temperature and pressure data to Numpy arrays
-        self.device_obs['time'] = np.array(self.device_obs['time'], dtype=np.int64)
-        self.device_obs['pressure'] = np.array(self.device_obs['pressure'], dtype=np.float64)
-        self.device_obs['temperature'] = np.array(self.device_obs['temperature'], dtype=np.float64)
+        device_obs['time']        = np.array(device_obs['time'],        dtype=np.int64)
+        device_obs['pressure']    = np.array(device_obs['pressure'],    dtype=np.float64)
+        device_obs['temperature'] = np.array(device_obs['temperature'], dtype=np.float64)
 
         # Define required pressure variables for the Sager Weathercaster
         # Forecast
-        pressure_6h = self.device_obs['pressure'][:15]
-        pressure    = self.device_obs['pressure'][-15:]
+        pressure_6h = device_obs['pressure'][:15]
+        pressure    = device_obs['pressure'][-15:]
         if np.all(np.isnan(pressure_6h)) or np.all(np.isnan(pressure)):
-            self.sager_data['Forecast'] = '[color=f05e40ff]ERROR:[/color] Missing pressure data. Forecast will be regenerated in 60 minutes'
-            self.sager_data['Issued']   = sched_time.strftime(time_format)
-            Clock.schedule_once(self.fail_forecast)
-            return
+            return job.fail('Missing pressure data. Forecast will be regenerated in 60 minutes')
         else:
-            self.sager_data['pressure_6h'] = derive.SLP([np.nanmean(pressure_6h).tolist(), 'mb'], pres_device, self.app.config)[0]
-            self.sager_data['pressure']  = derive.SLP([np.nanmean(pressure).tolist(), 'mb'],  pres_device, self.app.config)[0]
+            sager_data['pressure_6h'] = derive.SLP([np.nanmean(pressure_6h).tolist(), 'mb'], pres_device, self.app.config)[0]
+            sager_data['pressure']    = derive.SLP([np.nanmean(pressure).tolist(), 'mb'],    pres_device, self.app.config)[0]
 
         # Define required temperature variables for the Sager Weathercaster
         # Forecast
-        temperature = self.device_obs['temperature'][-15:]
+        temperature = device_obs['temperature'][-15:]
         if np.all(np.isnan(temperature)):
-            self.sager_data['Forecast'] = '[color=f05e40ff]ERROR:[/color] Missing temperature data. Forecast will be regenerated in 60 minutes'
-            self.sager_data['Issued']   = sched_time.strftime(time_format)
-            Clock.schedule_once(self.fail_forecast)
-            return
+            return job.fail('Missing temperature data. Forecast will be regenerated in 60 minutes')
         else:
-            self.sager_data['temperature'] = np.nanmean(temperature)
+            sager_data['temperature'] = np.nanmean(temperature)
 
         # Download closet METAR report to station location
-        data = checkwx_api.METAR(self.app.config)
+        timeout = job.stage_timeout('metar')
+        if timeout is None:
+            return job.fail('Forecast timed out. Forecast will be regenerated in 60 minutes')
+        data = checkwx_api.METAR(self.app.config, timeout)
         if checkwx_api.verify_response(data, 'data'):
             METAR_data = data.json()['data']
             for METAR in METAR_data:
                 if 'clouds' in METAR:
-                    self.sager_data['METAR'] = METAR['raw_text']
+                    sager_data['METAR'] = METAR['raw_text']
                     break
         else:
-            self.sager_data['Forecast'] = '[color=f05e40ff]ERROR:[/color] Missing METAR information. Forecast will be regenerated in 60 minutes'
-            self.sager_data['Issued']   = sched_time.strftime(time_format)
-            Clock.schedule_once(self.fail_forecast)
-            return
-
-        # Derive Sager Weathercaster forecast
-        self.get_dial_setting()
-        if self.sager_data['Dial'] is not None:
-            self.get_forecast_text()
-            self.sager_data['Issued']   = sched_time.strftime(time_format)
-            Clock.schedule_once(self.schedule_forecast)
-        else:
-            self.sager_data['Forecast'] = '[color=f05e40ff]ERROR:[/color] Forecast will be regenerated in 60 minutes'
-            self.sager_data['Issued']   = sched_time.strftime(time_format)
-            Clock.schedule_once(self.fail_forecast)
+            return job.fail('Missing METAR information. Forecast will be regenerated in 60 minutes')
 
     def update_display(self):
 
-        """ Update display with new Sager Forecast variables. Catch
-        ReferenceErrors to prevent console crashing
+        """ Post new Sager Forecast variables to the display update bus
         """
 
-        # Update display values with new derived observations
-        reference_error = False
-        for Key, Value in list(self.sager_data.items()):
-            try:
-                self.app.CurrentConditions.Sager[Key] = Value
-            except ReferenceError:
-                if not reference_error:
-                    Logger.warning(f'sager: {system().log_time()} - Reference error')
-                    reference_error = True
+        update_bus.get().post_dict('Sager', self.sager_data)
 
-    def get_tempest_data(self, Now):
+    def get_tempest_data(self, Now, timeout=None):
 
         ''' Fetch TEMPEST data required to generate the Sager Weathercaster
         forecast
 
         INPUTS:
-            Obs                     Dictionary to hold TEMPEST observations
             Now                     Current time as UNIX timestamp
+            timeout                 Optional request timeout                [s]
             Config                  Station configuration
+
+        OUTPUT:
+            device_obs              Dictionary holding TEMPEST observations
         '''
 
         # Download TEMPEST data from last 6 hours
-        data = weatherflow_api.last_6h(self.app.config['Station']['TempestID'], Now, self.app.config)
+        data = weatherflow_api.last_6h(self.app.config['Station']['TempestID'], Now, self.app.config, timeout)
 
         # Extract observation times, wind speed, wind direction, and rainfall if API
         # call has not failed
-        self.device_obs = {}
-        if weatherflow_api.verify_response(data, 'obs'):
-            self.device_obs['time']    = [item[0] if item[0]   is not None else NaN for item in data.json()['obs']]
-            self.device_obs['wind_speed'] = [item[2] if item[2]   is not None else NaN for item in data.json()['obs']]
-            self.device_obs['wind_dir'] = [item[4] if item[4]   is not None else NaN for item in data.json()['obs']]
-            self.device_obs['pressure']    = [item[6] if item[6]   is not None else NaN for item in data.json()['obs']]
-            self.device_obs['temperature']    = [item[7] if item[7]   is not None else NaN for item in data.json()['obs']]
-            self.device_obs['Rain']    = [item[12] if item[12] is not None else NaN for item in data.json()['obs']]
+        device_obs = {}
+        if weatherflow_api.verify_response(data, 'obs') and data.columns:
+            device_obs['time']        = [value if value is not None else NaN for value in data.columns[0]]
+            device_obs['wind_speed']  = [value if value is not None else NaN for value in data.columns[2]]
+            device_obs['wind_dir']    = [value if value is not None else NaN for value in data.columns[4]]
+            device_obs['pressure']    = [value if value is not None else NaN for value in data.columns[6]]
+            device_obs['temperature'] = [value if value is not None else NaN for value in data.columns[7]]
+            device_obs['Rain']        = [value if value is not None else NaN for value in data.columns[12]]
+        return device_obs
 
-    def get_sky_data(self, Now):
+    def get_sky_data(self, Now, timeout=None):
 
         ''' Fetch SKY data required to generate the Sager Weathercaster
         forecast
 
         INPUTS:
-            Obs                     Dictionary to hold TEMPEST observations
             Now                     Current time as UNIX timestamp
+            timeout                 Optional request timeout                [s]
             Config                  Station configuration
+
+        OUTPUT:
+            device_obs              Dictionary holding SKY observations
         '''
 
         # Download SKY data from last 6 hours
-        data = weatherflow_api.last_6h(self.app.config['Station']['SkyID'], Now, self.app.config)
+        data = weatherflow_api.last_6h(self.app.config['Station']['SkyID'], Now, self.app.config, timeout)
 
         # Extract observation times, wind speed, wind direction, and rainfall if API
         # call has not failed
-        self.device_obs = {}
-        if weatherflow_api.verify_response(data, 'obs'):
-            self.device_obs['time']    = [item[0] if item[0] is not None else NaN for item in data.json()['obs']]
-            self.device_obs['wind_speed'] = [item[5] if item[5] is not None else NaN for item in data.json()['obs']]
-            self.device_obs['wind_dir'] = [item[7] if item[7] is not None else NaN for item in data.json()['obs']]
-            self.device_obs['Rain']    = [item[3] if item[3] is not None else NaN for item in data.json()['obs']]
+        device_obs = {}
+        if weatherflow_api.verify_response(data, 'obs') and data.columns:
+            device_obs['time']       = [value if value is not None else NaN for value in data.columns[0]]
+            device_obs['wind_speed'] = [value if value is not None else NaN for value in data.columns[5]]
+            device_obs['wind_dir']   = [value if value is not None else NaN for value in data.columns[7]]
+            device_obs['Rain']       = [value if value is not None else NaN for value in data.columns[3]]
+        return device_obs
 
-    def get_air_data(self, Now):
+    def get_air_data(self, Now, timeout=None):
 
         ''' Fetch outdoor AIR data required to generate the Sager Weathercaster
         forecast
 
         INPUTS:
-            Obs                     Dictionary to hold TEMPEST observations
             Now                     Current time as UNIX timestamp
+            timeout                 Optional request timeout                [s]
             Config                  Station configuration
+
+        OUTPUT:
+            device_obs              Dictionary holding AIR observations
         '''
 
         # Download AIR data from last 6 hours and define AIR dictionary
-        data = weatherflow_api.last_6h(self.app.config['Station']['OutAirID'], Now, self.app.config)
+        data = weatherflow_api.last_6h(self.app.config['Station']['OutAirID'], Now, self.app.config, timeout)
 
         # Extract observation times, pressure and temperature if API # call has not
         # failed
-        self.device_obs = {}
-        if weatherflow_api.verify_response(data, 'obs'):
-            self.device_obs['time'] = [item[0] if item[0] is not None else NaN for item in data.json()['obs']]
-            self.device_obs['pressure'] = [item[1] if item[1] is not None else NaN for item in data.json()['obs']]
-            self.device_obs['temperature'] = [item[2] if item[2] is not None else NaN for item in data.json()['obs']]
+        device_obs = {}
+        if weatherflow_api.verify_response(data, 'obs') and data.columns:
+            device_obs['time']        = [value if value is not None else NaN for value in data.columns[0]]
+            device_obs['pressure']    = [value if value is not None else NaN for value in data.columns[1]]
+            device_obs['temperature'] = [value if value is not None else NaN for value in data.columns[2]]
+        return device_obs
 
     def get_dial_setting(self):
 
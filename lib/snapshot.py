@@ -0,0 +1,205 @@
+""" Defines the warm-start snapshot of observation parser state used by the
+Raspberry Pi Python console for WeatherFlow Tempest and Smart Home Weather
+stations to restore the display immediately after a restart.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib.observation_buffer import obs_buffer
+from lib                    import observation_value
+from lib                    import derived_arrays
+from lib.system             import system
+
+# Import required Kivy modules
+from kivy.logger            import Logger
+
+# Import required Python modules
+from datetime               import datetime
+import json
+import time
+import pytz
+import os
+
+# Define snapshot format version, interval between snapshots and maximum age
+# of a snapshot that can be restored                                        [s]
+VERSION  = 2
+INTERVAL = 300
+MAX_AGE  = 900
+
+# Define the index of each backfilled daily aggregate and accumulated total in
+# the observations of each configured device
+BACKFILL = {'TempestID': {'outTempMax': 7, 'outTempMin': 7, 'SLPMax': 6, 'SLPMin': 6, 'windAvg': 2,
+                          'gustMax': 3, 'peakSun': 11, 'rainAccum': 12, 'strikeCount': 15},
+            'SkyID':     {'windAvg': 5, 'gustMax': 6, 'peakSun': 10, 'rainAccum': 3},
+            'OutAirID':  {'outTempMax': 2, 'outTempMin': 2, 'SLPMax': 1, 'SLPMin': 1, 'strikeCount': 4}}
+
+
+def station_date(config):
+
+    """ Return the current date in the station timezone
+
+    INPUTS:
+        config              Console configuration object
+
+    OUTPUT:
+        date                Current date in station timezone as ISO string
+    """
+
+    Tz = pytz.timezone(config['Station']['Timezone'])
+    return datetime.now(pytz.utc).astimezone(Tz).date().isoformat()
+
+
+def save(parser, path, config):
+
+    """ Write observation parser state to the snapshot file. The snapshot is
+    written to a temporary file that atomically replaces the previous snapshot,
+    so that a crash never leaves a partially written snapshot
+
+    INPUTS:
+        parser              Observation parser object
+        path                Path to snapshot file
+        config              Console configuration object
+    """
+
+    snapshot = {'version':    VERSION,
+                'station':    config['Station']['StationID'],
+                'date':       station_date(config),
+                'time':       time.time(),
+                'device_obs': {key: value.list() if isinstance(value, observation_value.obs_value) else value
+                               for key, value in parser.device_obs.items()},
+                'derive_obs': dict(parser.derive_obs),
+                'aggregates': {key: aggregate.state() for key, aggregate in parser.aggregates.items()},
+                'obs_buffer': {str(device): {'width': buffer.width, 'rows': buffer.rows()}
+                               for device, buffer in list(parser.obs_buffer.items())}}
+    try:
+        with open(path + '.tmp', 'w') as snapshot_file:
+            json.dump(snapshot, snapshot_file, default=str)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(path + '.tmp', path)
+    except (OSError, TypeError, ValueError) as error:
+        Logger.warning(f'snapshot: {system().log_time()} - Unable to save snapshot: {error}')
+
+
+def load(parser, path, config):
+
+    """ Restore observation parser state from the snapshot file. The snapshot
+    is only restored if it is for the current station, was taken on the
+    current day in the station timezone and is no older than MAX_AGE.
+    Observations missed since the snapshot are backfilled into the daily
+    aggregates and totals once the observation buffer of each device is seeded
+
+    INPUTS:
+        parser              Observation parser object
+        path                Path to snapshot file
+        config              Console configuration object
+
+    OUTPUT:
+        restored            True if the snapshot was restored
+    """
+
+    # Read snapshot file
+    try:
+        with open(path) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+    except (OSError, ValueError):
+        return False
+
+    # Validate snapshot against current station, date and time
+    try:
+        if (snapshot['version'] != VERSION
+                or snapshot['station'] != config['Station']['StationID']
+                or snapshot['date'] != station_date(config)
+                or not 0 <= time.time() - snapshot['time'] <= MAX_AGE):
+            return False
+    except (KeyError, TypeError):
+        return False
+
+    # Restore device and derived observations and daily aggregates. Keys that
+    # are not in the current observation dictionaries are ignored
+    for key, value in snapshot['device_obs'].items():
+        if key in parser.device_obs:
+            parser.device_obs[key] = observation_value.from_list(value) if isinstance(parser.device_obs[key], observation_value.obs_value) else value
+    for key, value in snapshot['derive_obs'].items():
+        if key in parser.derive_obs:
+            parser.derive_obs[key] = value
+    for key, state in snapshot['aggregates'].items():
+        if key in parser.aggregates:
+            parser.aggregates[key].restore(state)
+
+    # Restore observation buffers. Buffers are left unseeded so that the gap
+    # since the latest buffered observation is backfilled
+    for device, buffer in snapshot['obs_buffer'].items():
+        parser.obs_buffer[device] = restored = obs_buffer(buffer['width'])
+        for ob in buffer['rows']:
+            restored.append(ob)
+        if len(restored):
+            parser.backfill[device] = restored.latest_time()
+    Tz = pytz.timezone(config['Station']['Timezone'])
+    Logger.info(f'snapshot: {system().log_time()} - Restored snapshot from {datetime.fromtimestamp(snapshot["time"], Tz).strftime("%H:%M:%S")}')
+    return True
+
+
+def backfill(parser, device, obs, config):
+
+    """ Backfill the daily aggregates and totals restored from the snapshot with
+    the observations from a device that were missed since the snapshot
+
+    INPUTS:
+        parser              Observation parser object
+        device              Configured device ID
+        obs                 List of missed observations in chronological order
+        config              Console configuration object
+    """
+
+    # Define index of backfilled observations for device
+    index = next((BACKFILL[key] for key in BACKFILL if config['Station'][key] == str(device)), {})
+    if not obs or not index:
+        return
+
+    # Update daily aggregates with missed observations. The aggregates ignore
+    # observations that are not newer than their last observation
+    for key, aggregate in parser.aggregates.items():
+        if key not in index:
+            continue
+        missed = [(ob[0], ob[index[key]]) for ob in obs if ob[index[key]] is not None]
+        if not missed:
+            continue
+        ob_time, value = (list(column) for column in zip(*missed))
+        if key in ('SLPMax', 'SLPMin'):
+            value = derived_arrays.SLP(value, device, config).tolist()
+        for item in zip(ob_time, value):
+            aggregate.update(*item)
+
+    # Add missed rain and lightning strikes from the current day to the
+    # accumulated totals. Today's rain is reported by Websocket messages
+    Tz = pytz.timezone(config['Station']['Timezone'])
+    today = [ob for ob in obs if datetime.fromtimestamp(ob[0], Tz).date().isoformat() == station_date(config)]
+    totals = {'strikeCount': ('today', 'month', 'year')}
+    if config['System']['Connection'] in ['UDP', 'Hybrid']:
+        totals['rainAccum'] = ('today', 'month', 'year')
+    for key, periods in totals.items():
+        if key not in index:
+            continue
+        missed = sum(ob[index[key]] for ob in today if ob[index[key]] is not None)
+        if not missed:
+            continue
+        accum = dict(parser.derive_obs[key])
+        for period in periods:
+            if accum[period][0] is not None:
+                accum[period] = [accum[period][0] + missed] + accum[period][1:]
+                if key == 'strikeCount' or period == 'today':
+                    accum[period][2] += missed
+        parser.derive_obs[key] = accum
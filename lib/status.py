@@ -16,22 +16,19 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Import required library modules
-from lib.system              import system
+from lib.request_api         import http_client
 from lib                     import properties
+from lib                     import update_bus
 
 # Import required Kivy modules
-from kivy.network.urlrequest import UrlRequest
 from kivy.uix.boxlayout      import BoxLayout
-from kivy.logger             import Logger
 from kivy.uix.widget         import Widget
 from kivy.app                import App
 
 # Import required Python modules
 from datetime                import datetime
-import certifi
 import time
 import math
-import pytz
 import re
 
 # Define global variables
@@ -67,12 +64,9 @@ class station(Widget):
 
         template = 'https://swd.weatherflow.com/swd/rest/stations/{}?token={}'
         URL = template.format(self.app.config['Station']['StationID'], self.app.config['Keys']['WeatherFlow'])
-        UrlRequest(URL,
-                   on_success=self.parse_device_firmware,
-                   on_failure=self.fail_device_firmware,
-                   on_error=self.fail_device_firmware,
-                   timeout=int(self.app.config['System']['Timeout']),
-                   ca_file=certifi.where())
+        http_client.request(URL, self.app.config,
+                            on_success=self.parse_device_firmware,
+                            on_failure=self.fail_device_firmware)
 
     def parse_device_firmware(self, request, response):
 
@@ -122,12 +116,9 @@ class station(Widget):
         if self.app.config['Station']['InAirID']:
             url_list.append(template.format(self.app.config['Station']['InAirID'],  start_time, end_time, self.app.config['Keys']['WeatherFlow']))
         for URL in url_list:
-            UrlRequest(URL,
-                       on_success=self.parse_observation_count,
-                       on_failure=self.fail_observation_count,
-                       on_error=self.fail_observation_count,
-                       timeout=int(self.app.config['System']['Timeout']),
-                       ca_file=certifi.where())
+            http_client.request(URL, self.app.config,
+                                on_success=self.parse_observation_count,
+                                on_failure=self.fail_observation_count)
 
     def parse_observation_count(self, request, response):
 
@@ -162,19 +153,45 @@ class station(Widget):
             self.status_data['in_air_ob_count'] = '[color=d73027ff]Error[/color]'
         self.update_display()
 
-    def get_device_status(self, dt):
+    def device_status_key(self, now):
+
+        """ Return a key of the inputs to the device status. The device status
+            only needs to be updated when the key changes: when the station
+            devices change, a new observation is received, the device firmware
+            changes, a device goes offline, or the minutes since an offline
+            device last reported change
+
+        INPUTS:
+            now                 Current time in station timezone
+        """
+
+        key = [self.status_data.get('tempest_firmware')]
+        key.extend(self.app.config['Station'][device] for device in ['TempestID', 'SkyID', 'OutAirID', 'InAirID'])
+        for ob_type in ['obs_st', 'obs_sky', 'obs_out_air', 'obs_in_air']:
+            if ob_type in self.app.CurrentConditions.Obs:
+                ob_time = self.app.CurrentConditions.Obs[ob_type]['obs'][0][0]
+                sample_time_diff = now.timestamp() - ob_time
+                key.append((ob_time, sample_time_diff < self.offline_timeout or math.floor(sample_time_diff / 60)))
+            else:
+                key.append(None)
+        return tuple(key)
+
+    def get_device_status(self, now):
 
         """ Gets the current status of the devices and hub associated with the
             Station ID
+
+        INPUTS:
+            now                 Current time in station timezone
         """
 
         # Define current station timezone
-        Tz = pytz.timezone(self.app.config['Station']['Timezone'])
+        Tz = now.tzinfo
 
         # Get TEMPEST device status
         if self.app.config['Station']['TempestID'] and 'obs_st' in self.app.CurrentConditions.Obs:
             latest_ob        = self.app.CurrentConditions.Obs['obs_st']['obs'][0]
-            sample_time_diff = time.time() - latest_ob[0]
+            sample_time_diff = now.timestamp() - latest_ob[0]
             device_voltage   = float(latest_ob[16])
             wind_interval    = float(latest_ob[5])
             if self.status_data['tempest_firmware'] is not None: 
@@ -229,7 +246,7 @@ class station(Widget):
         # Get SKY device status
         if self.app.config['Station']['SkyID'] and 'obs_sky' in self.app.CurrentConditions.Obs:
             latest_ob        = self.app.CurrentConditions.Obs['obs_sky']['obs'][0]
-            sample_time_diff = time.time() - latest_ob[0]
+            sample_time_diff = now.timestamp() - latest_ob[0]
             device_voltage   = float(latest_ob[8])
             if sample_time_diff < self.offline_timeout and device_voltage > 2.0:
                 device_status = '[color=9aba2fff]Online[/color]'
@@ -254,7 +271,7 @@ class station(Widget):
         # Get outdoor AIR device status
         if self.app.config['Station']['OutAirID'] and 'obs_out_air' in self.app.CurrentConditions.Obs:
             latest_ob        = self.app.CurrentConditions.Obs['obs_out_air']['obs'][0]
-            sample_time_diff = time.time() - latest_ob[0]
+            sample_time_diff = now.timestamp() - latest_ob[0]
             device_voltage   = float(latest_ob[6])
             if sample_time_diff < self.offline_timeout and device_voltage > 1.9:
                 device_status = '[color=9aba2fff]Online[/color]'
@@ -279,7 +296,7 @@ class station(Widget):
         # Get indoor AIR device status
         if self.app.config['Station']['InAirID'] and 'obs_in_air' in self.app.CurrentConditions.Obs:
             latest_ob        = self.app.CurrentConditions.Obs['obs_in_air']['obs'][0]
-            sample_time_diff = time.time() - latest_ob[0]
+            sample_time_diff = now.timestamp() - latest_ob[0]
             device_voltage   = float(latest_ob[6])
             if sample_time_diff < self.offline_timeout and device_voltage > 1.9:
                 device_status = '[color=9aba2fff]Online[/color]'
@@ -327,19 +344,10 @@ class station(Widget):
 
     def update_display(self):
 
-        """ Update display with new Status variables. Catch ReferenceErrors to
-        prevent console crashing
+        """ Post new Status variables to the display update bus
         """
 
-        # Update display values with new derived observations
-        reference_error = False
-        for Key, Value in list(self.status_data.items()):
-            try:
-                self.app.CurrentConditions.Status[Key] = Value
-            except ReferenceError:
-                if not reference_error:
-                    Logger.warning(f'status: {system().log_time()} - Reference error')
-                    reference_error = True
+        update_bus.get().post_dict('Status', self.status_data)
 
 
 # ==============================================================================
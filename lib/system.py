@@ -18,6 +18,7 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 # Import required library modules
 from lib.request_api import github_api
 from lib             import properties
+from lib             import update_bus
 
 # Import required panels
 from panels.update  import update_notification
@@ -44,9 +45,12 @@ class system():
         self.system_data = properties.System()
         self.app = App.get_running_app()
 
-    def realtimeClock(self, dt):
+    def realtimeClock(self, now):
 
         """ Format Realtime clock and date in station timezone
+
+        INPUTS:
+            now                 Current time in station timezone
         """
 
         # Define time and date format based on user settings
@@ -68,12 +72,9 @@ class system():
                 else:
                     DateFormat = '%a, %d %b %Y'
 
-                # Get station time zone
-                Tz = pytz.timezone(self.app.config['Station']['Timezone'])
-
                 # Format realtime Clock
-                self.system_data['Time'] = datetime.fromtimestamp(time.time(), Tz).strftime(TimeFormat)
-                self.system_data['Date'] = datetime.fromtimestamp(time.time(), Tz).strftime(DateFormat)
+                self.system_data['Time'] = now.strftime(TimeFormat)
+                self.system_data['Date'] = now.strftime(DateFormat)
                 self.update_display()
 
     def check_version(self, dt):
@@ -129,16 +130,7 @@ class system():
 
     def update_display(self):
 
-        """ Update display with new System variables. Catch ReferenceErrors to
-        prevent console crashing
+        """ Post new System variables to the display update bus
         """
 
-        # Update display values with new derived observations
-        reference_error = False
-        for Key, Value in list(self.system_data.items()):
-            try:
-                self.app.CurrentConditions.System[Key] = Value
-            except ReferenceError:
-                if not reference_error:
-                    Logger.warning(f'System: {self.log_time()} - Reference error')
-                    reference_error = True
+        update_bus.get().post_dict('System', self.system_data)
@@ -0,0 +1,173 @@
+""" Defines the tick scheduler used by the Raspberry Pi Python console for
+WeatherFlow Tempest and Smart Home Weather stations to run periodic display
+tasks from a single clock tick.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required Kivy modules
+from kivy.clock import Clock
+
+# Import required Python modules
+from datetime   import datetime
+import time
+import pytz
+
+# Define shared tick scheduler
+_scheduler = None
+
+# Define offset of each tick after the start of the second, so that a tick
+# fired slightly early by the Kivy clock still falls in the correct second  [s]
+OFFSET = 0.01
+
+
+# ==============================================================================
+# DEFINE 'tick_task' CLASS
+# ==============================================================================
+class tick_task():
+
+    """ Periodic task run by the tick scheduler. The task runs once in each
+    cadence-length slot of UNIX time, so that a 60 second task runs on each
+    minute boundary. If a key function is given, the task is skipped when its
+    key is unchanged since the task last ran
+
+    INPUTS:
+        callback            Function called with the current station time
+        cadence             Task cadence                                      [s]
+        key                 Optional function returning a key of the task
+                            inputs for the current station time
+    """
+
+    def __init__(self, callback, cadence, key=None):
+        self.callback = callback
+        self.cadence  = cadence
+        self.key      = key
+        self.slot     = None
+        self.last_key = None
+
+    def force(self):
+
+        """ Run the task on the next tick regardless of its cadence and key
+        """
+
+        self.slot     = None
+        self.last_key = None
+
+
+# ==============================================================================
+# DEFINE 'tick_scheduler' CLASS
+# ==============================================================================
+class tick_scheduler():
+
+    """ Single 1 Hz tick aligned to the start of each second. The current time
+    in the station timezone is calculated once per tick and passed to each task
+    that is due
+
+    INPUTS:
+        config              Station configuration
+    """
+
+    def __init__(self, config):
+        self.config   = config
+        self.timezone = None
+        self.Tz       = None
+        self.tasks    = {}
+        self.ran      = 0
+        self.skipped  = 0
+        self.event    = Clock.schedule_once(self.tick, 1 - time.time() % 1 + OFFSET)
+
+    def add(self, name, callback, cadence=1, key=None):
+
+        """ Add a task to the scheduler, replacing any task with the same name.
+        The task runs on the next tick
+
+        INPUTS:
+            name                Task name
+            callback            Function called with the current station time
+            cadence             Task cadence                                  [s]
+            key                 Optional function returning a key of the task
+                                inputs for the current station time
+
+        OUTPUT:
+            task                tick_task object
+        """
+
+        self.tasks[name] = tick_task(callback, cadence, key)
+        return self.tasks[name]
+
+    def remove(self, name):
+
+        """ Remove a task from the scheduler
+        """
+
+        self.tasks.pop(name, None)
+
+    def force(self, name):
+
+        """ Run the named task on the next tick
+        """
+
+        if name in self.tasks:
+            self.tasks[name].force()
+
+    def now(self):
+
+        """ Return the current time in the station timezone. The station
+        timezone is only resolved again when it is changed in the configuration
+        """
+
+        if self.config['Station']['Timezone'] != self.timezone:
+            self.timezone = self.config['Station']['Timezone']
+            self.Tz       = pytz.timezone(self.timezone)
+        return datetime.now(self.Tz)
+
+    def tick(self, *largs):
+
+        """ Run each task that is due, then schedule the next tick for the
+        start of the next second
+        """
+
+        now     = self.now()
+        seconds = int(now.timestamp())
+        for task in list(self.tasks.values()):
+            slot = seconds // task.cadence
+            if slot == task.slot:
+                continue
+            task.slot = slot
+            if task.key is not None:
+                key = task.key(now)
+                if key == task.last_key:
+                    self.skipped += 1
+                    continue
+                task.last_key = key
+            self.ran += 1
+            task.callback(now)
+        self.event = Clock.schedule_once(self.tick, 1 - time.time() % 1 + OFFSET)
+
+
+def get(config):
+
+    """ Return the shared tick scheduler
+
+    INPUTS:
+        config              Station configuration
+
+    OUTPUT:
+        scheduler           tick_scheduler object
+    """
+
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = tick_scheduler(config)
+    return _scheduler
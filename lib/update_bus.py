@@ -0,0 +1,181 @@
+""" Defines the frame-aligned display update bus used by the Raspberry Pi Python
+console for WeatherFlow Tempest and Smart Home Weather stations to apply new
+display values on the Kivy main thread.
+Copyright (C) 2018-2025 Peter Davis
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the GNU General Public License as published by the Free Software
+Foundation, either version 3 of the License, or (at your option) any later
+version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with
+this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Import required library modules
+from lib         import system
+
+# Import required Kivy modules
+from kivy.logger import Logger
+from kivy.clock  import Clock
+from kivy.app    import App
+
+# Import required Python modules
+import threading
+
+# Define shared update bus
+_bus  = None
+_lock = threading.Lock()
+
+# Define display value types that cannot be changed in place
+IMMUTABLE = (str, int, float, bool, tuple, type(None))
+
+
+# ==============================================================================
+# DEFINE 'update_bus' CLASS
+# ==============================================================================
+class update_bus():
+
+    """ Frame-aligned bus of display updates. Producers on any thread post
+    (namespace, key, value) updates and panel hooks. A single Clock trigger
+    applies all pending updates to the CurrentConditions screen once per frame,
+    then calls each pending hook once. Later updates to the same key replace
+    earlier updates that have not yet been applied, and values that are
+    unchanged since they were last applied are suppressed. Lists and
+    dictionaries that are re-posted after being changed in place are always
+    applied
+    """
+
+    def __init__(self):
+
+        # Define instance variables
+        self.lock       = threading.Lock()
+        self.updates    = {}
+        self.hooks      = {}
+        self.applied    = {}
+        self.suppressed = 0
+        self.coalesced  = 0
+        self.trigger    = Clock.create_trigger(self.apply)
+
+    def post(self, namespace, key, value):
+
+        """ Post a display value update
+
+        INPUTS:
+            namespace           CurrentConditions dictionary property name
+            key                 Display value key
+            value               New display value
+        """
+
+        with self.lock:
+            if (namespace, key) in self.updates:
+                self.coalesced += 1
+            self.updates[(namespace, key)] = value
+        self.trigger()
+
+    def post_dict(self, namespace, values):
+
+        """ Post updates for every display value in a dictionary
+
+        INPUTS:
+            namespace           CurrentConditions dictionary property name
+            values              Dictionary of display values
+        """
+
+        with self.lock:
+            for key, value in list(values.items()):
+                if (namespace, key) in self.updates:
+                    self.coalesced += 1
+                self.updates[(namespace, key)] = value
+        self.trigger()
+
+    def hook(self, callback, *args):
+
+        """ Post a hook to be called once after the pending display values have
+        been applied
+
+        INPUTS:
+            callback            Function to call on the main thread
+            args                Arguments passed to callback
+        """
+
+        with self.lock:
+            self.hooks[(callback,) + args] = None
+        self.trigger()
+
+    def panel(self, name, method):
+
+        """ Post a hook that calls the named method of every panel of the named
+        type once the pending display values have been applied
+
+        INPUTS:
+            name                App attribute holding the list of panels
+            method              Panel method to call
+        """
+
+        self.hook(self.call_panels, name, method)
+
+    def call_panels(self, name, method):
+
+        """ Call the named method of every panel of the named type
+        """
+
+        app = App.get_running_app()
+        if hasattr(app, name):
+            for panel in getattr(app, name):
+                getattr(panel, method)()
+
+    def apply(self, *largs):
+
+        """ Apply all pending display values and call all pending hooks on the
+        main thread. Catch ReferenceErrors to prevent console crashing
+        """
+
+        # Swap pending updates and hooks
+        with self.lock:
+            updates, self.updates = self.updates, {}
+            hooks,   self.hooks   = self.hooks,   {}
+
+        # Apply display values that have changed since they were last applied
+        app = App.get_running_app()
+        reference_error = False
+        suppressed = 0
+        for (namespace, key), value in updates.items():
+            if (namespace, key) in self.applied:
+                previous = self.applied[(namespace, key)]
+                if (previous is not value or isinstance(value, IMMUTABLE)) and previous == value:
+                    suppressed += 1
+                    continue
+            try:
+                getattr(app.CurrentConditions, namespace)[key] = value
+                self.applied[(namespace, key)] = value
+            except ReferenceError:
+                if not reference_error:
+                    Logger.warning(f'update_bus: {system.system().log_time()} - Reference error {namespace}')
+                    reference_error = True
+        self.suppressed += suppressed
+        if suppressed:
+            Logger.debug(f'update_bus: {system.system().log_time()} - Suppressed {suppressed} unchanged display updates')
+
+        # Call each pending hook once
+        for callback, *args in hooks:
+            callback(*args)
+
+
+def get():
+
+    """ Return the shared update bus
+
+    OUTPUT:
+        bus                 update_bus object
+    """
+
+    global _bus
+    with _lock:
+        if _bus is None:
+            _bus = update_bus()
+        return _bus
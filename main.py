@@ -128,6 +128,7 @@ from lib.status       import station
 from lib              import settings     as userSettings
 from lib              import properties
 from lib              import config
+from lib              import tick_scheduler
 
 # ==============================================================================
 # IMPORT REQUIRED PANELS
@@ -207,7 +208,7 @@ class wfpiconsole(App):
         self.settings_cls = SettingsWithSidebar
 
         # Initialise realtime clock
-        self.Sched.realtimeClock = Clock.schedule_interval(self.system.realtimeClock, 1.0)
+        tick_scheduler.get(self.config).add('realtimeClock', self.system.realtimeClock)
 
         # Return ScreenManager
         return self.screenManager
@@ -385,9 +386,9 @@ class wfpiconsole(App):
         if section == 'System' and key == 'SagerInterval':
             Clock.schedule_once(self.sager.schedule_forecast)
 
-        # Force rest_api services if Websocket connection is selected
-        if ((section == 'System' and key == 'Connection' and value == 'Websocket')
-                or (section == 'System' and key == 'rest_api' and self.config['System']['Connection'] == 'Websocket')):
+        # Force rest_api services if Websocket or Hybrid connection is selected
+        if ((section == 'System' and key == 'Connection' and value in ['Websocket', 'Hybrid'])
+                or (section == 'System' and key == 'rest_api' and self.config['System']['Connection'] in ['Websocket', 'Hybrid'])):
             if self.config['System']['rest_api'] == '0':
                 self.config.set('System', 'rest_api', '1')
                 self.config.write()
@@ -410,7 +411,7 @@ class wfpiconsole(App):
         if hasattr(self, 'obsParser'):
             self.obsParser.reformat_display()
 
-    # START WEBSOCKET OR UDP SERVICE
+    # START WEBSOCKET, UDP OR HYBRID SERVICE
     # --------------------------------------------------------------------------
     def start_connection_service(self, *largs):
         self.connection_thread = None
@@ -424,6 +425,11 @@ class wfpiconsole(App):
                                                       args=['service/udp.py'],
                                                       kwargs={'run_name': '__main__'},
                                                       name='UDP')
+        elif self.config['System']['Connection'] == 'Hybrid':
+            self.connection_thread = threading.Thread(target=run_path,
+                                                      args=['service/hybrid.py'],
+                                                      kwargs={'run_name': '__main__'},
+                                                      name='Hybrid')
         if self.connection_thread is not None:
             self.connection_thread.start()
 
@@ -431,7 +437,7 @@ class wfpiconsole(App):
     # --------------------------------------------------------------------------
     def stop_connection_service(self):
         if hasattr(self, 'connection_client'):
-            self.connection_client._keep_running = False
+            self.connection_client.stop()
 
     # EXIT CONSOLE AND SHUTDOWN SYSTEM
     # --------------------------------------------------------------------------
@@ -481,18 +487,21 @@ class CurrentConditions(Screen):
         # Add display panels
         self.add_panels()
 
-        # Schedule Station.getDeviceStatus to be called each second
+        # Schedule Station.getDeviceStatus to be called each second when the
+        # device status can have changed
         self.app.station = station()
-        self.app.Sched.deviceStatus = Clock.schedule_interval(self.app.station.get_device_status, 1.0)
+        tick_scheduler.get(self.app.config).add('deviceStatus', self.app.station.get_device_status,
+                                                key=self.app.station.device_status_key)
 
         # Initialise Sunrise, Sunset, Moonrise and Moonset times
         self.app.astro = astro()
         self.app.astro.sunrise_sunset()
         self.app.astro.moonrise_moonset()
 
-        # Schedule sunTransit and moonPhase functions to be called each second
-        self.app.Sched.sun_transit = Clock.schedule_interval(self.app.astro.sun_transit, 1)
-        self.app.Sched.moon_phase  = Clock.schedule_interval(self.app.astro.moon_phase, 1)
+        # Schedule sunTransit and moonPhase functions to be called on each
+        # minute boundary
+        tick_scheduler.get(self.app.config).add('sun_transit', self.app.astro.sun_transit, 60)
+        tick_scheduler.get(self.app.config).add('moon_phase',  self.app.astro.moon_phase,  60)
 
         # Schedule WeatherFlow weather forecast download
         self.app.forecast = forecast()
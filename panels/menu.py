@@ -16,10 +16,10 @@ this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 # Load required library modules
+from lib.request_api          import http_client
 from lib                      import config
 
 # Load required Kivy modules
-from kivy.network.urlrequest  import UrlRequest
 from kivy.uix.modalview       import ModalView
 from kivy.uix.boxlayout       import BoxLayout
 from kivy.properties          import ListProperty, DictProperty
@@ -27,8 +27,7 @@ from kivy.clock               import Clock
 from kivy.app                 import App
 
 # Load required system modules
-import certifi
-import socket
+import requests
 
 
 # ==============================================================================
@@ -100,13 +99,9 @@ class mainMenu(ModalView):
 
         URL = 'https://swd.weatherflow.com/swd/rest/stations?token={}'
         URL = URL.format(self.app.config['Keys']['WeatherFlow'])
-        UrlRequest(URL,
-                   on_success=self.parse_station_list,
-                   on_failure=self.fail_station_list,
-                   on_error=self.fail_station_list,
-                   timeout=int(self.app.config['System']['Timeout']),
-                   ca_file=certifi.where()
-                   )
+        http_client.request(URL, self.app.config,
+                            on_success=self.parse_station_list,
+                            on_failure=self.fail_station_list)
 
     def parse_station_list(self, Request, Response):
 
@@ -126,7 +121,7 @@ class mainMenu(ModalView):
         """ Failed to fetch list of all stations associated with WeatherFlow key
         """
 
-        if isinstance(Response, socket.gaierror):
+        if isinstance(Response, requests.exceptions.ConnectionError):
             self.selector_panel.ids.switch_button.text = 'Host name error. Please try again'
         else:
             self.selector_panel.ids.switch_button.text = f'Error {Request.resp_status}. Please try again'
@@ -447,8 +442,8 @@ class mainMenu(ModalView):
         current_station  = self.app.config['Station']['StationID']
         config.switch(self.station_meta_data, self.device_list, self.app.config)
         self.app.obsParser.reset_display()
-        if hasattr(self.app.connection_client, '_switch_device'):
-            self.app.connection_client._switch_device = True
+        if hasattr(self.app.connection_client, 'switch_device'):
+            self.app.connection_client.switch_device()
         if current_station != str(self.station_meta_data['station_id']):
             self.app.forecast.reset_forecast()
             self.app.astro.reset_astro()
@@ -0,0 +1,120 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Import required library modules
+from lib.observation_parser import obs_parser
+from lib.parse_executor     import parse_executor
+from lib.message_router     import message_dedup
+from lib.message_capture    import message_capture
+from lib.system             import system
+from service                import udp
+from service                import websocket
+
+# Import required Kivy modules
+from kivy.logger            import Logger
+from kivy.app               import App
+
+# Import required Python modules
+import asyncio
+
+
+# ==============================================================================
+# DEFINE 'hybrid_client' CLASS
+# ==============================================================================
+class hybrid_client():
+
+    """ Runs the UDP and Websocket connection services in one event loop. The
+    low-latency UDP service is the primary source of observations and the
+    Websocket service fills any gaps when UDP messages are lost. Both services
+    share the observation parser and parse executor, and messages received by
+    both services are only parsed once
+    """
+
+    @classmethod
+    async def create(cls):
+
+        # Initialise hybrid_client
+        self = App.get_running_app().connection_client = hybrid_client()
+        self.app = App.get_running_app()
+
+        # Load configuration file
+        self.config = self.app.config
+
+        # Load system class
+        self.system = system()
+
+        # Initialise shared Observation Parser, parse executor, message
+        # de-duplication cache and capture file
+        self.app.obsParser = obs_parser()
+        self.executor      = parse_executor(self.config)
+        self.dedup         = message_dedup()
+        self.capture       = message_capture.from_config(self.config)
+
+        # Initialise UDP client. The Websocket client is initialised by main()
+        # once the UDP service is running, so that UDP messages are parsed
+        # while the Websocket connection opens
+        self.udp_client       = await udp.udp_client.create(self)
+        self.websocket_client = None
+        return self
+
+    def stop(self):
+
+        """ Stop both connection services. Called from the Kivy main thread
+        """
+
+        self.udp_client.stop()
+        if self.websocket_client is not None:
+            self.websocket_client.stop()
+
+    def switch_device(self):
+
+        """ Switch both connection services to the current station and devices.
+        Called from the Kivy main thread
+        """
+
+        self.udp_client.switch_device()
+        if self.websocket_client is not None:
+            self.websocket_client.switch_device()
+
+    def wait_idle(self, timeout=None):
+        return self.executor.wait_idle(timeout)
+
+    def activeThreads(self):
+        return self.executor.busy()
+
+
+async def main():
+    hybrid = await hybrid_client.create()
+    udp_task = asyncio.create_task(udp.serve(hybrid.udp_client))
+    if hybrid.udp_client._keep_running:
+        hybrid.websocket_client = await websocket.websocketClient.create(hybrid)
+        if hybrid.udp_client._keep_running:
+            await websocket.serve(hybrid.websocket_client)
+        else:
+            await hybrid.websocket_client._websocketClient__async__disconnect()
+    await udp_task
+    hybrid.executor.stop()
+    hybrid.app.obsParser.save_snapshot(hybrid.config)
+    if hybrid.capture is not None:
+        hybrid.capture.close()
+    Logger.info(f'Hybrid: {hybrid.system.log_time()} - Duplicate messages discarded: {hybrid.dedup.duplicates}')
+
+
+if __name__ == '__main__':
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(main())
@@ -0,0 +1,174 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Replay a capture file recorded by the Websocket or UDP service through the
+# observation parser, without a Kivy window or network connection. Run from
+# the console directory:
+#
+#     python -m service.replay <capture file> [--speed N|max] [--config FILE]
+
+# Stop Kivy parsing command line arguments and disable the frame rate limit so
+# that the Kivy clock does not throttle replay
+import os
+os.environ['KIVY_NO_ARGS'] = '1'
+from kivy.config import Config as kivyconfig
+kivyconfig.set('graphics', 'maxfps', '0')
+
+# Import required library modules
+from lib.observation_parser import obs_parser
+from lib.message_router     import message_router, MESSAGE_TYPES
+from lib                    import message_capture
+
+# Import required Kivy modules
+from kivy.clock             import Clock
+from kivy.app               import App
+
+# Import required Python modules
+import configparser
+import argparse
+import json
+import time
+
+
+# ==============================================================================
+# DEFINE 'replay_conditions' CLASS
+# ==============================================================================
+class replay_conditions():
+
+    """ Stand-in for the CurrentConditions screen that receives display updates
+    from the observation parser
+    """
+
+    def __init__(self):
+        self.Obs         = {}
+        self.System      = {}
+        self.button_list = []
+
+    def switchPanel(self, instance, button):
+        pass
+
+
+# ==============================================================================
+# DEFINE 'replay_executor' CLASS
+# ==============================================================================
+class replay_executor():
+
+    """ Runs parse jobs inline so that messages are parsed in capture order
+    """
+
+    def submit(self, name, target, *args):
+        target(*args)
+        return True
+
+
+# ==============================================================================
+# DEFINE 'replay_app' CLASS
+# ==============================================================================
+class replay_app(App):
+
+    """ Headless console App used to replay capture files. REST API services are
+    disabled so that no network requests are made, and the local archive and
+    warm-start snapshot are disabled so that replay does not change them
+
+    INPUTS:
+        config_file         Path to console configuration file
+    """
+
+    def __init__(self, config_file):
+        super().__init__()
+        self.config = configparser.ConfigParser()
+        if not self.config.read(config_file):
+            raise SystemExit(f'Replay: unable to read configuration file {config_file}')
+        self.config.set('System', 'rest_api', '0')
+        self.config.set('System', 'ArchiveFile', '')
+        self.config.set('System', 'SnapshotFile', '')
+        self.CurrentConditions = replay_conditions()
+
+
+def replay(path, speed, config_file):
+
+    """ Replay capture file through the observation parser
+
+    INPUTS:
+        path                Path to capture file
+        speed               Replay speed relative to capture time, or None to
+                            replay as fast as possible
+        config_file         Path to console configuration file
+
+    OUTPUT:
+        statistics          Dictionary of message count and total parse time
+                            keyed by message type
+    """
+
+    # Initialise headless App, observation parser and message routers
+    app      = replay_app(config_file)
+    parser   = obs_parser()
+    executor = replay_executor()
+    routers  = {'udp':       message_router(parser, executor, app.config, 'SN'),
+                'websocket': message_router(parser, executor, app.config, 'ID')}
+    device   = {'udp': 'serial_number', 'websocket': 'device_id'}
+
+    # Replay each captured message at the requested speed
+    statistics = {}
+    start_time = time.monotonic()
+    first_time = None
+    for receive_time, source, raw in message_capture.read(path):
+        if source not in routers:
+            continue
+        if first_time is None:
+            first_time = receive_time
+        if speed is not None:
+            delay = (receive_time - first_time) / speed - (time.monotonic() - start_time)
+            if delay > 0:
+                time.sleep(delay)
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            continue
+        message_type = message.get('type')
+        if message_type not in MESSAGE_TYPES or device[source] not in message:
+            continue
+        parse_start = time.perf_counter()
+        if routers[source].dispatch(message_type, str(message[device[source]]), message) is None:
+            continue
+        Clock.tick()
+        if message_type not in statistics:
+            statistics[message_type] = {'count': 0, 'time': 0.0}
+        statistics[message_type]['count'] += 1
+        statistics[message_type]['time']  += time.perf_counter() - parse_start
+    statistics['elapsed'] = time.monotonic() - start_time
+    return statistics
+
+
+def main():
+    arguments = argparse.ArgumentParser(description='Replay a Websocket/UDP capture file through the observation parser')
+    arguments.add_argument('capture', help='capture file written by the Websocket or UDP service')
+    arguments.add_argument('--speed', default='1', help='replay speed relative to capture time, or "max"')
+    arguments.add_argument('--config', default='wfpiconsole.ini', help='console configuration file')
+    arguments = arguments.parse_args()
+    speed = None if arguments.speed == 'max' else float(arguments.speed)
+
+    statistics = replay(arguments.capture, speed, arguments.config)
+    elapsed    = statistics.pop('elapsed')
+    total      = sum(stats['count'] for stats in statistics.values())
+    for message_type, stats in sorted(statistics.items()):
+        print(f'{message_type:<12} {stats["count"]:>8} messages {1000 * stats["time"] / stats["count"]:>8.3f} ms/message')
+    print(f'{"total":<12} {total:>8} messages {elapsed:>8.3f} s ({total / elapsed if elapsed else 0:.1f} messages/s)')
+
+
+if __name__ == '__main__':
+    main()
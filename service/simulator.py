@@ -0,0 +1,325 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Synthetic WeatherFlow hub that broadcasts obs_st, obs_sky, obs_air,
+# rapid_wind, evt_strike and hub_status UDP messages for load testing the UDP
+# service. Uses the Python standard library only. Run from the console
+# directory:
+#
+#     python -m service.simulator [--rate N] [--scenario NAME] [--tempest N]
+#                                 [--sky N] [--air N] [--duration S]
+#                                 [--address IP] [--port PORT] [--seed N]
+#
+# Device serial numbers are ST-00000001, SK-00000001, AR-00000001 etc. Set the
+# matching serial numbers in wfpiconsole.ini for the console to parse them.
+
+# Import required Python modules
+import argparse
+import heapq
+import random
+import socket
+import json
+import math
+import time
+
+# Define interval between messages of each type at real message rates   [s]
+INTERVAL = {'obs':        60,
+            'rapid_wind': 3,
+            'hub_status': 10}
+
+# Define available scenarios
+SCENARIOS = ('normal', 'storm', 'rain', 'dropout', 'skew')
+
+
+# ==============================================================================
+# DEFINE 'sim_device' CLASS
+# ==============================================================================
+class sim_device():
+
+    """ Simulated WeatherFlow device with a slowly varying weather state
+
+    INPUTS:
+        device_type         Device type: 'tempest', 'sky' or 'air'
+        serial_number       Device serial number
+        hub_sn              Serial number of hub the device reports through
+        rng                 random.Random object
+    """
+
+    def __init__(self, device_type, serial_number, hub_sn, rng):
+
+        # Define instance variables
+        self.device_type   = device_type
+        self.serial_number = serial_number
+        self.hub_sn        = hub_sn
+        self.rng           = rng
+        self.offline_until = 0
+        self.clock_skew    = 0
+        self.last_ob_time  = None
+
+        # Define initial weather state
+        self.temperature   = rng.uniform(5, 25)
+        self.humidity      = rng.uniform(50, 90)
+        self.pressure      = rng.uniform(1000, 1025)
+        self.wind_speed    = rng.uniform(0, 5)
+        self.wind_dir      = rng.uniform(0, 360)
+        self.rain_rate     = 0.0
+        self.strike_rate   = 0.0
+
+    def step(self, sim_time, scenario):
+
+        """ Advance the weather state by one observation interval
+
+        INPUTS:
+            sim_time            Simulated time                                [s]
+            scenario            Scenario name
+        """
+
+        rng = self.rng
+        self.temperature += rng.gauss(0, 0.1)
+        self.humidity     = min(100, max(5, self.humidity + rng.gauss(0, 0.5)))
+        self.pressure    += rng.gauss(0, 0.05)
+        self.wind_speed   = max(0, self.wind_speed + rng.gauss(0, 0.3))
+        self.wind_dir     = (self.wind_dir + rng.gauss(0, 10)) % 360
+        self.rain_rate    = 0.0
+        self.strike_rate  = 0.0
+
+        # Lightning storm: falling pressure, strong gusty winds, heavy rain and
+        # frequent lightning strikes that build and decay over an hour
+        if scenario == 'storm':
+            intensity         = 0.5 * (1 - math.cos(2 * math.pi * (sim_time % 3600) / 3600))
+            self.pressure    -= 0.1 * intensity
+            self.wind_speed   = max(self.wind_speed, 15 * intensity)
+            self.rain_rate    = 20 * intensity
+            self.strike_rate  = 30 * intensity
+
+        # Rain bursts: short periods of intense rain separated by dry spells
+        elif scenario == 'rain':
+            if rng.random() < 0.2:
+                self.rain_rate = rng.uniform(5, 60)
+
+        # Sensor dropouts: devices stop reporting for several minutes and
+        # individual sensor fields are occasionally missing
+        elif scenario == 'dropout':
+            if sim_time >= self.offline_until and rng.random() < 0.05:
+                self.offline_until = sim_time + rng.uniform(120, 900)
+
+        # Clock skew: device clock drifts away from hub time
+        elif scenario == 'skew':
+            self.clock_skew += rng.gauss(0, 5)
+
+    def online(self, sim_time):
+        return sim_time >= self.offline_until
+
+    def ob_time(self, sim_time):
+        return int(sim_time + self.clock_skew)
+
+    def field(self, value, scenario, digits=2):
+
+        """ Return a rounded observation field, randomly dropping the value in
+        the sensor dropout scenario
+        """
+
+        if scenario == 'dropout' and self.rng.random() < 0.02:
+            return None
+        return round(value, digits)
+
+    def obs_message(self, sim_time, scenario):
+
+        """ Return the obs_st, obs_sky or obs_air message for the device
+        """
+
+        ob_time   = self.ob_time(sim_time)
+        lull      = self.wind_speed * 0.6
+        gust      = self.wind_speed * 1.5 + self.rng.uniform(0, 2)
+        minute    = self.rain_rate / 60
+        lux       = max(0, 100000 * math.sin(math.pi * ((sim_time % 86400) / 86400 - 0.25) * 2))
+        radiation = lux / 120
+        uv        = radiation / 100
+        strikes   = self.rng.randint(0, int(self.strike_rate)) if self.strike_rate else 0
+        distance  = self.rng.randint(1, 40) if strikes else 0
+        battery   = round(self.rng.uniform(2.4, 2.8), 2)
+        precip    = 1 if minute else 0
+        if self.device_type == 'tempest':
+            message_type = 'obs_st'
+            ob = [ob_time, self.field(lull, scenario), self.field(self.wind_speed, scenario), self.field(gust, scenario),
+                  self.field(self.wind_dir, scenario, 0), 3, self.field(self.pressure, scenario), self.field(self.temperature, scenario),
+                  self.field(self.humidity, scenario), self.field(lux, scenario, 0), self.field(uv, scenario), self.field(radiation, scenario, 0),
+                  self.field(minute, scenario, 3), precip, distance, strikes, battery, 1]
+        elif self.device_type == 'sky':
+            message_type = 'obs_sky'
+            ob = [ob_time, self.field(lux, scenario, 0), self.field(uv, scenario), self.field(minute, scenario, 3),
+                  self.field(lull, scenario), self.field(self.wind_speed, scenario), self.field(gust, scenario),
+                  self.field(self.wind_dir, scenario, 0), battery, 1, self.field(radiation, scenario, 0), None, precip, 3]
+        else:
+            message_type = 'obs_air'
+            ob = [ob_time, self.field(self.pressure, scenario), self.field(self.temperature, scenario),
+                  self.field(self.humidity, scenario), strikes, distance, battery, 1]
+
+        # Occasionally repeat the previous observation time in the clock skew
+        # scenario to exercise duplicate and out-of-order handling
+        if scenario == 'skew' and self.last_ob_time is not None and self.rng.random() < 0.05:
+            ob[0] = self.last_ob_time
+        self.last_ob_time = ob[0]
+        return {'serial_number': self.serial_number, 'type': message_type, 'hub_sn': self.hub_sn,
+                'obs': [ob], 'firmware_revision': 171}
+
+    def rapid_wind_message(self, sim_time):
+        speed = max(0, self.wind_speed + self.rng.gauss(0, 0.5))
+        return {'serial_number': self.serial_number, 'type': 'rapid_wind', 'hub_sn': self.hub_sn,
+                'ob': [self.ob_time(sim_time), round(speed, 2), int(self.wind_dir)]}
+
+    def strike_message(self, sim_time):
+        return {'serial_number': self.serial_number, 'type': 'evt_strike', 'hub_sn': self.hub_sn,
+                'evt': [self.ob_time(sim_time), self.rng.randint(1, 40), self.rng.randint(100, 10000)]}
+
+
+# ==============================================================================
+# DEFINE 'hub_simulator' CLASS
+# ==============================================================================
+class hub_simulator():
+
+    """ Simulated WeatherFlow hub that broadcasts UDP messages for a set of
+    simulated devices. Message timestamps advance with simulated time, which
+    runs at the specified multiple of real time
+
+    INPUTS:
+        devices             Dictionary of device counts keyed by device type
+        scenario            Scenario name
+        rate                Message rate as a multiple of real message rates
+        address             Destination address
+        port                Destination UDP port
+        seed                Random number generator seed
+    """
+
+    def __init__(self, devices, scenario, rate, address, port, seed=None):
+
+        # Define instance variables
+        self.rng        = random.Random(seed)
+        self.scenario   = scenario
+        self.rate       = rate
+        self.target     = (address, port)
+        self.hub_sn     = 'HB-00000001'
+        self.sequence   = 0
+        self.counters   = {}
+        self.start_time = None
+        self.sim_start  = time.time()
+
+        # Define simulated devices
+        prefix = {'tempest': 'ST', 'sky': 'SK', 'air': 'AR'}
+        self.devices = []
+        for device_type, count in devices.items():
+            for ii in range(count):
+                self.devices.append(sim_device(device_type, f'{prefix[device_type]}-{ii + 1:08d}', self.hub_sn, self.rng))
+
+        # Open broadcast socket
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+
+    def send(self, message):
+        self.socket.sendto(json.dumps(message, separators=(',', ':')).encode(), self.target)
+        self.counters[message['type']] = self.counters.get(message['type'], 0) + 1
+
+    def sim_time(self, now):
+        return self.sim_start + (now - self.start_time) * self.rate
+
+    def run(self, duration=None):
+
+        """ Broadcast messages until the duration has elapsed or the simulator
+        is interrupted
+
+        INPUTS:
+            duration            Optional run time in real seconds             [s]
+        """
+
+        # Schedule first message of each type. Observation messages for each
+        # device are spread across the observation interval
+        self.start_time = time.monotonic()
+        schedule = [(0.0, 'hub_status', -1)]
+        for ii, device in enumerate(self.devices):
+            schedule.append((self.rng.uniform(0, INTERVAL['obs']) / self.rate, 'obs', ii))
+            if device.device_type in ('tempest', 'sky'):
+                schedule.append((self.rng.uniform(0, INTERVAL['rapid_wind']) / self.rate, 'rapid_wind', ii))
+            if device.device_type in ('tempest', 'air'):
+                schedule.append((self.rng.uniform(0, INTERVAL['obs']) / self.rate, 'evt_strike', ii))
+        heapq.heapify(schedule)
+
+        # Send scheduled messages
+        try:
+            while schedule:
+                due, kind, index = heapq.heappop(schedule)
+                if duration is not None and due > duration:
+                    break
+                delay = self.start_time + due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                sim_time = self.sim_time(self.start_time + due)
+                if kind == 'hub_status':
+                    self.send_hub_status(sim_time)
+                    heapq.heappush(schedule, (due + INTERVAL['hub_status'] / self.rate, kind, index))
+                    continue
+                device = self.devices[index]
+                if kind == 'obs':
+                    device.step(sim_time, self.scenario)
+                    if device.online(sim_time):
+                        self.send(device.obs_message(sim_time, self.scenario))
+                    heapq.heappush(schedule, (due + INTERVAL['obs'] / self.rate, kind, index))
+                elif kind == 'rapid_wind':
+                    if device.online(sim_time):
+                        self.send(device.rapid_wind_message(sim_time))
+                    heapq.heappush(schedule, (due + INTERVAL['rapid_wind'] / self.rate, kind, index))
+                elif kind == 'evt_strike':
+                    if device.strike_rate and device.online(sim_time):
+                        self.send(device.strike_message(sim_time))
+                    interval = 60 / device.strike_rate if device.strike_rate else INTERVAL['obs']
+                    heapq.heappush(schedule, (due + self.rng.expovariate(1 / interval) / self.rate, kind, index))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.socket.close()
+        return time.monotonic() - self.start_time
+
+    def send_hub_status(self, sim_time):
+        self.sequence += 1
+        self.send({'serial_number': self.hub_sn, 'type': 'hub_status', 'firmware_revision': '171',
+                   'uptime': int(sim_time - self.sim_start), 'rssi': -62, 'timestamp': int(sim_time),
+                   'reset_flags': 'BOR,PIN,POR', 'seq': self.sequence, 'radio_stats': [25, 1, 0, 3, 16300]})
+
+
+def main():
+    arguments = argparse.ArgumentParser(description='Broadcast simulated WeatherFlow hub UDP messages')
+    arguments.add_argument('--rate',     type=float, default=1,   help='message rate as a multiple of real message rates')
+    arguments.add_argument('--scenario', choices=SCENARIOS, default='normal', help='weather scenario')
+    arguments.add_argument('--tempest',  type=int,   default=1,   help='number of simulated TEMPEST devices')
+    arguments.add_argument('--sky',      type=int,   default=0,   help='number of simulated SKY devices')
+    arguments.add_argument('--air',      type=int,   default=0,   help='number of simulated AIR devices')
+    arguments.add_argument('--duration', type=float, default=None, help='run time in seconds')
+    arguments.add_argument('--address',  default='255.255.255.255', help='destination address')
+    arguments.add_argument('--port',     type=int,   default=50222, help='destination UDP port')
+    arguments.add_argument('--seed',     type=int,   default=None, help='random number generator seed')
+    arguments = arguments.parse_args()
+
+    simulator = hub_simulator({'tempest': arguments.tempest, 'sky': arguments.sky, 'air': arguments.air},
+                              arguments.scenario, arguments.rate, arguments.address, arguments.port, arguments.seed)
+    elapsed = simulator.run(arguments.duration)
+    total   = sum(simulator.counters.values())
+    for message_type, count in sorted(simulator.counters.items()):
+        print(f'{message_type:<12} {count:>8} messages')
+    print(f'{"total":<12} {total:>8} messages {elapsed:>8.3f} s ({total / elapsed if elapsed else 0:.1f} messages/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -17,6 +17,9 @@
 
 # Import required library modules
 from lib.observation_parser import obs_parser
+from lib.parse_executor     import parse_executor
+from lib.message_router     import message_router, MESSAGE_TYPES
+from lib.message_capture    import message_capture
 from lib.system             import system
 
 # Import required Kivy modules
@@ -24,10 +27,25 @@ from kivy.logger            import Logger
 from kivy.app               import App
 
 # Import required Python modules
-import threading
 import asyncio
 import socket
 import json
+import re
+
+# Import optional faster JSON decoder, falling back to the standard library
+try:
+    import orjson as json_decoder
+except ImportError:
+    try:
+        import ujson as json_decoder
+    except ImportError:
+        json_decoder = json
+
+# Define patterns used to read the message type and serial number from the raw
+# datagram before it is decoded, and message types that are never parsed
+TYPE_PATTERN   = re.compile(rb'"type"\s*:\s*"([^"]*)"')
+SERIAL_PATTERN = re.compile(rb'"serial_number"\s*:\s*"([^"]*)"')
+IGNORED_TYPES  = ('hub_status', 'device_status', 'evt_precip')
 
 
 # ==============================================================================
@@ -44,11 +62,10 @@ class EchoClientProtocol(asyncio.Protocol):
         self.transport = transport
 
     def datagram_received(self, data, addr):
-        self.udp_client.message = json.loads(data.decode())
-        self._asyncio_loop.create_task(self.udp_client._udp_client__async__decode_message())
+        self.udp_client.filter_datagram(data)
 
     def error_received(self, exception):
-        Logger.error(f'UDP: {self.system.log_time()} - Error received: {exception}')
+        Logger.error(f'UDP: {self.udp_client.system.log_time()} - Error received: {exception}')
 
     def connection_lost(self, exc):
         pass
@@ -60,11 +77,15 @@ class EchoClientProtocol(asyncio.Protocol):
 class udp_client():
 
     @classmethod
-    async def create(cls):
+    async def create(cls, hybrid=None):
 
-        # Initialise udp_client
-        self = App.get_running_app().connection_client = udp_client()
-        self.app = App.get_running_app()
+        # Initialise udp_client. In hybrid mode the hybrid_client is the connection
+        # client
+        self = udp_client()
+        if hybrid is None:
+            App.get_running_app().connection_client = self
+        self.app    = App.get_running_app()
+        self.hybrid = hybrid
 
         # Load configuration file
         self.config = self.app.config
@@ -76,19 +97,30 @@ class udp_client():
         self._asyncio_loop    = asyncio.get_running_loop()
         self._udp_connection  = self._asyncio_loop.create_future()
         self._keep_running    = True
+        self._switch_device   = False
+        self._control_event   = asyncio.Event()
         self.watchdog_timeout = 300
         self.reply_timeout    = 60
         self.ping_timeout     = 60
         self.sleep_time       = 10
-        self.thread_list      = {}
         self.task_list        = {}
         self.connected        = False
         self.socket           = None
         self.udp_port         = 50222
         self.udp_ip           = '0.0.0.0'
+        self.datagram_count   = {}
 
-        # Initialise Observation Parser
-        self.app.obsParser = obs_parser()
+        # Initialise Observation Parser, parse executor and message router. In
+        # hybrid mode these are shared with the other connection service
+        if hybrid is None:
+            self.app.obsParser = obs_parser()
+            self.executor      = parse_executor(self.config)
+            self.capture       = message_capture.from_config(self.config)
+            self.router        = message_router(self.app.obsParser, self.executor, self.config, 'SN')
+        else:
+            self.executor      = hybrid.executor
+            self.capture       = hybrid.capture
+            self.router        = message_router(self.app.obsParser, self.executor, self.config, 'SN', hybrid.dedup)
 
         # Open UDP socket and return udp_client
         await self.__async__open_socket()
@@ -135,63 +167,73 @@ class udp_client():
         except Exception:
             Logger.info(f'Websocket: {self.system.log_time()} - Unable to close socket')
 
-    async def __async__decode_message(self):
+    def filter_datagram(self, data):
+
+        """ Read the message type and serial number from the raw datagram and
+        only decode messages that will be parsed
+
+        INPUTS:
+            data                Raw UDP datagram
+        """
+
+        # Write raw datagram to capture file
+        if self.capture is not None:
+            self.capture.write('udp', data)
+
+        # Rebuild message router if station or devices have been switched
+        if self._switch_device:
+            self.router.build(self.config)
+            self._switch_device = False
+
+        # Skip message types that are never parsed and devices that are not
+        # part of the station. Datagrams without a type or serial number are
+        # decoded so that they are reported by __decode_message
+        match = TYPE_PATTERN.search(data)
+        message_type = match.group(1).decode() if match else None
+        if message_type in IGNORED_TYPES:
+            self.count_datagram(message_type, 'skipped')
+            return
+        match = SERIAL_PATTERN.search(data)
+        if match and message_type and match.group(1).decode() not in self.router.devices:
+            self.count_datagram(message_type, 'skipped')
+            return
+
+        # Decode and parse message
         try:
-            if self.message:
-                if 'type' in self.message:
-                    if self.message['type'] in ['hub_status', 'device_status', 'evt_precip']:
-                        pass
-                    else:
-                        if 'serial_number' in self.message:
-                            if self.message['type'] == 'obs_st':
-                                if self.message['serial_number'] == self.config['Station']['TempestSN']:
-                                    if 'obs_st' in self.thread_list:
-                                        while self.thread_list['obs_st'].is_alive():
-                                            await asyncio.sleep(0.1)
-                                    self.thread_list['obs_st'] = threading.Thread(target=self.app.obsParser.parse_obs_st,
-                                                                                  args=(self.message, self.config, ),
-                                                                                  name="obs_st")
-                                    self.thread_list['obs_st'].start()
-                            elif self.message['type'] == 'obs_sky':
-                                if self.message['serial_number'] == self.config['Station']['SkySN']:
-                                    if 'obs_sky' in self.thread_list:
-                                        while self.thread_list['obs_sky'].is_alive():
-                                            await asyncio.sleep(0.1)
-                                    self.thread_list['obs_sky'] = threading.Thread(target=self.app.obsParser.parse_obs_sky,
-                                                                                   args=(self.message, self.config, ),
-                                                                                   name='obs_sky')
-                                    self.thread_list['obs_sky'].start()
-                            elif self.message['type'] == 'obs_air':
-                                if self.message['serial_number'] == self.config['Station']['OutAirSN']:
-                                    if 'obs_out_air' in self.thread_list:
-                                        while self.thread_list['obs_out_air'].is_alive():
-                                            await asyncio.sleep(0.1)
-                                    self.thread_list['obs_out_air'] = threading.Thread(target=self.app.obsParser.parse_obs_out_air,
-                                                                                       args=(self.message, self.config, ),
-                                                                                       name='obs_out_air')
-                                    self.thread_list['obs_out_air'].start()
-                                elif self.message['serial_number'] == self.config['Station']['InAirSN']:
-                                    if 'obs_in_air' in self.thread_list:
-                                        while self.thread_list['obs_in_air'].is_alive():
-                                            await asyncio.sleep(0.1)
-                                    self.thread_list['obs_in_air'] = threading.Thread(target=self.app.obsParser.parse_obs_in_air,
-                                                                                      args=(self.message, self.config, ),
-                                                                                      name='obs_in_air')
-                                    self.thread_list['obs_in_air'].start()
-                            elif self.message['type'] == 'rapid_wind':
-                                if self.message['serial_number'] in [self.config['Station']['TempestSN'], self.config['Station']['SkySN']]:
-                                    self.app.obsParser.parse_rapid_wind(self.message, self.config)
-                            elif self.message['type'] == 'evt_strike':
-                                if self.message['serial_number'] in [self.config['Station']['TempestSN'], self.config['Station']['OutAirSN']]:
-                                    self.app.obsParser.parse_evt_strike(self.message, self.config)
-                            else:
-                                Logger.warning(f'Websocket: {self.system.log_time()} - Unknown message type: {json.dumps(self.message)}')
-                        else:
-                            Logger.warning(f'Websocket: {self.system.log_time()} - Missing device ID: {json.dumps(self.message)}')
+            message = json_decoder.loads(data)
+        except ValueError as error:
+            Logger.warning(f'UDP: {self.system.log_time()} - Unable to decode message: {error}')
+            return
+        self.count_datagram(message_type or 'unknown', 'decoded')
+        self.__decode_message(message)
+
+    def count_datagram(self, message_type, outcome):
+
+        """ Increment the decoded or skipped datagram counter for the specified
+        message type
+
+        INPUTS:
+            message_type        Message type, or 'unknown' if missing
+            outcome             'decoded' or 'skipped'
+        """
+
+        if message_type not in self.datagram_count:
+            self.datagram_count[message_type] = {'decoded': 0, 'skipped': 0}
+        self.datagram_count[message_type][outcome] += 1
+
+    def __decode_message(self, message):
+        if message:
+            if 'type' in message:
+                if message['type'] in IGNORED_TYPES:
+                    pass
+                elif message['type'] not in MESSAGE_TYPES:
+                    Logger.warning(f'UDP: {self.system.log_time()} - Unknown message type: {json.dumps(message)}')
+                elif 'serial_number' in message:
+                    self.router.dispatch(message['type'], message['serial_number'], message)
                 else:
-                    Logger.warning(f'Websocket: {self.system.log_time()} - Missing message type: {json.dumps(self.message)}')
-        except asyncio.CancelledError:
-            raise
+                    Logger.warning(f'UDP: {self.system.log_time()} - Missing device ID: {json.dumps(message)}')
+            else:
+                Logger.warning(f'UDP: {self.system.log_time()} - Missing message type: {json.dumps(message)}')
 
     async def __async__listen(self):
         try:
@@ -201,25 +243,58 @@ class udp_client():
 
     async def __async__cancel(self):
         while self._keep_running:
-            await asyncio.sleep(0.1)
+            await self._control_event.wait()
+            self._control_event.clear()
         self.task_list['listen'].cancel()
 
+    def stop(self):
+
+        """ Stop the connection service. Called from the Kivy main thread
+        """
+
+        self._keep_running = False
+        self.__signal()
+
+    def switch_device(self):
+
+        """ Switch the connection service to the current station and devices.
+        Called from the Kivy main thread
+        """
+
+        self._switch_device = True
+
+    def __signal(self):
+        try:
+            self._asyncio_loop.call_soon_threadsafe(self._control_event.set)
+        except (AttributeError, RuntimeError):
+            pass
+
+    def wait_idle(self, timeout=None):
+        return self.executor.wait_idle(timeout)
+
     def activeThreads(self):
-        for thread in self.thread_list:
-            if self.thread_list[thread].is_alive():
-                return True
-        return False
+        return self.executor.busy()
 
 
-async def main():
+async def serve(udp):
     try:
-        udp = await udp_client.create()
         udp.task_list['listen'] = asyncio.create_task(udp._udp_client__async__listen())
         udp.task_list['cancel'] = asyncio.create_task(udp._udp_client__async__cancel())
         await asyncio.gather(*list(udp.task_list.values()))
     except asyncio.CancelledError:
         if not udp._keep_running:
             await udp._udp_client__async__close_socket()
+            if udp.hybrid is None:
+                udp.executor.stop()
+                udp.app.obsParser.save_snapshot(udp.config)
+                if udp.capture is not None:
+                    udp.capture.close()
+
+
+async def main():
+    udp = await udp_client.create()
+    await serve(udp)
+
 
 if __name__ == '__main__':
     loop = asyncio.new_event_loop()
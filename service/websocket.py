@@ -17,6 +17,9 @@
 
 # Import required library modules
 from lib.observation_parser import obs_parser
+from lib.parse_executor     import parse_executor
+from lib.message_router     import message_router, MESSAGE_TYPES
+from lib.message_capture    import message_capture
 from lib.system             import system
 
 # Import required Kivy modules
@@ -25,7 +28,6 @@ from kivy.app               import App
 
 # Import required Python modules
 import websockets
-import threading
 import asyncio
 import certifi
 import socket
@@ -40,11 +42,15 @@ import ssl
 class websocketClient():
 
     @classmethod
-    async def create(cls):
+    async def create(cls, hybrid=None):
 
-        # Initialise websocketClient
-        self = App.get_running_app().connection_client = websocketClient()
-        self.app = App.get_running_app()
+        # Initialise websocketClient. In hybrid mode the hybrid_client is the connection
+        # client
+        self = websocketClient()
+        if hybrid is None:
+            App.get_running_app().connection_client = self
+        self.app    = App.get_running_app()
+        self.hybrid = hybrid
 
         # Load configuration file
         self.config = self.app.config
@@ -53,21 +59,31 @@ class websocketClient():
         self.system = system()
 
         # Initialise websocketClient class variables
+        self._asyncio_loop     = asyncio.get_running_loop()
+        self._control_event    = asyncio.Event()
         self._keep_running     = True
         self._switch_device    = False
         self.watchdog_timeout  = 300
         self.reply_timeout     = 60
         self.ping_timeout      = 60
         self.sleep_time        = 10
-        self.thread_list       = {}
         self.task_list         = {}
         self.watchdog_list     = {}
         self.connected         = False
         self.connection        = None
         self.url               = None
 
-        # Initialise Observation Parser
-        self.app.obsParser = obs_parser()
+        # Initialise Observation Parser, parse executor and message router. In
+        # hybrid mode these are shared with the other connection service
+        if hybrid is None:
+            self.app.obsParser = obs_parser()
+            self.executor      = parse_executor(self.config)
+            self.capture       = message_capture.from_config(self.config)
+            self.router        = message_router(self.app.obsParser, self.executor, self.config, 'ID')
+        else:
+            self.executor      = hybrid.executor
+            self.capture       = hybrid.capture
+            self.router        = message_router(self.app.obsParser, self.executor, self.config, 'ID', hybrid.dedup)
 
         # Connect to specified Websocket URL and return websocketClient
         await self.__async__connect()
@@ -172,6 +188,8 @@ class websocketClient():
     async def __async__getMessage(self):
         try:
             message = await asyncio.wait_for(self.connection.recv(), timeout=self.reply_timeout)
+            if self.capture is not None:
+                self.capture.write('websocket', message)
             try:
                 return json.loads(message)
             except Exception:
@@ -202,54 +220,14 @@ class websocketClient():
                 if 'type' in self.message:
                     if self.message['type'] in ['connection_opened', 'ack', 'evt_precip']:
                         pass
+                    elif self.message['type'] not in MESSAGE_TYPES:
+                        Logger.warning(f'Websocket: {self.system.log_time()} - Unknown message type: {json.dumps(self.message)}')
+                    elif 'device_id' in self.message:
+                        route = self.router.dispatch(self.message['type'], str(self.message['device_id']), self.message)
+                        if route is not None and route.slot is not None:
+                            self.watchdog_list[route.slot] = time.time()
                     else:
-                        if 'device_id' in self.message:
-                            if self.message['type'] == 'obs_st':
-                                if 'obs_st' in self.thread_list:
-                                    while self.thread_list['obs_st'].is_alive():
-                                        await asyncio.sleep(0.1)
-                                self.watchdog_list['obs_st'] = time.time()
-                                self.thread_list['obs_st'] = threading.Thread(target=self.app.obsParser.parse_obs_st,
-                                                                              args=(self.message, self.config, ),
-                                                                              name="obs_st")
-                                self.thread_list['obs_st'].start()
-                            elif self.message['type'] == 'obs_sky':
-                                if 'obs_sky' in self.thread_list:
-                                    while self.thread_list['obs_sky'].is_alive():
-                                        await asyncio.sleep(0.1)
-                                self.watchdog_list['obs_sky'] = time.time()
-                                self.thread_list['obs_sky'] = threading.Thread(target=self.app.obsParser.parse_obs_sky,
-                                                                               args=(self.message, self.config, ),
-                                                                               name='obs_sky')
-                                self.thread_list['obs_sky'].start()
-                            elif self.message['type'] == 'obs_air':
-                                if str(self.message['device_id']) == self.config['Station']['OutAirID']:
-                                    if 'obs_out_air' in self.thread_list:
-                                        while self.thread_list['obs_out_air'].is_alive():
-                                            await asyncio.sleep(0.1)
-                                    self.watchdog_list['obs_out_air'] = time.time()
-                                    self.thread_list['obs_out_air'] = threading.Thread(target=self.app.obsParser.parse_obs_out_air,
-                                                                                       args=(self.message, self.config, ),
-                                                                                       name='obs_out_air')
-                                    self.thread_list['obs_out_air'].start()
-                                elif str(self.message['device_id']) == self.config['Station']['InAirID']:
-                                    if 'obs_in_air' in self.thread_list:
-                                        while self.thread_list['obs_in_air'].is_alive():
-                                            await asyncio.sleep(0.1)
-                                    self.watchdog_list['obs_in_air'] = time.time()
-                                    self.thread_list['obs_in_air'] = threading.Thread(target=self.app.obsParser.parse_obs_in_air,
-                                                                                      args=(self.message, self.config, ),
-                                                                                      name='obs_in_air')
-                                    self.thread_list['obs_in_air'].start()
-                            elif self.message['type'] == 'rapid_wind':
-                                self.watchdog_list['rapid_wind'] = time.time()
-                                self.app.obsParser.parse_rapid_wind(self.message, self.config)
-                            elif self.message['type'] == 'evt_strike':
-                                self.app.obsParser.parse_evt_strike(self.message, self.config)
-                            else:
-                                Logger.warning(f'Websocket: {self.system.log_time()} - Unknown message type: {json.dumps(self.message)}')
-                        else:
-                            Logger.warning(f'Websocket: {self.system.log_time()} - Missing device ID: {json.dumps(self.message)}')
+                        Logger.warning(f'Websocket: {self.system.log_time()} - Missing device ID: {json.dumps(self.message)}')
                 else:
                     Logger.warning(f'Websocket: {self.system.log_time()} - Missing message type: {json.dumps(self.message)}')
         except asyncio.CancelledError:
@@ -266,21 +244,43 @@ class websocketClient():
 
     async def __async__switch(self):
         while not self._switch_device and self._keep_running:
-            await asyncio.sleep(0.1)
-        if 'verify' in self.task_list:
-            while not self.task_list['verify'].done():
-                await asyncio.sleep(0.1)
+            await self._control_event.wait()
+            self._control_event.clear()
+        if 'verify' in self.task_list and not self.task_list['verify'].done():
+            await asyncio.wait([self.task_list['verify']])
         self.task_list['listen'].cancel()
 
+    def stop(self):
+
+        """ Stop the connection service. Called from the Kivy main thread
+        """
+
+        self._keep_running = False
+        self.__signal()
+
+    def switch_device(self):
+
+        """ Switch the connection service to the current station and devices.
+        Called from the Kivy main thread
+        """
+
+        self._switch_device = True
+        self.__signal()
+
+    def __signal(self):
+        try:
+            self._asyncio_loop.call_soon_threadsafe(self._control_event.set)
+        except (AttributeError, RuntimeError):
+            pass
+
+    def wait_idle(self, timeout=None):
+        return self.executor.wait_idle(timeout)
+
     def activeThreads(self):
-        for thread in self.thread_list:
-            if self.thread_list[thread].is_alive():
-                return True
-        return False
+        return self.executor.busy()
 
 
-async def main():
-    websocket = await websocketClient.create()
+async def serve(websocket):
     if not websocket.config['Keys']['WeatherFlow']:
         Logger.warning(f'Websocket: {system().log_time()} - Conection unavailable; WeatherFlow Access Token missing')
     else:
@@ -292,15 +292,26 @@ async def main():
             except asyncio.CancelledError:
                 if not websocket._keep_running:
                     await websocket._websocketClient__async__disconnect()
+                    if websocket.hybrid is None:
+                        websocket.executor.stop()
+                        websocket.app.obsParser.save_snapshot(websocket.config)
+                        if websocket.capture is not None:
+                            websocket.capture.close()
                     break
                 if websocket._switch_device:
                     await websocket._websocketClient__async__listen_devices('listen_stop')
                     await websocket._websocketClient__async__get_devices()
                     await websocket._websocketClient__async__listen_devices('listen_start')
+                    websocket.router.build(websocket.config)
                     Logger.info(f'Websocket: {system().log_time()} - Switching devices and/or station')
                     websocket._switch_device = False
 
 
+async def main():
+    websocket = await websocketClient.create()
+    await serve(websocket)
+
+
 if __name__ == '__main__':
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
@@ -0,0 +1,119 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Shared fixtures for the console tests. Run from the console directory:
+#
+#     python -m pytest tests
+
+# Stop Kivy parsing the pytest command line arguments
+import os
+os.environ['KIVY_NO_ARGS'] = '1'
+
+# Import required Python modules
+import pytest
+import sys
+
+# Allow the console modules to be imported from the tests directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Define console configuration used by the tests. Device IDs and serial numbers
+# are filled in for each station
+CONFIG = '''
+[Keys]
+WeatherFlow =
+CheckWX =
+
+[Station]
+StationID =
+TempestID = {TempestID}
+TempestSN = {TempestSN}
+SkyID = {SkyID}
+SkySN = {SkySN}
+OutAirID = {OutAirID}
+OutAirSN = {OutAirSN}
+InAirID =
+InAirSN =
+TempestHeight = 2
+SkyHeight = 2
+OutAirHeight = 2
+Latitude = 51
+Longitude = 0
+Elevation = 50
+Timezone = Europe/London
+Name = London, UK
+
+[Units]
+Temp = c
+Pressure = mb
+Wind = mph
+Direction = cardinal
+Precip = mm
+Distance = km
+Other = metric
+
+[Display]
+TimeFormat = 24 hr
+DateFormat = Mon, 01 Jan 0000
+LightningPanel = 0
+lightning_timeout = 0
+IndoorTemp =
+
+[FeelsLike]
+ExtremelyCold = -5
+FreezingCold = 0
+VeryCold = 5
+Cold = 10
+Mild = 15
+Warm = 20
+Hot = 25
+VeryHot = 30
+
+[System]
+Connection = UDP
+rest_api = 0
+stats_endpoint = 0
+SagerInterval = 6
+Timeout = 20
+ParseQueueDepth = 8
+ParseQueuePolicy = drop_oldest
+CaptureFile =
+Hardware = Linux
+Version = v25.9.3
+'''
+
+
+@pytest.fixture
+def station(tmp_path):
+
+    """ Return a function that starts a headless console for a station with the
+    given devices, and returns the App, observation parser and UDP message
+    router
+    """
+
+    def start(**devices):
+        from service.replay         import replay_app, replay_executor
+        from lib.observation_parser import obs_parser
+        from lib.message_router     import message_router
+        fields = {'TempestID': '', 'TempestSN': '', 'SkyID': '', 'SkySN': '', 'OutAirID': '', 'OutAirSN': ''}
+        fields.update(devices)
+        config_file = tmp_path / 'wfpiconsole.ini'
+        config_file.write_text(CONFIG.format(**fields))
+        app    = replay_app(str(config_file))
+        parser = obs_parser()
+        router = message_router(parser, replay_executor(), app.config, 'SN')
+        return app, parser, router
+    return start
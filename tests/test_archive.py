@@ -0,0 +1,72 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Check that the local observation archive writes observations in batches,
+# reports time window coverage and drops expired monthly partitions
+
+# Import required Python modules
+import time
+
+
+def test_window_coverage(tmp_path):
+
+    """ Observations must be held until the batch is written, then returned
+    for a time window with complete coverage, and None returned for a window
+    with a gap
+    """
+
+    from lib.archive import obs_archive, COVERAGE_GAP
+    archive  = obs_archive(str(tmp_path / 'archive.db'))
+    end_time = int(time.time())
+    obs = [[ob_time, 1013.0, 15.0] for ob_time in range(end_time - 7200, end_time + 1, 60)]
+    archive.insert('obs', 100, obs[0])
+    time.sleep(0.2)
+    assert archive.written == 0
+    for ob in obs[1:]:
+        archive.insert('obs', 100, ob)
+    archive.insert('obs', 200, [end_time - 60, 1013.0, 15.0])
+    archive.close()
+
+    assert archive.written == len(obs) + 1
+    assert archive.window(100, end_time - 7200, end_time).obs == obs
+    assert archive.window(100, end_time - 7200, end_time + 2 * COVERAGE_GAP) is None
+    assert archive.window(200, end_time - 7200, end_time) is None
+
+
+def test_expired_partitions_dropped(tmp_path):
+
+    """ Monthly partitions older than the retention period must be dropped when
+    a new partition is written, and retained partitions must be kept
+    """
+
+    from lib.archive import obs_archive, partition, RETENTION
+    archive  = obs_archive(str(tmp_path / 'archive.db'))
+    end_time = int(time.time())
+    expired  = end_time - (RETENTION['rapid_wind'] + 1) * 32 * 86400
+    retained = end_time - (RETENTION['obs'] - 1) * 31 * 86400
+    archive.insert('rapid_wind', 100, [expired, 2.0, 180])
+    archive.insert('obs',        100, [retained, 1013.0, 15.0])
+    archive.close()
+    archive = obs_archive(archive.path)
+    archive.insert('rapid_wind', 100, [end_time, 2.0, 180])
+    archive.insert('obs',        100, [end_time, 1013.0, 15.0])
+    archive.close()
+
+    tables = {row[0] for row in archive.connection().execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert partition('rapid_wind', expired) not in tables
+    assert partition('rapid_wind', end_time) in tables
+    assert partition('obs', retained) in tables
@@ -0,0 +1,75 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Check the sun and moon events looked up from the astronomical event table
+
+# Import required Python modules
+from datetime import datetime, timedelta
+import pytz
+
+
+def test_events_match_calculation(station, tmp_path):
+
+    """ Sun and moon events looked up from the table must match the events
+    calculated directly to the minute, and must survive a save and load
+    """
+
+    from lib.astronomical import astro
+    from lib.astro_table  import astro_table, DAYS
+    app, parser, router = station(TempestID='100', TempestSN='ST-1')
+    app.config.set('System', 'AstroFile', str(tmp_path / 'astro.json'))
+    table    = astro_table(app.config)
+    midnight = pytz.utc.localize(datetime.combine(datetime.now(pytz.utc).date(), datetime.min.time()))
+    table.run(table.location(), [(midnight.date() + timedelta(days=day)).isoformat() for day in range(DAYS)])
+
+    # Compare sun and moon events after several start times
+    exact = astro()
+    for hours in range(0, 72, 7):
+        start = midnight + timedelta(hours=hours)
+        assert table.next_events(['dawn', 'sunrise', 'sunset', 'dusk'], start) == exact.calculate_sun_events(start)
+        moonrise, moonset, full_moon, new_moon = exact.calculate_moon_events(start)
+        events = table.moon_events(start, midnight)
+        assert events[:2] == [moonrise, moonset]
+        assert [event.replace(second=0, microsecond=0) for event in events[2:]] == \
+               [event.replace(second=0, microsecond=0) for event in [full_moon, new_moon]]
+
+    # Restore the saved table
+    assert astro_table(app.config).days == table.days
+
+
+def test_location_change_drops_days(station, tmp_path):
+
+    """ Days for a previous station location must be dropped by extend(), and
+    must not be written back by a calculation for the previous location
+    """
+
+    from lib.astro_table import astro_table
+    app, parser, router = station(TempestID='100', TempestSN='ST-1')
+    table    = astro_table(app.config)
+    previous = table.location()
+    today    = datetime.now(pytz.utc).date().isoformat()
+    table.run(previous, [today])
+    assert previous + (today,) in table.days
+
+    # Move the station, then complete a calculation for the previous location
+    app.config.set('Station', 'Latitude', '40')
+    table.extend()
+    table.run(previous, [today])
+    table.thread.join()
+
+    assert all(key[:2] == table.location() for key in table.days)
+    assert table.location() + (today,) in table.days
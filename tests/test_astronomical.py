@@ -0,0 +1,40 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Check the interpolated moon phase and angle of the illuminated moon face
+
+# Import required Python modules
+from datetime import datetime
+import pytz
+
+
+def test_moon_state_near_full_moon(station):
+
+    """ Around full moon the angle of the illuminated moon face turns through
+    100 degrees in a few minutes while the moon is low. The interpolated angle
+    must stay close to the angle calculated every minute
+    """
+
+    from lib.astronomical import astro
+    station(TempestID='100', TempestSN='ST-1')
+    exact, moon = astro(), astro()
+    start = int(pytz.utc.localize(datetime(2025, 3, 14)).timestamp())
+    for sample_time in range(start, start + 86400, 60):
+        sample_time, phase, angle = exact.moon_sample(sample_time)
+        state = moon.moon_state(sample_time)
+        assert abs(state[0] - phase) < 1e-3
+        assert abs((state[1] - angle + 180) % 360 - 180) < 0.5
@@ -0,0 +1,64 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Check that the daily summary cache requests the same month and year windows
+# as the WeatherFlow API fallback
+
+# Import required Python modules
+from datetime import datetime
+from urllib.parse import urlparse, parse_qs
+import pytest
+import pytz
+
+
+def fixed_datetime(now):
+
+    """ Return a datetime class whose now() returns a fixed station time
+    """
+
+    class fixed(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now.astimezone(tz) if tz else now.replace(tzinfo=None)
+    return fixed
+
+
+@pytest.mark.parametrize('period, today', [('month', datetime(2025, 3, 15, 12)),
+                                           ('month', datetime(2025, 3, 3, 12)),
+                                           ('year',  datetime(2025, 1, 3, 12)),
+                                           ('year',  datetime(2025, 7, 31, 12))])
+def test_window_matches_api(station, tmp_path, monkeypatch, period, today):
+
+    from lib.request_api import weatherflow_api, http_client
+    from lib             import daily_totals
+    app, parser, router = station(TempestID='100', TempestSN='ST-1')
+    now = pytz.timezone(app.config['Station']['Timezone']).localize(today)
+    monkeypatch.setattr(weatherflow_api, 'datetime', fixed_datetime(now))
+    monkeypatch.setattr(daily_totals,    'datetime', fixed_datetime(now))
+
+    # Record the time window of each API request
+    windows = []
+    def get(url, config, headers=None, timeout=None):
+        query = parse_qs(urlparse(url).query)
+        windows.append((int(query['time_start'][0]), int(query['time_end'][0])))
+        raise OSError('offline')
+    monkeypatch.setattr(http_client, 'get', get)
+
+    getattr(weatherflow_api, period)('100', app.config)
+    getattr(daily_totals.daily_cache(str(tmp_path / 'archive.db')), period)('100', app.config)
+    assert len(windows) == 2
+    assert windows[0] == windows[1]
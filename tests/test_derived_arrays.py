@@ -0,0 +1,162 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Check that the array versions of the derived variables match the scalar
+# functions in derived_variables over randomised observations with missing
+# values
+
+# Import required Python modules
+import pytest
+import random
+import math
+
+# Define number of randomised observations and fraction that are missing
+SAMPLES = 20000
+MISSING = 0.05
+
+# Define relative tolerance of calculated values. NumPy evaluates log and pow
+# with its own vectorised loops, which can differ from the math module and the
+# ** operator in the last bit. Labels and indices must match exactly
+RTOL = 1e-12
+
+# Define station configuration used by the tests
+CONFIG = {'Station':   {'Elevation': '50', 'TempestID': '100', 'TempestSN': 'ST-1', 'TempestHeight': '2',
+                        'OutAirID': '300', 'OutAirSN': 'AR-1', 'OutAirHeight': '3'},
+          'Units':     {'Temp': 'c'},
+          'FeelsLike': {'ExtremelyCold': '-5', 'FreezingCold': '0', 'VeryCold': '5', 'Cold': '10',
+                        'Mild': '15', 'Warm': '20', 'Hot': '25', 'VeryHot': '30'}}
+
+
+@pytest.fixture(autouse=True)
+def app(station):
+
+    """ Start a headless console so that the scalar functions can log missing
+    observations
+    """
+
+    return station(TempestID='100', TempestSN='ST-1')[0]
+
+
+def observations(seed, low, high):
+
+    """ Return randomised observations with missing values
+
+    INPUTS:
+        seed                Random number seed
+        low                 Minimum observation value
+        high                Maximum observation value
+
+    OUTPUT:
+        values              List of observations, with None for missing values
+    """
+
+    rng = random.Random(seed)
+    return [None if rng.random() < MISSING else rng.uniform(low, high) for sample in range(SAMPLES)]
+
+
+def same(array_value, scalar_value, rel_tol=0):
+
+    """ Return True if an array value matches a scalar value to the relative
+    tolerance, with NaN matching None
+    """
+
+    if scalar_value is None:
+        return math.isnan(array_value)
+    return math.isclose(array_value, scalar_value, rel_tol=rel_tol, abs_tol=rel_tol)
+
+
+def test_dew_point():
+
+    from lib import derived_variables as derive
+    from lib import derived_arrays
+    out_temp = observations(1, -30, 45)
+    humidity = observations(2, -5, 100)
+    dew_point = derived_arrays.dew_point(out_temp, humidity)
+    for T, RH, value in zip(out_temp, humidity, dew_point.tolist()):
+        assert same(value, derive.dew_point([T, 'c'], [RH, '%'])[0], RTOL)
+
+
+def test_feels_like():
+
+    from lib import derived_variables as derive
+    from lib import derived_arrays
+    out_temp = observations(1, -30, 45)
+    humidity = observations(2, 0, 100)
+    wind_spd = observations(3, 0, 30)
+    descriptions = ['Feeling extremely cold', 'Feeling freezing cold', 'Feeling very cold', 'Feeling cold',
+                    'Feeling mild', 'Feeling warm', 'Feeling hot', 'Feeling very hot', 'Feeling extremely hot']
+    for units in ['c', 'f']:
+        config = dict(CONFIG, Units={'Temp': units})
+        feels_like, index = derived_arrays.feels_like(out_temp, humidity, wind_spd, config)
+        for T, RH, WS, value, idx in zip(out_temp, humidity, wind_spd, feels_like.tolist(), index.tolist()):
+            scalar = derive.feels_like([T, 'c'], [RH, '%'], [WS, 'mps'], config)
+            assert same(value, scalar[0], RTOL)
+            assert (descriptions + ['-'])[idx] == scalar[2]
+
+
+def test_SLP():
+
+    from lib import derived_variables as derive
+    from lib import derived_arrays
+    pressure = observations(4, 950, 1050)
+    for device in ['100', 'AR-1']:
+        SLP = derived_arrays.SLP(pressure, device, CONFIG)
+        for P, value in zip(pressure, SLP.tolist()):
+            assert same(value, derive.SLP([P, 'mb'], device, CONFIG)[0], RTOL)
+
+
+def test_beaufort_scale():
+
+    from lib import derived_variables as derive
+    from lib import derived_arrays
+    wind_spd = observations(5, 0, 40)
+    wind_spd[:3] = [0.5, 32.6, 0.0]
+    force = derived_arrays.beaufort_scale(wind_spd)
+    for WS, value in zip(wind_spd, force.tolist()):
+        scalar = derive.beaufort_scale([WS, 'mps'])
+        assert same(value, None if scalar[2] == '-' else scalar[2])
+
+
+def test_uv_index():
+
+    from lib import derived_variables as derive
+    from lib import derived_arrays
+    levels   = ['None', 'Low', 'Moderate', 'High', 'Very High', 'Extreme']
+    uv_level = observations(6, -1, 14)
+    uv_level[:6] = [0.05, 0.15, 2.25, 2.95, 10.95, 0]
+    index, level = derived_arrays.uv_index(uv_level)
+    for UV, value, idx in zip(uv_level, index.tolist(), level.tolist()):
+        scalar = derive.uv_index([UV, 'index'])
+        assert same(value, scalar[0])
+        if scalar[0] is not None:
+            assert levels[idx] == scalar[2]
+
+
+def test_cardinal_wind_dir():
+
+    from lib import derived_variables as derive
+    from lib import derived_arrays
+    wind_dir = observations(7, 0, 360)
+    wind_spd = observations(8, 0, 10)
+    wind_spd[:2] = [0.0, 0.0]
+    wind_dir[:2] = [None, 90]
+    cardinal = derived_arrays.cardinal_wind_dir(wind_dir, wind_spd)
+    for WD, WS, value in zip(wind_dir, wind_spd, cardinal.tolist()):
+        assert value == derive.cardinal_wind_dir([WD, 'degrees'], [WS, 'mps'])[2]
+    cardinal = derived_arrays.cardinal_wind_dir(wind_dir)
+    for WD, value in zip(wind_dir, cardinal.tolist()):
+        assert value == derive.cardinal_wind_dir([WD, 'degrees'])[2]
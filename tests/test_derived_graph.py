@@ -0,0 +1,69 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Check that the derived variable graph recalculates and reformats the values
+# whose inputs have changed
+
+# Import required Python modules
+import random
+import time
+
+
+def test_interleaved_message_keeps_changes(station):
+
+    """ A rapid_wind message evaluated while an obs_st message is being parsed
+    must not consume the changes made by the obs_st message
+    """
+
+    from lib.observation_value import obs_value
+    from service.simulator     import sim_device
+    app, parser, router = station(TempestID='100', TempestSN='ST-1')
+    device   = sim_device('tempest', 'ST-1', 'HB-1', random.Random(1))
+    sim_time = int(time.time()) - 60
+    device.step(sim_time, 'normal')
+    router.dispatch('obs_st', 'ST-1', device.obs_message(sim_time, 'normal'))
+
+    # Set new obs_st observations, then evaluate a rapid_wind message before
+    # the obs_st message is evaluated
+    ob_time = sim_time + 60
+    parser.device_obs['outTemp']  = obs_value(parser.device_obs['outTemp'][0] + 1, 'c', ob_time)
+    parser.device_obs['humidity'] = obs_value(parser.device_obs['humidity'][0] + 1, '%', ob_time)
+    parser.device_obs['rapidWindSpd'] = obs_value(1.0, 'mps', ob_time)
+    parser.derived_graph.evaluate(parser, '100', app.config, 'rapid_wind')
+    changed = parser.derived_graph.evaluate(parser, '100', app.config, 'obs_st')
+
+    assert ('device_obs', 'outTemp') in changed
+    assert ('device_obs', 'humidity') in changed
+    assert ('derive_obs', 'dewPoint') in changed
+
+
+def test_unchanged_sky_values_are_aggregated(station):
+
+    """ SKY observations with unchanged wind speed and radiation must still be
+    added to the daily aggregates
+    """
+
+    from kivy.clock import Clock
+    app, parser, router = station(SkyID='200', SkySN='SK-1')
+    start = int(time.time()) - 3600
+    for sample in range(5):
+        ob = [start + 60 * sample, 0, 0, 0, 1.0, 2.0, 3.0, 180, 2.6, 1, 0, None, 0, 3]
+        router.dispatch('obs_sky', 'SK-1', {'serial_number': 'SK-1', 'type': 'obs_sky', 'hub_sn': 'HB-1', 'obs': [ob]})
+        Clock.tick()
+
+    assert parser.derive_obs['windAvg'][3] == 5
+    assert parser.aggregates['peakSun'].last_time == start + 240
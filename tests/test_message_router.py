@@ -0,0 +1,53 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Check that the message router de-duplicates messages received by more than
+# one connection service
+
+# Import required Python modules
+import time
+
+
+def test_dedup_keeps_devices_with_same_time(station):
+
+    """ Messages from two devices with the same observation time must both be
+    dispatched, while a repeated message from the same device is discarded
+    """
+
+    from lib.message_router import message_router, message_dedup
+    from service.replay     import replay_executor
+    app, parser, router = station(TempestID='100', TempestSN='ST-1', SkyID='200', SkySN='SK-1',
+                                  OutAirID='300', OutAirSN='AR-1')
+    dedup     = message_dedup()
+    udp       = message_router(parser, replay_executor(), app.config, 'SN', dedup)
+    websocket = message_router(parser, replay_executor(), app.config, 'ID', dedup)
+    parsed = []
+    for item in (udp, websocket):
+        item.routes = {key: value._replace(handler=lambda message, config: parsed.append(message))
+                       for key, value in item.routes.items()}
+
+    # Dispatch rapid_wind and evt_strike messages with the same time from
+    # different devices, then repeat one through the other connection
+    ob_time = int(time.time())
+    udp.dispatch('rapid_wind', 'ST-1', {'type': 'rapid_wind', 'serial_number': 'ST-1', 'ob': [ob_time, 2.0, 180]})
+    udp.dispatch('rapid_wind', 'SK-1', {'type': 'rapid_wind', 'serial_number': 'SK-1', 'ob': [ob_time, 3.0, 90]})
+    udp.dispatch('evt_strike', 'ST-1', {'type': 'evt_strike', 'serial_number': 'ST-1', 'evt': [ob_time, 10, 100]})
+    udp.dispatch('evt_strike', 'AR-1', {'type': 'evt_strike', 'serial_number': 'AR-1', 'evt': [ob_time, 12, 100]})
+    websocket.dispatch('rapid_wind', '200', {'type': 'rapid_wind', 'device_id': 200, 'ob': [ob_time, 3.0, 90]})
+
+    assert len(parsed) == 4
+    assert dedup.duplicates == 1
@@ -0,0 +1,46 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Check how the observation parser handles messages from the UDP and Websocket
+# services
+
+# Import required Python modules
+import random
+import time
+
+
+def test_udp_and_websocket_share_buffer(station):
+
+    """ In Hybrid mode, UDP messages keyed by serial number and Websocket
+    messages keyed by device ID must share one observation buffer
+    """
+
+    from service.simulator import sim_device
+    app, parser, router = station(TempestID='100', TempestSN='ST-1')
+    device   = sim_device('tempest', 'ST-1', 'HB-1', random.Random(1))
+    sim_time = int(time.time()) - 120
+
+    # Parse a UDP message, then a Websocket message one minute later
+    device.step(sim_time, 'normal')
+    parser.parse_obs_st(device.obs_message(sim_time, 'normal'), app.config)
+    device.step(sim_time + 60, 'normal')
+    message = device.obs_message(sim_time + 60, 'normal')
+    message = {'type': 'obs_st', 'device_id': 100, 'obs': message['obs']}
+    parser.parse_obs_st(message, app.config)
+
+    assert list(parser.obs_buffer) == ['100']
+    assert len(parser.obs_buffer['100']) == 2
@@ -0,0 +1,43 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Check waiting for the parse executor to become idle
+
+# Import required Python modules
+import threading
+import time
+
+
+def test_wait_idle_timeout_covers_all_lanes():
+
+    """ The wait_idle timeout limits the total wait, not the wait for each
+    lane
+    """
+
+    from lib.parse_executor import parse_executor
+    executor = parse_executor({'System': {}})
+    release  = threading.Event()
+    for name in ['obs_st', 'rapid_wind', 'evt_strike', 'hub_status']:
+        executor.submit(name, release.wait)
+
+    start = time.monotonic()
+    assert not executor.wait_idle(0.2)
+    assert time.monotonic() - start < 0.4
+
+    release.set()
+    assert executor.wait_idle(1)
+    executor.stop()
@@ -0,0 +1,87 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Replay simulated device messages through the observation parser and check the
+# derived variables and display values
+
+# Import required Python modules
+import random
+import time
+
+# Define number of simulated observations replayed for each device
+SAMPLES = 5
+
+
+def replay_obs(router, devices, samples=SAMPLES):
+
+    """ Replay one minute observations from each simulated device
+
+    INPUTS:
+        router              message_router object
+        devices             List of sim_device objects
+        samples             Number of observations replayed for each device
+
+    OUTPUT:
+        times               List of observation times
+    """
+
+    from kivy.clock import Clock
+    start = int(time.time()) - 3600
+    times = []
+    for sample in range(samples):
+        sim_time = start + 60 * sample
+        for device in devices:
+            device.step(sim_time, 'normal')
+            message = device.obs_message(sim_time, 'normal')
+            router.dispatch(message['type'], device.serial_number, message)
+            Clock.tick()
+        times.append(sim_time)
+    return times
+
+
+def test_sky_only_station_aggregates(station):
+
+    """ A SKY-only station never sets obTime, so the daily wind and solar
+    aggregates must use the time of each SKY observation
+    """
+
+    from service.simulator import sim_device
+    app, parser, router = station(SkyID='200', SkySN='SK-1')
+    replay_obs(router, [sim_device('sky', 'SK-1', 'HB-1', random.Random(1))])
+
+    assert parser.device_obs['obTime'][0] is None
+    assert parser.derive_obs['windAvg'][0] is not None
+    assert parser.derive_obs['windAvg'][3] == SAMPLES
+    assert parser.derive_obs['gustMax'][0] is not None
+    assert parser.derive_obs['peakSun'][0] is not None
+    for key in ['AvgWind', 'MaxGust', 'peakSun']:
+        assert app.CurrentConditions.Obs[key][0] not in [None, '-']
+
+
+def test_sky_air_station_aggregates(station):
+
+    """ On a SKY and AIR station every SKY observation is added to the wind
+    aggregate at its own time
+    """
+
+    from service.simulator import sim_device
+    app, parser, router = station(SkyID='200', SkySN='SK-1', OutAirID='300', OutAirSN='AR-1')
+    replay_obs(router, [sim_device('sky', 'SK-1', 'HB-1', random.Random(1)),
+                        sim_device('air', 'AR-1', 'HB-1', random.Random(2))])
+
+    assert parser.derive_obs['windAvg'][3] == SAMPLES
+    assert parser.aggregates['windAvg'].last_time == parser.device_obs['windSpd'].time
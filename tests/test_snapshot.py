@@ -0,0 +1,87 @@
+# WeatherFlow PiConsole: Raspberry Pi Python console for WeatherFlow Tempest and
+# Smart Home Weather stations.
+# Copyright (C) 2018-2025 Peter Davis
+
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+# Check that the warm-start snapshot restores the daily aggregates and totals
+# and backfills the observations missed since the snapshot
+
+# Import required Python modules
+import pytest
+import random
+import json
+import time
+
+
+def test_restore_backfills_gap_without_api_fetch(station, tmp_path, monkeypatch):
+
+    """ Restoring a five minute old snapshot must not download the current day,
+    month or year again, and observations missed since the snapshot must be
+    added to the daily extremes and the rain and lightning totals
+    """
+
+    from service.simulator      import sim_device
+    from lib.observation_parser import obs_parser
+    from lib.request_api        import weatherflow_api
+    from lib                    import snapshot
+    app, parser, router = station(TempestID='100', TempestSN='ST-1')
+    device = sim_device('tempest', 'ST-1', 'HB-1', random.Random(1))
+    now    = int(time.time())
+
+    # Parse observations up to a snapshot taken five minutes ago
+    obs = []
+    for sim_time in range(now - 540, now - 299, 60):
+        device.step(sim_time, 'normal')
+        message = device.obs_message(sim_time, 'normal')
+        obs.append(message['obs'][0])
+        parser.parse_obs_st(message, app.config)
+    parser.derive_obs['rainAccum'] = dict(parser.derive_obs['rainAccum'], yesterday=[1.0, 'mm', 1.0, time.time()])
+    rain    = parser.derive_obs['rainAccum']['today'][0]
+    strikes = parser.derive_obs['strikeCount']['today'][0]
+    path = str(tmp_path / 'snapshot.json')
+    snapshot.save(parser, path, app.config)
+    with open(path) as snapshot_file:
+        saved = json.load(snapshot_file)
+    saved['time'] = now - 300
+    with open(path, 'w') as snapshot_file:
+        json.dump(saved, snapshot_file)
+
+    # Define observations missed since the snapshot with a higher temperature,
+    # rain and lightning strikes
+    for sim_time in range(now - 240, now - 59, 60):
+        device.step(sim_time, 'normal')
+        ob = device.obs_message(sim_time, 'normal')['obs'][0]
+        ob[7], ob[12], ob[15] = 40.0, 0.5, 3
+        obs.append(ob)
+
+    # Record WeatherFlow API requests made after the restart
+    fetched = []
+    for name in ('today', 'yesterday', 'month', 'year', 'statistics'):
+        monkeypatch.setattr(weatherflow_api, name, lambda *args, name=name: fetched.append(name))
+    monkeypatch.setattr(weatherflow_api, 'last_24h', lambda *args: weatherflow_api.api_response.from_obs(obs))
+
+    # Restore snapshot and parse the next live observation
+    app.config.set('System', 'rest_api', '1')
+    restored = obs_parser()
+    assert snapshot.load(restored, path, app.config)
+    device.step(now, 'normal')
+    message = device.obs_message(now, 'normal')
+    restored.parse_obs_st(message, app.config)
+    latest_ob = message['obs'][0]
+
+    assert fetched == []
+    assert restored.aggregates['outTempMax'].value == 40.0
+    assert restored.derive_obs['rainAccum']['today'][0] == pytest.approx(rain + 4 * 0.5 + latest_ob[12])
+    assert restored.derive_obs['strikeCount']['today'][0] == strikes + 4 * 3 + latest_ob[15]